@@ -1,9 +1,77 @@
+import asyncio
+import json
 from fastapi import APIRouter, HTTPException
-from app.backend.models.chat import ChatRequest, ChatResponse, ChatNameRequest, ChatNameResponse
-from app.backend.services.chat_service import process_user_question, generate_chat_name
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from src.agents.model import NOT_FOUND_ANSWER
+from src.agents.scheduler import SchedulerQueueFull, SchedulerTimeout
+from app.backend.core.metrics import CHAT_ANSWERS, record_stages, timed_stage
+from app.backend.core.settings import get_settings
+from app.backend.models.chat import ChatRequest, ChatResponse, ChatStartResponse, ChatBatchRequest, ChatBatchItem, ChatBatchResponse, ChatNameRequest, ChatNameResponse
+from app.backend.services.index_swap import AgentNotReady
+from app.backend.services.chat_service import process_user_question, process_question_batch, start_chat, stream_user_question, generate_chat_name, names_from_sources, get_cache_stats, get_coalescing_stats, get_scheduler_stats
 
 router = APIRouter()
 
+def transform_sources(raw_sources: list) -> list:
+    """
+    Transform agent sources to match the frontend structure.
+    Sources carry no text; the frontend fetches it from /sources/{chunk_id} on demand.
+    """
+    transformed_sources = []
+    for source in raw_sources:
+        transformed_source = {
+            "chunk_id": source.get("chunk_id"),
+            "chapter": source.get("chapter_name"),
+            "chapter_number": source.get("chapter_number"),
+            "page": source.get("page_number")
+        }
+        transformed_sources.append(transformed_source)
+    return transformed_sources
+
+def format_sse(event: str, data: dict) -> str:
+    """
+    Format one server-sent event.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def answer_error(error: Exception) -> HTTPException:
+    """
+    Map a failure while answering a question to an HTTP error.
+    """
+    if isinstance(error, SchedulerQueueFull):
+        return HTTPException(status_code=429, detail="Too many requests, please retry shortly.", headers={"Retry-After": "5"})
+    if isinstance(error, SchedulerTimeout):
+        return HTTPException(status_code=503, detail="Answer service is busy, please retry shortly.", headers={"Retry-After": "5"})
+    if isinstance(error, AgentNotReady):
+        return HTTPException(status_code=503, detail="Answer service is starting up, please retry shortly.", headers={"Retry-After": "5"})
+    if isinstance(error, asyncio.TimeoutError):
+        return HTTPException(status_code=504, detail="Timed out waiting for the answer.")
+    # In a real app, you would log the full error here
+    print(f"Error processing request: {error}")
+    return HTTPException(status_code=500, detail="Internal Server Error processing RAG request.")
+
+def map_answer(result: dict, endpoint: str) -> dict:
+    """
+    Record an answer's metrics and map it to the response structure.
+    Returns: Dict with answer, sources and metadata; sources are empty if nothing was found
+    """
+    metadata = result.get("metadata") or {}
+    record_stages(endpoint, metadata.get("timings_ms"))
+    CHAT_ANSWERS.inc(1, endpoint, metadata.get("cache_type") or "none")
+
+    answer = result.get("answer", "")
+    # Check if the answer indicates nothing was found
+    if NOT_FOUND_ANSWER in answer:
+        return {"answer": answer, "sources": [], "metadata": result.get("metadata")}
+
+    return {
+        "answer": answer,
+        # Transform sources to match frontend structure
+        "sources": transform_sources(result.get("sources", [])),
+        "metadata": result.get("metadata")
+    }
+
 @router.post("/chat")
 async def chat_endpoint(request: ChatRequest):
     """
@@ -19,33 +87,181 @@ async def chat_endpoint(request: ChatRequest):
         # Response Mapping
         # agent.ask() now returns a dict with 'answer' and 'sources'
         if isinstance(result, dict):
-            answer = result.get("answer", "")
-            raw_sources = result.get("sources", [])
-            
-            # Check if the answer indicates nothing was found
-            if "Not found in ChromaDB" in answer:
-                return {"answer": answer}
-            
-            # Transform sources to match frontend structure
-            transformed_sources = []
-            for source in raw_sources:
-                transformed_source = {
-                    "text": source.get("chapter_name") or source.get("text") or "Historical Document",
-                    "author": f"Chapter {source.get('chapter_number')}" if source.get("chapter_number") else "Ancient Text",
-                    "page": source.get("page_number")
-                }
-                transformed_sources.append(transformed_source)
-            
-            return ChatResponse(answer=answer, sources=transformed_sources)
+            with timed_stage("chat", "serialize"):
+                mapped = map_answer(result, "chat")
+                if NOT_FOUND_ANSWER in mapped["answer"]:
+                    return JSONResponse({"answer": mapped["answer"]})
+                return JSONResponse(jsonable_encoder(ChatResponse(**mapped)))
         
         # Fallback for backward compatibility (if it returns just a string)
         if isinstance(result, str):
             return {"answer": result}
 
     except Exception as e:
-        # In a real app, you would log the full error here
-        print(f"Error processing request: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error processing RAG request.")
+        raise answer_error(e)
+
+@router.post("/chat/start", response_model=ChatStartResponse)
+async def chat_start_endpoint(request: ChatRequest):
+    """
+    Answer the first message of a chat and generate the chat name in one request.
+    Replaces /chat followed by /chat/generate-name: a local name reuses the answer's
+    sources, an LLM name is generated concurrently with the answer.
+    Body: {"query": "query string"}
+    Returns: {"answer", "sources", "metadata", "name"}; sources are empty if nothing was found
+    """
+
+    try:
+        result, name = await start_chat(request.query)
+        with timed_stage("chat_start", "serialize"):
+            response = ChatStartResponse(name=name, **map_answer(result, "chat_start"))
+            return JSONResponse(jsonable_encoder(response))
+    except Exception as e:
+        raise answer_error(e)
+
+@router.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    Stream the answer to a question as server-sent events.
+    Body: {"query": "query string", "generate_name": false}
+    Events:
+        sources: {"sources": [...]} sent as soon as retrieval finishes
+        token:   {"text": "..."} for each answer fragment from Gemini
+        done:    {"not_found": bool, "metadata": {...}} with timings; when
+                 not_found is true the client should discard the sources
+        name:    {"name": "..."} only with generate_name; the chat name is
+                 generated alongside the answer and sent as soon as it is ready
+        error:   {"detail": "...", "status": int} if the request fails mid-stream
+    """
+
+    async def event_stream():
+        # A local name is built from the retrieved sources, so it waits for them
+        name_from_sources = request.generate_name and names_from_sources()
+        name_task = None
+        if request.generate_name and not name_from_sources:
+            name_task = asyncio.create_task(generate_chat_name(request.query))
+        try:
+            async for event in stream_user_question(request.query):
+                if name_task is not None and name_task.done():
+                    yield format_sse("name", {"name": name_task.result()})
+                    name_task = None
+                data = event["data"]
+                if event["event"] == "sources":
+                    if name_from_sources:
+                        name_task = asyncio.create_task(generate_chat_name(request.query, sources=data["sources"]))
+                    data = {"sources": transform_sources(data["sources"])}
+                elif event["event"] == "done":
+                    metadata = data.get("metadata") or {}
+                    record_stages("chat_stream", metadata.get("timings_ms"))
+                    CHAT_ANSWERS.inc(1, "chat_stream", metadata.get("cache_type") or "none")
+                yield format_sse(event["event"], data)
+            if name_task is not None:
+                yield format_sse("name", {"name": await name_task})
+        except SchedulerQueueFull:
+            yield format_sse("error", {"detail": "Too many requests, please retry shortly.", "status": 429})
+        except SchedulerTimeout:
+            yield format_sse("error", {"detail": "Answer service is busy, please retry shortly.", "status": 503})
+        except AgentNotReady:
+            yield format_sse("error", {"detail": "Answer service is starting up, please retry shortly.", "status": 503})
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            print(f"Error streaming request: {e}")
+            yield format_sse("error", {"detail": "Internal Server Error processing RAG request.", "status": 500})
+        finally:
+            if name_task is not None:
+                name_task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def to_batch_item(query: str, data: dict) -> ChatBatchItem:
+    """
+    Map one item event from the agent's batch to the response structure.
+    """
+    if "error" in data:
+        return ChatBatchItem(index=data["index"], query=query, error=data["error"])
+
+    answer = data.get("answer", "")
+    # Same rule as /chat: a not-found answer carries no sources
+    sources = [] if NOT_FOUND_ANSWER in answer else transform_sources(data.get("sources", []))
+    return ChatBatchItem(
+        index=data["index"],
+        query=query,
+        answer=answer,
+        sources=sources,
+        metadata=data.get("metadata")
+    )
+
+@router.post("/chat/batch")
+async def chat_batch_endpoint(request: ChatBatchRequest):
+    """
+    Answer a list of questions with one batched embed/retrieve pass.
+    Body: {"queries": ["...", ...], "stream": false}
+    Returns: {"results": [...], "metadata": {...}} with results in request order,
+        or with stream=true an NDJSON stream of {"type": "item", ...} lines in
+        completion order followed by one {"type": "done", ...} line
+    """
+    settings = get_settings()
+    if len(request.queries) > settings.BATCH_MAX_QUESTIONS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BATCH_MAX_QUESTIONS} questions per batch.")
+
+    def record_item(item: ChatBatchItem):
+        if item.metadata:
+            record_stages("chat_batch", item.metadata.get("timings_ms"))
+            CHAT_ANSWERS.inc(1, "chat_batch", item.metadata.get("cache_type") or "none")
+
+    if request.stream:
+        async def item_stream():
+            try:
+                async for event in process_question_batch(request.queries):
+                    data = event["data"]
+                    if event["event"] == "item":
+                        item = to_batch_item(request.queries[data["index"]], data)
+                        record_item(item)
+                        line = {"type": "item", **jsonable_encoder(item)}
+                    else:
+                        record_stages("chat_batch", data.get("timings_ms"))
+                        line = {"type": "done", **data}
+                    yield json.dumps(line) + "\n"
+            except AgentNotReady:
+                yield json.dumps({"type": "error", "detail": "Answer service is starting up, please retry shortly.", "status": 503}) + "\n"
+            except Exception as e:
+                # Headers are already sent, so report the failure in-band
+                print(f"Error streaming batch: {e}")
+                yield json.dumps({"type": "error", "detail": "Internal Server Error processing batch.", "status": 500}) + "\n"
+
+        return StreamingResponse(
+            item_stream(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    try:
+        results = []
+        batch_metadata = {}
+        async for event in process_question_batch(request.queries):
+            data = event["data"]
+            if event["event"] == "item":
+                item = to_batch_item(request.queries[data["index"]], data)
+                record_item(item)
+                results.append(item)
+            else:
+                # Embed and retrieve ran once for the whole batch
+                record_stages("chat_batch", data.get("timings_ms"))
+                batch_metadata = data
+
+        with timed_stage("chat_batch", "serialize"):
+            results.sort(key=lambda item: item.index)
+            response = ChatBatchResponse(results=results, metadata=batch_metadata)
+            return JSONResponse(jsonable_encoder(response))
+
+    except AgentNotReady as e:
+        raise answer_error(e)
+    except Exception as e:
+        print(f"Error processing batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error processing batch request.")
 
 @router.post("/chat/generate-name", response_model=ChatNameResponse)
 async def generate_chat_name_endpoint(request: ChatNameRequest):
@@ -61,4 +277,28 @@ async def generate_chat_name_endpoint(request: ChatNameRequest):
     
     except Exception as e:
         print(f"Error generating chat name: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error generating chat name.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal Server Error generating chat name.")
+
+@router.get("/chat/cache-stats")
+async def cache_stats_endpoint():
+    """
+    Semantic answer cache metrics for this worker.
+    Returns: {"enabled", "size", "max_entries", "hits", "misses", "hit_rate"}
+    """
+    return get_cache_stats()
+
+@router.get("/chat/coalescing-stats")
+async def coalescing_stats_endpoint():
+    """
+    Single-flight counters for this worker.
+    Returns: {"calls", "coalesced", "in_flight", "errors", "timeouts"}
+    """
+    return get_coalescing_stats()
+
+@router.get("/chat/scheduler-stats")
+async def scheduler_stats_endpoint():
+    """
+    Gemini scheduler metrics for this worker.
+    Returns: queue depth, active calls, admitted/rejected/timed-out counts and wait-time percentiles
+    """
+    return get_scheduler_stats()
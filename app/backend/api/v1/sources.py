@@ -0,0 +1,54 @@
+from fastapi import APIRouter, HTTPException
+from app.backend.core.settings import get_settings
+from app.backend.models.sources import SourceText, SourceBatchRequest, SourceBatchResponse
+from app.backend.services.index_swap import AgentNotReady
+from app.backend.services.sources_service import get_source_texts, get_chunk_store_stats
+
+router = APIRouter()
+
+@router.get("/sources/stats")
+async def source_stats_endpoint():
+    """
+    Chunk store metrics for this worker.
+    Returns: {"size", "max_entries", "hits", "misses", "hit_rate"}
+    """
+    return get_chunk_store_stats()
+
+@router.get("/sources/{chunk_id}", response_model=SourceText)
+async def source_endpoint(chunk_id: str):
+    """
+    Fetch the text of one source cited in a chat answer.
+    Returns: {"chunk_id", "text", "chapter", "chapter_number", "page"}
+    """
+
+    try:
+        found, _ = await get_source_texts([chunk_id])
+    except AgentNotReady:
+        raise
+    except Exception as e:
+        print(f"Error fetching source: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error fetching source.")
+
+    if not found:
+        raise HTTPException(status_code=404, detail=f"Source not found: {chunk_id}")
+    return found[0]
+
+@router.post("/sources/batch", response_model=SourceBatchResponse)
+async def source_batch_endpoint(request: SourceBatchRequest):
+    """
+    Fetch the texts of several sources in one request.
+    Body: {"chunk_ids": ["...", ...]}
+    Returns: {"sources": [...], "missing": [...]}
+    """
+    settings = get_settings()
+    if len(request.chunk_ids) > settings.SOURCES_BATCH_MAX_IDS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.SOURCES_BATCH_MAX_IDS} sources per request.")
+
+    try:
+        found, missing = await get_source_texts(request.chunk_ids)
+        return SourceBatchResponse(sources=found, missing=missing)
+    except AgentNotReady:
+        raise
+    except Exception as e:
+        print(f"Error fetching sources: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error fetching sources.")
@@ -0,0 +1,255 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional, Tuple
+
+# Latency buckets in seconds, from a cache hit to a slow Gemini answer
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus data model, one series per label set.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str):
+        key = tuple(str(v) for v in labelvalues)
+        with self._lock:
+            # [per-bucket counts..., +Inf count, sum]
+            series = self._series.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                    cumulative += count
+                    le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return "\n".join(lines)
+
+
+class Counter:
+    """
+    Monotonic counter, one series per label set.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labelvalues: str):
+        key = tuple(str(v) for v in labelvalues)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and status code.",
+    labelnames=("method", "route", "status"),
+)
+STAGE_DURATION = Histogram(
+    "chat_stage_duration_seconds",
+    "Time spent in each stage of a chat request (embed, retrieve, prompt_build, generate, serialize).",
+    labelnames=("endpoint", "stage"),
+)
+LLM_TOKENS = Histogram(
+    "llm_tokens_per_call",
+    "Prompt and completion tokens per LLM call, as reported by the backend.",
+    labelnames=("purpose", "kind"),
+    buckets=TOKEN_BUCKETS,
+)
+CHAT_ANSWERS = Counter(
+    "chat_answers_total",
+    "Chat answers by cache outcome (none, exact or semantic).",
+    labelnames=("endpoint", "cache"),
+)
+
+_METRICS = (REQUEST_DURATION, STAGE_DURATION, LLM_TOKENS, CHAT_ANSWERS)
+
+# Stage timings of the current request, read by the Server-Timing middleware
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> Dict[str, float]:
+    """
+    Begin collecting stage timings for the current request.
+    The dict is shared with tasks the request spawns, so stages recorded there are visible too.
+    """
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def record_stage(endpoint: str, stage: str, duration_ms: float):
+    """
+    Add a stage duration to the histograms and to the current request's Server-Timing.
+    """
+    STAGE_DURATION.observe(duration_ms / 1000, endpoint, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + duration_ms
+
+
+def record_stages(endpoint: str, timings_ms: Optional[Dict[str, float]]):
+    """
+    Record every stage from an agent's 'timings_ms' metadata.
+    """
+    for stage, duration_ms in (timings_ms or {}).items():
+        if stage == "total":
+            # Covered by the request duration histogram
+            continue
+        record_stage(endpoint, stage, duration_ms)
+
+
+def record_llm_usage(purpose: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+    """
+    Record token counts of one LLM call (skipped when the backend does not report them).
+    """
+    if prompt_tokens is not None:
+        LLM_TOKENS.observe(prompt_tokens, purpose, "prompt")
+    if completion_tokens is not None:
+        LLM_TOKENS.observe(completion_tokens, purpose, "completion")
+
+
+@contextmanager
+def timed_stage(endpoint: str, stage: str):
+    """
+    Time a block as a stage of the current request.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(endpoint, stage, (time.perf_counter() - start) * 1000)
+
+
+def format_server_timing(timings: Dict[str, float], total_ms: Optional[float] = None) -> str:
+    """
+    Build a Server-Timing header value, e.g. 'embed;dur=3.1, generate;dur=812.4, total;dur=820.0'.
+    """
+    parts = [f"{stage};dur={duration:.1f}" for stage, duration in timings.items()]
+    if total_ms is not None:
+        parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+def _format_gauges(prefix: str, values: Dict[str, object], documentation: str) -> str:
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines)
+
+
+def render_metrics(gauges: Optional[Dict[str, Tuple[Dict[str, object], str]]] = None) -> str:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    Args:
+        gauges: Optional {prefix: (stats dict, help text)} snapshots to export as gauges,
+            e.g. the semantic cache, single-flight and scheduler stats
+
+    Returns:
+        Exposition text ending with a newline
+    """
+    blocks = [metric.render() for metric in _METRICS]
+    for prefix, (values, documentation) in (gauges or {}).items():
+        block = _format_gauges(prefix, values, documentation)
+        if block:
+            blocks.append(block)
+    return "\n".join(blocks) + "\n"
+
+
+_PATH_PARAM = re.compile(r"\{([^}:]+)(?::[^}]*)?\}")
+
+
+def route_label(scope) -> str:
+    """
+    Path template of the matched route, e.g. '/api/v1/sources/{chunk_id}' ('unmatched' if none).
+
+    Routes of an included router may only know their path inside the
+    router ('/sources/{chunk_id}'), so the prefix is taken from the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+
+    params = scope.get("path_params") or {}
+    try:
+        rendered = _PATH_PARAM.sub(lambda m: str(params[m.group(1)]), template)
+    except KeyError:
+        return template
+    path = scope.get("path", "")
+    if path.endswith(rendered):
+        return path[:len(path) - len(rendered)] + template
+    return template
+
+
+async def metrics_middleware(request, call_next):
+    """
+    Time every request, export it to the request histogram and add a Server-Timing header.
+    For streaming responses the header is sent before the body, so it only covers the stages before streaming starts.
+    """
+    timings = start_request_timings()
+    start = time.perf_counter()
+
+    response = await call_next(request)
+
+    total_ms = (time.perf_counter() - start) * 1000
+    REQUEST_DURATION.observe(total_ms / 1000, request.method, route_label(request.scope), response.status_code)
+    response.headers["Server-Timing"] = format_server_timing(timings, total_ms)
+    return response
@@ -15,6 +15,68 @@ class Settings(BaseSettings):
 
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
 
+    # LLM backend: "gemini", or "stub" for offline load testing without an API key
+    LLM_BACKEND: str = "gemini"
+    STUB_LATENCY_MS: float = 800.0
+    STUB_LATENCY_JITTER_MS: float = 200.0
+    STUB_TOKENS_PER_SECOND: float = 50.0
+
+    # Chat names: "local" builds them from the question and the top chapter title
+    # without an LLM call; "llm" asks the title model. With CHAT_TITLER_LLM_FALLBACK
+    # the LLM is used when the local titler finds no title words.
+    CHAT_TITLER: str = "local"
+    CHAT_TITLER_LLM_FALLBACK: bool = False
+
+    # Build the agent and run a warm-up retrieval at startup; /ready returns 503 until it finishes
+    WARMUP_ENABLED: bool = True
+    WARMUP_QUERY: str = "How did the Neolithic Revolution change human societies?"
+
+    # Context packing: max estimated context tokens per prompt, and the
+    # cosine similarity above which retrieved chunks count as redundant
+    CONTEXT_TOKEN_BUDGET: int = 2000
+    REDUNDANCY_THRESHOLD: float = 0.95
+
+    # Threads used to run blocking Chroma queries off the event loop
+    RETRIEVAL_WORKERS: int = 4
+
+    # Sharded index (one collection per book): search only the N books whose
+    # centroid is closest to the question (0 searches every book)
+    SHARD_PRUNE_TOP: int = 0
+
+    # Persistent answer cache, shared by all workers through one SQLite file
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_PATH: str = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "cache", "answers.sqlite3")
+    ANSWER_CACHE_MAX_ENTRIES: int = 10000
+    ANSWER_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Semantic cache: reuse answers for paraphrased questions in this worker
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 2000
+
+    # Batch endpoint: max questions per request and questions answered at once
+    BATCH_MAX_QUESTIONS: int = 200
+    BATCH_MAX_CONCURRENCY: int = 4
+
+    # Index hot-swap: seconds between checks of the index's CURRENT pointer (0 disables),
+    # and how long a replaced agent may keep serving in-flight requests
+    INDEX_POLL_SECONDS: float = 10.0
+    INDEX_DRAIN_TIMEOUT_SECONDS: float = 120.0
+
+    # Source texts: chunks kept in memory per worker, and max IDs per batch lookup
+    CHUNK_STORE_ENTRIES: int = 5000
+    SOURCES_BATCH_MAX_IDS: int = 100
+
+    # How long a request waits for a coalesced (shared) answer before giving up
+    SINGLE_FLIGHT_TIMEOUT_SECONDS: float = 120.0
+
+    # Shared Gemini admission control: budgets, concurrency and queueing
+    LLM_REQUESTS_PER_MINUTE: int = 150
+    LLM_TOKENS_PER_MINUTE: int = 2_000_000
+    LLM_MAX_CONCURRENT: int = 8
+    LLM_MAX_QUEUE: int = 100
+    LLM_QUEUE_DEADLINE_SECONDS: float = 30.0
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -1,16 +1,67 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.backend.core.settings import get_settings
+from app.backend.core.metrics import metrics_middleware, render_metrics
 from app.backend.api.v1.chat import router as chat_router
+from app.backend.api.v1.sources import router as sources_router
+from app.backend.services.chat_service import get_index_swap, get_metric_gauges, warm_up_agent
+from app.backend.services.index_swap import AgentNotReady
 
 settings = get_settings()
 
+async def warm_up(application: FastAPI):
+    """
+    Builds the agent and warms it in a worker thread, then marks the app ready.
+    On failure the app stays not ready and /ready reports the error.
+    """
+    start = time.perf_counter()
+    print("Warming up RAG agent...")
+
+    try:
+        timings = await asyncio.to_thread(warm_up_agent)
+    except Exception as e:
+        application.state.warmup_error = f"{type(e).__name__}: {e}"
+        print(f"Warm-up failed: {application.state.warmup_error}")
+        return
+
+    application.state.ready = True
+    print(f"Warm-up finished in {time.perf_counter() - start:.1f}s: {timings}")
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Warm up in the background so /health answers immediately and /ready reflects progress
+    application.state.ready = not settings.WARMUP_ENABLED
+    application.state.warmup_error = None
+    task = asyncio.create_task(warm_up(application)) if settings.WARMUP_ENABLED else None
+    # Swap to newly published index versions (a no-op until the first agent is loaded)
+    get_index_swap().start()
+
+    yield
+
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await asyncio.to_thread(get_index_swap().stop)
+
+async def agent_not_ready_handler(request: Request, error: AgentNotReady):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service is starting up, please retry shortly."},
+        headers={"Retry-After": "5"}
+    )
+
 def get_application() -> FastAPI:
     application = FastAPI(
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
         docs_url=f"{settings.API_V1_STR}/docs",
         redoc_url=f"{settings.API_V1_STR}/redoc",
+        lifespan=lifespan,
     )
 
     application.add_middleware(
@@ -19,10 +70,18 @@ def get_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing"],
     )
 
+    # Request latency histogram and Server-Timing header
+    application.middleware("http")(metrics_middleware)
+
+    # Requests that need the agent before it has loaded get 503, like /ready
+    application.add_exception_handler(AgentNotReady, agent_not_ready_handler)
+
     # Include routers
     application.include_router(chat_router, prefix=settings.API_V1_STR, tags=["Chat"])
+    application.include_router(sources_router, prefix=settings.API_V1_STR, tags=["Sources"])
 
     return application
 
@@ -33,6 +92,21 @@ app = get_application()
 async def health_check():
     return {"message": "application is up and running."}
 
+# Readiness endpoint for load balancers: 503 until the agent is warm
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(
+            status_code=503,
+            content={"ready": False, "error": getattr(app.state, "warmup_error", None)}
+        )
+    return {"ready": True}
+
+# Prometheus scrape endpoint
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(render_metrics(get_metric_gauges()), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     # For dubugging purposes.
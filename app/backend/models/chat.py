@@ -1,17 +1,39 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class Source(BaseModel):
-    text: str = Field(..., description="Title or name of the source document")
-    author: Optional[str] = Field(None, description="Author or reference information")
+    chunk_id: Optional[str] = Field(None, description="ID of the chunk; fetch its text from /sources/{chunk_id}")
+    chapter: Optional[str] = Field(None, description="Chapter title")
+    chapter_number: Optional[str] = Field(None, description="Chapter number")
     page: Optional[int] = Field(None, description="Page number")
 
 class ChatRequest(BaseModel):
     query: str = Field(..., min_length=1, description="User's query for the chat")
+    generate_name: bool = Field(False, description="Stream endpoint only: also generate a chat name and send it as a 'name' event")
 
 class ChatResponse(BaseModel):
     answer: str = Field(..., description="Generated answer from the chat model")
     sources: List[Source] = Field(..., description="List of source documents used to generate the answer")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Per-request metrics such as prompt tokens before and after packing")
+
+class ChatStartResponse(ChatResponse):
+    name: str = Field(..., description="Generated short chat name")
+
+class ChatBatchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, description="Questions to answer")
+    stream: bool = Field(False, description="Stream results as NDJSON in completion order instead of one ordered JSON response")
+
+class ChatBatchItem(BaseModel):
+    index: int = Field(..., description="Position of the question in the request")
+    query: str = Field(..., description="The question")
+    answer: Optional[str] = Field(None, description="Generated answer (None if the question failed)")
+    sources: List[Source] = Field(default_factory=list, description="Sources used for the answer")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Per-question metrics, including timings_ms")
+    error: Optional[str] = Field(None, description="Error message if the question failed")
+
+class ChatBatchResponse(BaseModel):
+    results: List[ChatBatchItem] = Field(..., description="One result per question, in request order")
+    metadata: Dict[str, Any] = Field(..., description="Batch metrics: count, errors and timings_ms (embed, retrieve, total)")
 
 class ChatNameRequest(BaseModel):
     message: str = Field(..., min_length=1, description="First message to generate a chat name from")
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class SourceText(BaseModel):
+    chunk_id: str = Field(..., description="ID of the chunk")
+    text: str = Field(..., description="Full text of the chunk")
+    chapter: Optional[str] = Field(None, description="Chapter title")
+    chapter_number: Optional[str] = Field(None, description="Chapter number")
+    page: Optional[int] = Field(None, description="Page number")
+
+class SourceBatchRequest(BaseModel):
+    chunk_ids: List[str] = Field(..., min_length=1, description="IDs of the chunks to fetch")
+
+class SourceBatchResponse(BaseModel):
+    sources: List[SourceText] = Field(..., description="Found chunks, in request order")
+    missing: List[str] = Field(default_factory=list, description="Requested IDs that are not in the index")
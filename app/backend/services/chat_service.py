@@ -1,58 +1,349 @@
+import asyncio
 from functools import lru_cache
+from typing import Optional
 from src.agents.model import HistoryAgent
+from src.agents.backends import LLMBackend, create_backend
+from src.agents.cache import AnswerCache, normalize_question
+from src.agents.semantic_cache import SemanticCache
+from src.agents.scheduler import LLMScheduler
+from src.agents.titler import LocalTitler
 from app.backend.core.settings import get_settings
-import google.generativeai as genai
-import os
+from app.backend.core.metrics import record_llm_usage
+from app.backend.services.index_swap import AgentNotReady, IndexHotSwap
+from app.backend.services.singleflight import SingleFlight
+
+def create_llm_backend(model_name: str) -> LLMBackend:
+    """
+    Creates the configured LLM backend (Gemini, or the offline stub for load testing).
+    """
+    settings = get_settings()
+
+    stub_options = {}
+    if settings.LLM_BACKEND == "stub":
+        stub_options = {
+            "latency_ms": settings.STUB_LATENCY_MS,
+            "latency_jitter_ms": settings.STUB_LATENCY_JITTER_MS,
+            "tokens_per_second": settings.STUB_TOKENS_PER_SECOND,
+        }
+
+    return create_backend(
+        settings.LLM_BACKEND,
+        model_name=model_name,
+        api_key=settings.GEMINI_API_KEY or None,
+        **stub_options
+    )
 
 @lru_cache()
-def get_rag_agent() -> HistoryAgent:
+def get_title_backend() -> LLMBackend:
+    """
+    Long-lived backend for chat names (a lightweight, fast model).
     """
-    Initializes the RAG agent.
+    return create_llm_backend('models/gemini-2.5-flash')
+
+@lru_cache()
+def get_answer_cache() -> Optional[AnswerCache]:
+    """
+    Persistent answer cache, shared by every agent this worker builds.
+    """
+    settings = get_settings()
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+    return AnswerCache(
+        path=settings.ANSWER_CACHE_PATH,
+        max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS
+    )
+
+@lru_cache()
+def get_scheduler() -> LLMScheduler:
+    """
+    Gemini admission control, shared across index swaps so budgets are not reset.
+    """
+    settings = get_settings()
+    return LLMScheduler(
+        requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+        max_concurrent=settings.LLM_MAX_CONCURRENT,
+        max_queue=settings.LLM_MAX_QUEUE,
+        default_deadline=settings.LLM_QUEUE_DEADLINE_SECONDS
+    )
+
+def _build_rag_agent(db_path: str) -> HistoryAgent:
+    """
+    Initializes the RAG agent for one index version.
     this handles loading the embedding model, and connecting to ChromaDB.
     """
-    print("Loading RAG Agent... this might take a moment...")
+    print(f"Loading RAG Agent from {db_path}... this might take a moment...")
     
     settings = get_settings()
 
+    # Cached answers of another index version would never match, so each agent gets its own
+    semantic_cache = SemanticCache(
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        enabled=settings.SEMANTIC_CACHE_ENABLED
+    )
+
     # we initate the class you built in src/agents/model.py
     agent = HistoryAgent(
-        db_path=settings.CHROMA_DB_DIR,
-        collection_name="world_history"
+        db_path=db_path,
+        collection_name="world_history",
+        context_token_budget=settings.CONTEXT_TOKEN_BUDGET,
+        redundancy_threshold=settings.REDUNDANCY_THRESHOLD,
+        retrieval_workers=settings.RETRIEVAL_WORKERS,
+        answer_cache=get_answer_cache(),
+        semantic_cache=semantic_cache,
+        scheduler=get_scheduler(),
+        backend=create_llm_backend("models/gemini-2.5-pro"),
+        chunk_store_entries=settings.CHUNK_STORE_ENTRIES,
+        shard_prune_top=settings.SHARD_PRUNE_TOP or None
     )
 
     print("RAG Agent loaded and ready.")
     return agent
 
+@lru_cache()
+def get_index_swap() -> IndexHotSwap:
+    """
+    Holds the serving agent and swaps it when a new index version is published.
+    """
+    settings = get_settings()
+    return IndexHotSwap(
+        index_root=settings.CHROMA_DB_DIR,
+        build_agent=_build_rag_agent,
+        warm_up=lambda agent: agent.warm_up(settings.WARMUP_QUERY),
+        poll_interval=settings.INDEX_POLL_SECONDS,
+        drain_timeout=settings.INDEX_DRAIN_TIMEOUT_SECONDS
+    )
+
+def get_rag_agent() -> HistoryAgent:
+    """
+    Returns the serving RAG agent, building it on first use.
+    Blocking: call it from a thread. Request handlers should await load_agent()
+    and use agent_lease() so an index swap cannot close the agent under them.
+    """
+    return get_index_swap().get_agent()
+
+async def load_agent():
+    """
+    Waits for the serving agent to be loaded without blocking the event loop.
+    Raises AgentNotReady if it cannot be built.
+    """
+    await get_index_swap().aload()
+
+def agent_lease():
+    """
+    Context manager that pins the serving agent for the duration of a request.
+    Raises AgentNotReady if the agent has not been loaded yet.
+    """
+    return get_index_swap().lease()
+
+def warm_up_agent() -> dict:
+    """
+    Builds the agent and runs a warm-up retrieval so the first user does not pay for it.
+    Blocking: run it in a thread.
+    """
+    settings = get_settings()
+    return get_rag_agent().warm_up(settings.WARMUP_QUERY)
+
+# Identical questions asked at the same time share one retrieval + generation
+question_flight = SingleFlight()
+
+async def _answer_question(query: str) -> dict:
+    """
+    Runs the agent and records LLM token usage once per generation (not per coalesced waiter).
+    The shared task leases the agent itself, so it stays open even if the caller that started it times out.
+    """
+    with agent_lease() as agent:
+        # aask keeps the event loop free while Chroma and Gemini are working.
+        result = await agent.aask(query)
+    usage = result["metadata"].get("usage") or {}
+    record_llm_usage("answer", usage.get("prompt_tokens"), usage.get("completion_tokens"))
+    return result
+
 async def process_user_question(query: str):
     """
     Helper function to process a single question.
     """
 
-    agent = get_rag_agent()
+    settings = get_settings()
 
-    # We call the "asj" method defined in HistoryAgent
-    response = agent.ask(query)
+    await load_agent()
+    # The key includes the index, so a request never joins an answer from a retired version.
+    response = await question_flight.do(
+        f"{get_index_swap().db_path}\x1f{normalize_question(query)}",
+        lambda: _answer_question(query),
+        timeout=settings.SINGLE_FLIGHT_TIMEOUT_SECONDS
+    )
 
     return response
 
-async def generate_chat_name(first_message: str) -> str:
+async def start_chat(query: str):
+    """
+    Helper function for the first message of a chat.
+    A local chat name is built from the answer's top source once the answer
+    is ready, so the question is only retrieved once. An LLM chat name is
+    generated concurrently with the answer, so the two LLM calls overlap,
+    and is cancelled if the answer fails.
+
+    Returns:
+        Tuple of (answer result, chat name)
+    """
+
+    if names_from_sources():
+        result = await process_user_question(query)
+        return result, await generate_chat_name(query, sources=result.get("sources", []))
+
+    name_task = asyncio.ensure_future(generate_chat_name(query))
+    try:
+        result = await process_user_question(query)
+    except BaseException:
+        # The request has failed: do not pay for a name nobody will see
+        name_task.cancel()
+        raise
+    return result, await name_task
+
+async def stream_user_question(query: str):
+    """
+    Helper function to stream the answer to a single question.
+    Yields the agent's 'sources', 'token' and 'done' events.
+    """
+
+    await load_agent()
+    with agent_lease() as agent:
+        async for event in agent.astream(query):
+            yield event
+
+async def process_question_batch(queries: list):
+    """
+    Helper function to answer many questions with one batched retrieval.
+    Yields the agent's 'item' events as questions finish, then 'done'.
+    """
+
+    settings = get_settings()
+
+    await load_agent()
+    with agent_lease() as agent:
+        async for event in agent.aask_batch(queries, max_concurrency=settings.BATCH_MAX_CONCURRENCY):
+            if event["event"] == "item" and "metadata" in event["data"]:
+                usage = event["data"]["metadata"].get("usage") or {}
+                record_llm_usage("answer", usage.get("prompt_tokens"), usage.get("completion_tokens"))
+            yield event
+
+def get_cache_stats() -> dict:
+    """
+    Hit-rate metrics of the semantic answer cache in this worker.
+    Raises AgentNotReady until the agent is loaded.
+    """
+    agent = get_index_swap().current_agent()
+    return agent.semantic_cache.stats() if agent.semantic_cache else {"enabled": False}
+
+def get_coalescing_stats() -> dict:
+    """
+    Counters of the single-flight layer in this worker.
+    """
+    return question_flight.stats()
+
+def get_scheduler_stats() -> dict:
+    """
+    Queue-depth and wait-time metrics of the Gemini scheduler in this worker.
+    Raises AgentNotReady until the agent is loaded.
+    """
+    return get_index_swap().current_agent().scheduler.stats()
+
+def get_metric_gauges() -> dict:
+    """
+    Cache, single-flight, scheduler and index swap snapshots for the /metrics endpoint.
+    The agent's stats are only included once it has been loaded, so scraping does not load it.
+    """
+    gauges = {
+        "singleflight": (question_flight.stats(), "Single-flight request coalescing counter (since startup)."),
+    }
+
+    index_swap = get_index_swap()
+    if index_swap.loaded:
+        gauges["index_swap"] = (index_swap.stats(), "Vector index hot-swap statistic.")
+        agent = index_swap.current_agent()
+        if agent.semantic_cache is not None:
+            gauges["semantic_cache"] = (agent.semantic_cache.stats(), "Semantic answer cache statistic.")
+        gauges["chunk_store"] = (agent.chunk_store.stats(), "Source chunk store statistic.")
+        if agent.scheduler is not None:
+            gauges["llm_scheduler"] = (agent.scheduler.stats(), "LLM scheduler queue and wait-time statistic.")
+
+    return gauges
+
+def names_from_sources() -> bool:
+    """
+    True when chat names are built locally, from the chapter of the answer's top source.
+    Callers that retrieve the question anyway should pass its sources to generate_chat_name().
+    """
+    return get_settings().CHAT_TITLER == "local"
+
+def _top_chapter(question: str):
+    """
+    Chapter title of the best-matching chunk, for the local titler when no sources are given.
+    Best effort: a title without the chapter is better than no title.
+    """
+    try:
+        with agent_lease() as agent:
+            return agent.top_chapter(question)
+    except AgentNotReady:
+        # Not loaded yet: name the chat from the message alone
+        return None
+    except Exception as e:
+        print(f"Error looking up chapter for chat name: {type(e).__name__}: {str(e)}")
+        return None
+
+@lru_cache()
+def get_local_titler() -> LocalTitler:
+    """
+    Shared local titler, using the RAG agent's collection for chapter titles.
+    """
+    return LocalTitler(chapter_lookup=_top_chapter)
+
+async def generate_chat_name(first_message: str, sources: Optional[list] = None) -> str:
     """
     Generate a short, descriptive name for a chat based on the first message.
-    Uses a lightweight Gemini model (gemini-2.0-flash-lite) for fast generation.
+    With CHAT_TITLER="local" the name is extracted from the message and the top
+    chapter title without an LLM call; otherwise (or as fallback) it uses a
+    lightweight Gemini model (gemini-2.5-flash), or the stub backend offline.
     
     Args:
         first_message: The first message from the user in the chat
+        sources: The answer's sources, if the message was already answered; the
+            local titler then uses the top source's chapter instead of its own search
     
     Returns:
         A short chat name (3-6 words)
     """
     settings = get_settings()
+
+    if settings.CHAT_TITLER == "local":
+        if sources is not None:
+            chapter = (sources[0].get("chapter_name") if sources else None) or ""
+            chat_name = get_local_titler().title(first_message, chapter=chapter)
+        else:
+            # The chapter lookup embeds and queries Chroma, so keep it off the event loop
+            chat_name = await asyncio.to_thread(get_local_titler().title, first_message)
+        if chat_name:
+            print(f"Generated chat name (local): {chat_name}")
+            return chat_name
+        if not settings.CHAT_TITLER_LLM_FALLBACK:
+            return first_message[:40] + "..." if len(first_message) > 40 else first_message
+
+    return await generate_llm_chat_name(first_message)
+
+async def generate_llm_chat_name(first_message: str) -> str:
+    """
+    Generate a chat name with the lightweight title model.
     
-    # Configure Gemini API
-    genai.configure(api_key=settings.GEMINI_API_KEY)
+    Args:
+        first_message: The first message from the user in the chat
     
-    # Use a lightweight, fast model for name generation
-    model = genai.GenerativeModel('models/gemini-2.5-flash')
+    Returns:
+        A short chat name (3-6 words)
+    """
+    settings = get_settings()
     
     prompt = f"""Act as a deterministic naming system.
 
@@ -70,12 +361,14 @@ async def generate_chat_name(first_message: str) -> str:
     
     try:
         # Check if API key is configured
-        if not settings.GEMINI_API_KEY:
+        if settings.LLM_BACKEND == "gemini" and not settings.GEMINI_API_KEY:
             print("WARNING: GEMINI_API_KEY is not set. Using fallback chat name.")
             fallback_name = first_message[:40] + "..." if len(first_message) > 40 else first_message
             return fallback_name
         
-        response = model.generate_content(prompt)
+        # Reuse the long-lived, lightweight backend for name generation
+        response = await get_title_backend().agenerate(prompt)
+        record_llm_usage("title", response.prompt_tokens, response.completion_tokens)
         chat_name = response.text.strip()
         
         # Remove quotes if present and limit length
@@ -0,0 +1,239 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+from src.embeddings.versions import current_version, resolve_db_path
+
+class AgentNotReady(Exception):
+    """
+    Raised when a request needs the serving agent before it has been loaded.
+    """
+
+class _Generation:
+    """
+    One serving agent and the requests currently using it.
+    """
+
+    def __init__(self, agent, version: Optional[str]):
+        self.agent = agent
+        self.version = version
+        self.in_flight = 0
+        self.retired = False
+
+class IndexHotSwap:
+    """
+    Serves requests from the agent for the current index version and swaps
+    in a new agent when the index's CURRENT pointer moves.
+
+    Every request leases one agent for its whole lifetime, so it sees a
+    single index even if a swap happens half way through. A new version is
+    built and warmed in the background while the old agent keeps serving;
+    the swap itself is a reference change under a lock. The old agent is
+    closed once its last request finishes (or after drain_timeout).
+    """
+
+    def __init__(
+        self,
+        index_root: str,
+        build_agent: Callable[[str], object],
+        warm_up: Optional[Callable[[object], object]] = None,
+        poll_interval: float = 10.0,
+        drain_timeout: float = 120.0
+    ):
+        """
+        Args:
+            index_root: Root directory of the versioned index
+            build_agent: Builds an agent for a database directory
+            warm_up: Optional function run on a new agent before it takes traffic
+            poll_interval: Seconds between checks of the CURRENT pointer
+            drain_timeout: Maximum seconds to wait for requests on a retired agent
+        """
+        self.index_root = index_root
+        self.build_agent = build_agent
+        self.warm_up = warm_up
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+
+        self._current: Optional[_Generation] = None
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        self._swap_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        self._load_task = None
+
+        self.swaps = 0
+        self.failed_swaps = 0
+        self.draining = 0
+        self.last_swap_ms = None
+        self.last_error = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._current is not None
+
+    @property
+    def db_path(self) -> str:
+        """
+        Database directory of the serving agent; identifies the index version, e.g. in cache keys.
+        Raises AgentNotReady until the agent is loaded.
+        """
+        return self.current_agent().db_path
+
+    def get_agent(self):
+        """
+        The current agent, built on first use.
+        Blocking while the agent is built: call it from a thread, or use aload() on the event loop.
+        """
+        current = self._current
+        if current is not None:
+            return current.agent
+
+        with self._swap_lock:
+            if self._current is None:
+                version = current_version(self.index_root)
+                agent = self.build_agent(str(resolve_db_path(self.index_root)))
+                with self._lock:
+                    self._current = _Generation(agent, version)
+        return self._current.agent
+
+    def current_agent(self):
+        """
+        The current agent, without loading it (safe to call on the event loop).
+        Raises AgentNotReady if it has not been loaded yet.
+        """
+        current = self._current
+        if current is None:
+            raise AgentNotReady("The RAG agent is still loading")
+        return current.agent
+
+    async def aload(self):
+        """
+        Load the agent without blocking the event loop. Concurrent callers
+        share one load (which waits for a warm-up already in progress).
+
+        Raises:
+            AgentNotReady: if the agent cannot be built
+        """
+        if self._current is not None:
+            return
+
+        if self._load_task is None or self._load_task.done():
+            self._load_task = asyncio.ensure_future(asyncio.to_thread(self.get_agent))
+        try:
+            await asyncio.shield(self._load_task)
+        except Exception as e:
+            raise AgentNotReady(f"The RAG agent failed to load: {type(e).__name__}: {e}") from e
+
+    @contextmanager
+    def lease(self):
+        """
+        Use the current agent for one request; a swap will not close it until the block exits.
+        Never loads the agent: raises AgentNotReady until it is loaded (see aload()).
+        """
+        generation = self._current
+        if generation is None:
+            raise AgentNotReady("The RAG agent is still loading")
+
+        with self._lock:
+            generation = self._current
+            generation.in_flight += 1
+        try:
+            yield generation.agent
+        finally:
+            with self._lock:
+                generation.in_flight -= 1
+                if generation.retired and generation.in_flight == 0:
+                    self._drained.notify_all()
+
+    def check_for_update(self) -> bool:
+        """
+        Swap to the version CURRENT points to if it is new.
+        Blocking: builds and warms the new agent in the calling thread.
+
+        Returns:
+            True if a new agent was swapped in
+        """
+        if self._current is None:
+            return False
+
+        with self._swap_lock:
+            version = current_version(self.index_root)
+            if version is None or version == self._current.version:
+                return False
+
+            start = time.perf_counter()
+            print(f"New index version {version}, warming up a new agent...")
+            try:
+                agent = self.build_agent(str(resolve_db_path(self.index_root)))
+                if self.warm_up is not None:
+                    self.warm_up(agent)
+            except Exception as e:
+                # Keep serving the old version; the next poll retries
+                self.failed_swaps += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"Index swap to {version} failed: {self.last_error}")
+                return False
+
+            with self._lock:
+                old = self._current
+                self._current = _Generation(agent, version)
+                old.retired = True
+                self.draining += 1
+
+            self.swaps += 1
+            self.last_error = None
+            self.last_swap_ms = round((time.perf_counter() - start) * 1000, 2)
+            print(f"Swapped to index version {version} in {self.last_swap_ms:.0f} ms")
+
+        threading.Thread(target=self._drain, args=(old,), name="index-drain", daemon=True).start()
+        return True
+
+    def _drain(self, generation: _Generation):
+        with self._lock:
+            self._drained.wait_for(lambda: generation.in_flight == 0, timeout=self.drain_timeout)
+            in_flight = generation.in_flight
+            self.draining -= 1
+
+        if in_flight:
+            print(f"Closing index version {generation.version} with {in_flight} request(s) still running")
+        try:
+            generation.agent.close()
+        except Exception as e:
+            print(f"Error closing retired agent: {e}")
+
+    def start(self):
+        """Poll the CURRENT pointer in a background thread."""
+        if self.poll_interval <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="index-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """Stop polling (an in-progress swap finishes first)."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check_for_update()
+            except Exception as e:
+                print(f"Error checking for a new index version: {e}")
+
+    def stats(self) -> dict:
+        """Swap counters for monitoring."""
+        with self._lock:
+            return {
+                "version": self._current.version if self._current else None,
+                "in_flight": self._current.in_flight if self._current else 0,
+                "swaps": self.swaps,
+                "failed_swaps": self.failed_swaps,
+                "draining": self.draining,
+                "last_swap_ms": self.last_swap_ms,
+                "last_error": self.last_error,
+            }
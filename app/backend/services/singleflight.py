@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight task.
+
+    The first caller for a key starts the work; callers that arrive while it
+    is running await the same task. Each waiter has its own timeout, and the
+    shared task is shielded so a waiter timing out or disconnecting does not
+    cancel the work for everyone else. Exceptions reach every waiter.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable], timeout: Optional[float] = None):
+        """
+        Run func() for key, or join the call already in flight for key.
+
+        Raises:
+            asyncio.TimeoutError: if this waiter's timeout expires first
+        """
+        self.calls += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Mark the exception as retrieved even if every waiter timed out
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,37 @@
+import asyncio
+from app.backend.services.chat_service import agent_lease, get_index_swap, load_agent
+
+def _to_source_text(agent, chunk_id: str, chunk: dict) -> dict:
+    parsed = agent.parse_chapter_metadata(chunk["chapter_metadata"])
+    return {
+        "chunk_id": chunk_id,
+        "text": chunk["text"],
+        "chapter": parsed["chapter_name"],
+        "chapter_number": parsed["chapter_number"],
+        "page": parsed["page_number"],
+    }
+
+async def get_source_texts(chunk_ids: list):
+    """
+    Helper function to fetch source texts by chunk ID from the agent's chunk store.
+    Chunks cited by recent answers are served from memory; the rest cost one Chroma query.
+
+    Returns:
+        Tuple of (found sources in request order, missing chunk IDs)
+    """
+
+    await load_agent()
+    with agent_lease() as agent:
+        # A cache miss queries Chroma, so keep it off the event loop
+        chunks = await asyncio.to_thread(agent.chunk_store.get_many, chunk_ids)
+
+    found = [_to_source_text(agent, chunk_id, chunks[chunk_id]) for chunk_id in dict.fromkeys(chunk_ids) if chunk_id in chunks]
+    missing = [chunk_id for chunk_id in dict.fromkeys(chunk_ids) if chunk_id not in chunks]
+    return found, missing
+
+def get_chunk_store_stats() -> dict:
+    """
+    Hit-rate metrics of the chunk store in this worker.
+    Raises AgentNotReady until the agent is loaded.
+    """
+    return get_index_swap().current_agent().chunk_store.stats()
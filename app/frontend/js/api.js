@@ -44,6 +44,71 @@ class ApiService {
         }
     }
 
+    /**
+     * Stream an answer over server-sent events.
+     * handlers: { onSources(sources), onToken(text), onDone({ not_found, metadata }), onName(name) }
+     * Passing onName asks the backend to generate the chat name alongside the answer.
+     */
+    async streamMessage(message, handlers = {}) {
+        const response = await fetch(`${this.baseUrl}/chat/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ query: message, generate_name: Boolean(handlers.onName) })
+        });
+
+        if (!response.ok || !response.body) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let eventName = 'message';
+                let data = '';
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event: ')) eventName = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                });
+                const payload = data ? JSON.parse(data) : {};
+
+                if (eventName === 'sources' && handlers.onSources) handlers.onSources(payload.sources);
+                else if (eventName === 'token' && handlers.onToken) handlers.onToken(payload.text);
+                else if (eventName === 'done' && handlers.onDone) handlers.onDone(payload);
+                else if (eventName === 'name' && handlers.onName) handlers.onName(payload.name);
+                else if (eventName === 'error') throw new Error(payload.detail);
+            }
+        }
+    }
+
+    /**
+     * Fetch the text of a source cited in an answer (answers only carry chunk IDs).
+     * Returns { chunk_id, text, chapter, chapter_number, page }.
+     */
+    async getSourceText(chunkId) {
+        const response = await fetch(`${this.baseUrl}/sources/${encodeURIComponent(chunkId)}`);
+
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        return response.json();
+    }
+
     async generateChatName(message) {
         try {
             const response = await fetch(`${this.baseUrl}/chat/generate-name`, {
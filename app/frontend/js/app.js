@@ -129,12 +129,12 @@ class ChronosApp {
         // Only show sources if they exist
         if (role === 'ai' && sources && sources.length > 0) {
             const sourcesList = sources.map(s => {
-                const authorText = s.author ? ` • ${s.author}` : '';
+                const authorText = s.chapter_number ? ` • Chapter ${s.chapter_number}` : '';
                 const pageText = s.page ? ` (p. ${s.page})` : '';
                 return `
                     <div class="source-card">
                         <i data-lucide="scroll" width="12"></i>
-                        <span><strong>${s.text}</strong>${authorText}${pageText}</span>
+                        <span><strong>${s.chapter || 'Historical Document'}</strong>${authorText}${pageText}</span>
                     </div>
                 `;
             }).join('');
@@ -102,17 +102,46 @@ function createMessageElement(role, content, sources = []) {
         sourcesList.className = "source-container flex flex-col gap-1 max-h-[300px] overflow-y-auto hidden mt-3 transition-all";
         
         sources.forEach(src => {
+            const title = src.chapter || 'Historical Document';
+            const author = src.chapter_number ? `Chapter ${src.chapter_number}` : 'Ancient Text';
             const card = document.createElement('div');
             card.className = "flex items-start gap-2 text-xs p-2 rounded";
             card.style.cssText = 'background-color: var(--bg); border: 1px solid var(--border); color: var(--text-secondary);';
             card.innerHTML = `
                 <i data-lucide="scroll" width="12" class="mt-0.5" style="color: var(--accent);"></i>
-                <div>
-                    <span class="font-semibold" style="color: var(--text-primary);">${src.text}</span>
-                    ${src.author ? `<span class="mx-1">•</span><span>${src.author}</span>` : ''}
+                <div class="flex-1">
+                    <span class="font-semibold" style="color: var(--text-primary);">${title}</span>
+                    <span class="mx-1">•</span><span>${author}</span>
                     ${src.page ? `<span class="opacity-75"> (p. ${src.page})</span>` : ''}
+                    <div class="source-text hidden mt-2 whitespace-pre-line" style="color: var(--text-primary);"></div>
                 </div>
             `;
+
+            // The answer only carries chunk IDs; fetch the passage the first time it is opened
+            if (src.chunk_id) {
+                card.classList.add('cursor-pointer');
+                card.title = 'Show passage';
+                const textDiv = card.querySelector('.source-text');
+                card.addEventListener('click', async () => {
+                    if (!textDiv.classList.contains('hidden')) {
+                        textDiv.classList.add('hidden');
+                        return;
+                    }
+                    if (!textDiv.dataset.loaded) {
+                        textDiv.textContent = 'Loading passage...';
+                        textDiv.classList.remove('hidden');
+                        try {
+                            const source = await window.apiService.getSourceText(src.chunk_id);
+                            textDiv.textContent = source.text;
+                            textDiv.dataset.loaded = 'true';
+                        } catch (error) {
+                            textDiv.textContent = 'Could not load this passage.';
+                        }
+                        return;
+                    }
+                    textDiv.classList.remove('hidden');
+                });
+            }
             sourcesList.appendChild(card);
         });
 
@@ -181,24 +210,57 @@ async function handleSend(text) {
     setTimeout(() => { if(isTyping) els.thinkingText.textContent = "Analyzing historical contexts..."; }, 1000);
     setTimeout(() => { if(isTyping) els.thinkingText.textContent = "Formatting response..."; }, 2000);
 
-    // 3. Get Response from Backend
-    try {
-        const response = await window.apiService.sendMessage(text);
+    // 3. Stream Response from Backend
+    // For a new chat the name is generated alongside the answer in the same request
+    let nameReceived = false;
+    if (isFirstMessage && !isGeneratingName) {
+        showChatNameLoading();
+    }
 
-        // 4. Add AI Message
-        isTyping = false;
-        els.thinkingIndicator.classList.add('hidden');
-        els.thinkingIndicator.classList.remove('flex');
-        
-        const aiMsg = createMessageElement('ai', response.answer, response.sources);
-        els.messagesList.appendChild(aiMsg);
-        lucide.createIcons(); // Re-render icons for new content
-        els.scrollAnchor.scrollIntoView({ behavior: 'smooth' });
+    try {
+        let sources = [];
+        let answer = '';
+        let aiMsg = null;
+
+        const hideThinking = () => {
+            isTyping = false;
+            els.thinkingIndicator.classList.add('hidden');
+            els.thinkingIndicator.classList.remove('flex');
+        };
+
+        await window.apiService.streamMessage(text, {
+            onSources: (received) => { sources = received || []; },
+            onToken: (token) => {
+                // Replace the thinking indicator with the answer as soon as it starts
+                if (!aiMsg) {
+                    hideThinking();
+                    aiMsg = createMessageElement('ai', '');
+                    els.messagesList.appendChild(aiMsg);
+                    lucide.createIcons();
+                }
+                answer += token;
+                aiMsg.querySelector('.font-serif').innerHTML = formatText(answer);
+                els.scrollAnchor.scrollIntoView({ behavior: 'smooth' });
+            },
+            onDone: (result) => {
+                // 4. Re-render the final AI Message with its sources
+                hideThinking();
+                const finalMsg = createMessageElement('ai', answer, result.not_found ? [] : sources);
+                if (aiMsg) {
+                    els.messagesList.replaceChild(finalMsg, aiMsg);
+                } else {
+                    els.messagesList.appendChild(finalMsg);
+                }
+                aiMsg = finalMsg;
+                lucide.createIcons(); // Re-render icons for new content
+                els.scrollAnchor.scrollIntoView({ behavior: 'smooth' });
+            },
+            onName: isFirstMessage ? (name) => {
+                nameReceived = true;
+                displayChatName(name);
+            } : undefined
+        });
 
-        // Generate chat name for first message
-        if (isFirstMessage && !isGeneratingName) {
-            generateAndDisplayChatName(text);
-        }
     } catch (error) {
         // Handle error
         isTyping = false;
@@ -210,13 +272,15 @@ async function handleSend(text) {
         lucide.createIcons();
         els.scrollAnchor.scrollIntoView({ behavior: 'smooth' });
     }
+
+    // Fall back to a separate request if the stream ended without a name
+    if (isFirstMessage && !nameReceived && !isGeneratingName) {
+        generateAndDisplayChatName(text);
+    }
 }
 
-// Generate and Display Chat Name
-async function generateAndDisplayChatName(firstMessage) {
-    isGeneratingName = true;
-    
-    // Show loading state
+// Show the chat name loading state
+function showChatNameLoading() {
     const sessionContainer = document.getElementById('current-session');
     sessionContainer.innerHTML = `
         <div class="px-3 py-2 text-sm flex items-center gap-2" style="color: var(--text-secondary);">
@@ -225,24 +289,34 @@ async function generateAndDisplayChatName(firstMessage) {
         </div>
     `;
     lucide.createIcons();
+}
+
+// Display the chat name in the sidebar
+function displayChatName(chatName) {
+    currentChatName = chatName;
+    const sessionContainer = document.getElementById('current-session');
+    sessionContainer.innerHTML = `
+        <div class="w-full text-left px-3 py-2 text-sm rounded-md flex items-center gap-2" style="background-color: var(--border); border: 1px solid var(--border); color: var(--text-primary);">
+            <i data-lucide="message-square" width="14" style="color: var(--accent);"></i>
+            <span class="flex-1 truncate font-medium">${chatName}</span>
+        </div>
+    `;
+    lucide.createIcons();
+}
+
+// Generate and Display Chat Name
+async function generateAndDisplayChatName(firstMessage) {
+    isGeneratingName = true;
+    showChatNameLoading();
 
     try {
         // Call backend to generate chat name
         const chatName = await window.apiService.generateChatName(firstMessage);
-        currentChatName = chatName;
-        
-        // Display the chat name
-        sessionContainer.innerHTML = `
-            <div class="w-full text-left px-3 py-2 text-sm rounded-md flex items-center gap-2" style="background-color: var(--border); border: 1px solid var(--border); color: var(--text-primary);">
-                <i data-lucide="message-square" width="14" style="color: var(--accent);"></i>
-                <span class="flex-1 truncate font-medium">${chatName}</span>
-            </div>
-        `;
-        lucide.createIcons();
+        displayChatName(chatName);
     } catch (error) {
         console.error('Error generating chat name:', error);
         // Show error state
-        sessionContainer.innerHTML = `
+        document.getElementById('current-session').innerHTML = `
             <div class="px-3 py-4 text-xs text-center italic" style="color: var(--text-secondary);">
                 Failed to generate chat name
             </div>
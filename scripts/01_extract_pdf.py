@@ -6,6 +6,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.ingestion.artifacts import artifact_name
 from src.ingestion.extract_text import extract_pdf_text
 from src.utils.config import RAW_DATA_DIR, EXTRACTED_DATA_DIR
 
@@ -22,7 +23,8 @@ def main():
     
     for pdf_path in pdf_files:
         print(f"\nProcessing: {pdf_path.name}")
-        output_path = EXTRACTED_DATA_DIR / f"{pdf_path.stem}_extracted.json"
+        # Parquet if pyarrow is installed, else JSON (override with ARTIFACT_FORMAT)
+        output_path = EXTRACTED_DATA_DIR / artifact_name(pdf_path.stem, "extracted")
         
         try:
             result = extract_pdf_text(str(pdf_path), str(output_path))
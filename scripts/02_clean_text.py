@@ -6,16 +6,17 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.ingestion.artifacts import artifact_name, book_from_artifact, find_artifacts
 from src.ingestion.clean_text import clean_extracted_text
 from src.utils import EXTRACTED_DATA_DIR
 
 
 def main():
     """Clean all extracted JSON files."""
-    json_files = list(EXTRACTED_DATA_DIR.glob("*_extracted.json"))
+    json_files = find_artifacts(EXTRACTED_DATA_DIR, "extracted")
     
     if not json_files:
-        print(f"No extracted JSON files found in {EXTRACTED_DATA_DIR}")
+        print(f"No extracted files found in {EXTRACTED_DATA_DIR}")
         return
     
     print(f"Found {len(json_files)} extracted file(s)")
@@ -24,8 +25,8 @@ def main():
     for json_path in json_files:
         print(f"\nProcessing: {json_path.name}")
         
-        # Output: same name but replace "_extracted" with "_cleaned"
-        output_path = json_path.parent / json_path.name.replace("_extracted", "_cleaned")
+        # Output: <book>_cleaned in the current artifact format
+        output_path = json_path.parent / artifact_name(book_from_artifact(json_path, "extracted"), "cleaned")
         
         try:
             result = clean_extracted_text(
@@ -6,16 +6,17 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.ingestion.artifacts import artifact_name, book_from_artifact, find_artifacts
 from src.ingestion.chunk_text import chunk_from_json
 from src.utils import EXTRACTED_DATA_DIR
 
 
 def main():
     """Create semantic chunks from cleaned JSON files."""
-    json_files = list(EXTRACTED_DATA_DIR.glob("*_cleaned.json"))
+    json_files = find_artifacts(EXTRACTED_DATA_DIR, "cleaned")
     
     if not json_files:
-        print(f"No cleaned JSON files found in {EXTRACTED_DATA_DIR}")
+        print(f"No cleaned files found in {EXTRACTED_DATA_DIR}")
         return
     
     print(f"Found {len(json_files)} cleaned file(s)")
@@ -24,8 +25,8 @@ def main():
     for json_path in json_files:
         print(f"\nProcessing: {json_path.name}")
         
-        # Output: same name but replace "_cleaned" with "_chunks"
-        output_path = json_path.parent / json_path.name.replace("_cleaned", "_chunks")
+        # Output: <book>_chunks in the current artifact format
+        output_path = json_path.parent / artifact_name(book_from_artifact(json_path, "cleaned"), "chunks")
         
         try:
             chunks = chunk_from_json(
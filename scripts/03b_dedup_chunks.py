@@ -0,0 +1,47 @@
+"""Script to remove near-duplicate chunks before building the vector DB."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion.artifacts import find_artifacts
+from src.ingestion.dedup_chunks import dedup_from_json
+from src.utils import EXTRACTED_DATA_DIR
+
+
+def main():
+    """Deduplicate all chunk files in place."""
+    json_files = find_artifacts(EXTRACTED_DATA_DIR, "chunks")
+    
+    if not json_files:
+        print(f"No chunk files found in {EXTRACTED_DATA_DIR}")
+        return
+    
+    print(f"Found {len(json_files)} chunk file(s)")
+    print("="*60)
+    
+    for json_path in json_files:
+        print(f"\nProcessing: {json_path.name}")
+        
+        try:
+            # Overwrite the chunk file so 04_build_vector_db.py picks up the result
+            chunks = dedup_from_json(
+                input_path=str(json_path),
+                threshold=0.8,
+                merge=True
+            )
+            print(f"✓ Kept {len(chunks)} unique chunks")
+            
+        except Exception as e:
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    print("\n" + "="*60)
+    print("Deduplication complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,57 @@
 """Script to build ChromaDB vector database from chunks."""
 
+import shutil
 import sys
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.embeddings.store import build_vector_db_from_chunks
+from src.embeddings.shards import build_book_shard, load_shard_manifest
+from src.embeddings.versions import (
+    new_version_dir,
+    prune_versions,
+    publish_version,
+    resolve_db_path,
+)
+from src.ingestion.artifacts import book_from_artifact, find_artifacts
 from src.utils import EXTRACTED_DATA_DIR, PROJECT_ROOT
 
 
 def main():
     """Build vector database from chunk files."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Build a new version of the vector database and make it current"
+    )
+    parser.add_argument(
+        "--db-dir",
+        default=str(PROJECT_ROOT / "data" / "vector_db"),
+        help="Root of the versioned vector database (default: data/vector_db/)"
+    )
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=3,
+        help="Number of index versions to keep on disk (default: 3)"
+    )
+    parser.add_argument(
+        "--book",
+        help="Rebuild only this book (e.g. world_history) on top of the current "
+             "version; the other books' collections are copied, not re-embedded"
+    )
+    
+    args = parser.parse_args()
+    
     chunks_dir = EXTRACTED_DATA_DIR
-    chunks_files = list(chunks_dir.glob("*_chunks.json"))
+    chunks_files = find_artifacts(chunks_dir, "chunks")
+    
+    if args.book:
+        chunks_files = [p for p in chunks_files if book_from_artifact(p, "chunks") == args.book]
+        if not chunks_files:
+            print(f"No chunk file for book '{args.book}' in {chunks_dir}")
+            return
     
     if not chunks_files:
         print(f"No chunk files found in {chunks_dir}")
@@ -22,23 +60,41 @@ def main():
     print(f"Found {len(chunks_files)} chunk file(s)")
     print("="*60)
     
-    # Vector DB storage location
-    db_dir = PROJECT_ROOT / "data" / "vector_db"
+    # Build into a fresh version directory; the running API keeps serving
+    # the current version until this one is published
+    db_dir = new_version_dir(args.db_dir)
+    print(f"Building index version: {db_dir.name}")
+    
+    if args.book:
+        # Start from a copy of the current version so only this book is re-embedded
+        current_dir = resolve_db_path(args.db_dir)
+        if load_shard_manifest(current_dir) is None:
+            print(f"Current index in {current_dir} is not sharded by book; run a full build first")
+            shutil.rmtree(db_dir, ignore_errors=True)
+            return
+        shutil.copytree(current_dir, db_dir, dirs_exist_ok=True)
+        print(f"Copied other books from: {current_dir.name}")
+    
+    built = 0
     
     for chunks_path in chunks_files:
         print(f"\nProcessing: {chunks_path.name}")
+        book = book_from_artifact(chunks_path, "chunks")
         
         try:
-            collection = build_vector_db_from_chunks(
-                chunks_path=str(chunks_path),
-                db_path=str(db_dir),
+            # One collection per book, so a book can be rebuilt without touching the others
+            collection = build_book_shard(
+                db_path=db_dir,
+                chunks_path=chunks_path,
+                book=book,
                 model_name="all-MiniLM-L6-v2",
                 batch_size=100
             )
             
-            print(f"\nVector database built: {chunks_path.stem.replace('_chunks','')}")
+            print(f"\nVector database built: {book}")
             print(f"  Collection: {collection.name}")
             print(f"  Total vectors: {collection.count()}")
+            built += 1
             
         except Exception as e:
             print(f"Error: {e}")
@@ -46,8 +102,19 @@ def main():
             traceback.print_exc()
     
     print("\n" + "="*60)
+    if built < len(chunks_files):
+        print(f"{len(chunks_files) - built} chunk file(s) failed, not publishing {db_dir.name}")
+        print(f"Partial build left in: {db_dir}")
+        return
+    
+    publish_version(args.db_dir, db_dir)
+    pruned = prune_versions(args.db_dir, keep=args.keep)
+    
     print(f"Vector database creation complete!")
     print(f"Database stored in: {db_dir}")
+    print(f"Published as current version of {args.db_dir}; servers swap to it on their next check")
+    if pruned:
+        print(f"Removed old versions: {', '.join(pruned)}")
 
 
 if __name__ == "__main__":
@@ -1,15 +1,34 @@
 """Script to search the ChromaDB vector database."""
 
 import sys
+import time
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.retrieval.daemon import connect_daemon
 from src.retrieval.search import retrieve_context, print_results
 from src.utils import PROJECT_ROOT
 
 
+def get_search_function():
+    """
+    Search through the warm query daemon if it is running, otherwise in-process.
+    
+    Returns:
+        Tuple of (function with retrieve_context()'s arguments, True if using the daemon)
+    """
+    client = connect_daemon()
+    if client is None:
+        return retrieve_context, False
+    
+    def daemon_search(query, db_path, collection_name="world_history", k=5):
+        return client.search(query, db_path=db_path, collection_name=collection_name, k=k)
+    
+    return daemon_search, True
+
+
 def main():
     """Search the vector database with example queries."""
     
@@ -35,6 +54,10 @@ def main():
         "Describe the social structure of Mesopotamian cities",
     ]
     
+    search_fn, via_daemon = get_search_function()
+    if via_daemon:
+        print("Using query daemon\n")
+    
     print("Running example queries...\n")
     
     for i, query in enumerate(queries, 1):
@@ -43,14 +66,17 @@ def main():
         print("="*80)
         
         try:
-            results = retrieve_context(
+            start = time.perf_counter()
+            results = search_fn(
                 query=query,
                 db_path=str(db_dir),
                 collection_name="world_history",
                 k=10
             )
+            elapsed_ms = (time.perf_counter() - start) * 1000
             
             print_results(results)
+            print(f"({elapsed_ms:.0f} ms{', via daemon' if via_daemon else ''})")
             
         except Exception as e:
             print(f"Error during search: {e}")
@@ -82,6 +108,8 @@ def interactive_search():
     print("Type your questions (or 'quit' to exit)")
     print()
     
+    search_fn, via_daemon = get_search_function()
+    
     while True:
         query = input("Query: ").strip()
         
@@ -93,14 +121,17 @@ def interactive_search():
             continue
         
         try:
-            results = retrieve_context(
+            start = time.perf_counter()
+            results = search_fn(
                 query=query,
                 db_path=str(db_dir),
                 collection_name="world_history",
                 k=5
             )
+            elapsed_ms = (time.perf_counter() - start) * 1000
             
             print_results(results)
+            print(f"({elapsed_ms:.0f} ms{', via daemon' if via_daemon else ''})")
             print()
             
         except Exception as e:
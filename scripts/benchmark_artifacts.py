@@ -0,0 +1,94 @@
+"""Compare file size and load time of JSON and Parquet intermediate files."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.benchmarks.artifacts import ARTIFACT_KINDS, run_benchmark, save_report
+from src.ingestion.artifacts import book_from_artifact, find_artifacts, pyarrow_available
+from src.utils import EXTRACTED_DATA_DIR, PROJECT_ROOT
+
+
+def main():
+    """Convert a book's page and chunk files to both formats and time loading them."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measure size and load time of the extracted, cleaned and chunk files as JSON vs Parquet"
+    )
+    parser.add_argument(
+        "--book",
+        help="Book to measure (default: the first book with an extracted file)"
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=str(EXTRACTED_DATA_DIR),
+        help="Directory with the book's files (default: data/extracted/)"
+    )
+    parser.add_argument(
+        "--work-dir",
+        default=str(PROJECT_ROOT / "data" / "benchmarks" / "artifacts"),
+        help="Directory for the converted copies (default: data/benchmarks/artifacts/)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Loads per measurement; the fastest is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="Write the JSON report to this path"
+    )
+
+    args = parser.parse_args()
+
+    if not pyarrow_available():
+        print("pyarrow is not installed: pip install pyarrow")
+        sys.exit(1)
+
+    found = {
+        artifact: {book_from_artifact(path, artifact): path for path in find_artifacts(args.data_dir, artifact)}
+        for artifact in ARTIFACT_KINDS
+    }
+    book = args.book or next(iter(found["extracted"] or found["cleaned"] or found["chunks"]), None)
+    if book is None:
+        print(f"No extracted, cleaned or chunk files found in {args.data_dir}")
+        return
+
+    sources = {artifact: files[book] for artifact, files in found.items() if book in files}
+
+    print("="*96)
+    print(f"INTERMEDIATE FORMAT BENCHMARK: {book}")
+    print("="*96)
+
+    report = run_benchmark(sources, args.work_dir, repeats=args.repeats)
+    report["book"] = book
+
+    print(f"{'file':<10} {'format':<8} {'size MB':>9} {'load ms':>10} {'cols ms':>10}  columns")
+    print("-" * 96)
+    for row in report["rows"]:
+        print(
+            f"{row['artifact']:<10} {row['format']:<8} {row['size_bytes'] / 2**20:>9.2f} "
+            f"{row['load_ms']:>10.1f} {row['column_load_ms']:>10.1f}  {', '.join(row['columns'])}"
+        )
+
+    print()
+    for artifact in sources:
+        json_row, parquet_row = [r for r in report["rows"] if r["artifact"] == artifact]
+        print(
+            f"{artifact}: Parquet is {json_row['size_bytes'] / max(parquet_row['size_bytes'], 1):.1f}x smaller, "
+            f"loads {json_row['load_ms'] / max(parquet_row['load_ms'], 0.01):.1f}x faster "
+            f"({json_row['column_load_ms'] / max(parquet_row['column_load_ms'], 0.01):.1f}x for the next stage's columns)"
+        )
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"\n✓ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
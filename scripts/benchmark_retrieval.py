@@ -0,0 +1,107 @@
+"""Benchmark retrieval quality and latency of the vector database."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.benchmarks.retrieval import run_benchmark, save_report
+from src.utils import PROJECT_ROOT
+
+
+def main():
+    """Run the retrieval benchmark and print a summary table."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measure recall@k, MRR and search latency for each search engine"
+    )
+    parser.add_argument(
+        "--db-path",
+        default=str(PROJECT_ROOT / "data" / "world_history_store"),
+        help="Path to ChromaDB database (default: data/world_history_store/)"
+    )
+    parser.add_argument(
+        "--collection",
+        default="world_history",
+        help="ChromaDB collection name (default: world_history)"
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=["chroma", "exact"],
+        help="Engines to benchmark (default: chroma exact)"
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=200,
+        help="Number of synthetic queries sampled from chunks (default: 200)"
+    )
+    parser.add_argument(
+        "--k",
+        type=int,
+        nargs="+",
+        default=[1, 5, 10],
+        help="Cutoffs for recall@k (default: 1 5 10)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for synthetic query sampling (default: 0)"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="Write the JSON report to this path"
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.db_path).exists():
+        print(f"Database not found at: {args.db_path}")
+        print("Please run 04_build_vector_db.py first")
+        return
+
+    import chromadb
+    from chromadb.utils import embedding_functions
+
+    client = chromadb.PersistentClient(path=args.db_path)
+    collection = client.get_collection(name=args.collection)
+    # Same all-MiniLM-L6-v2 model the index was built with
+    embed = embedding_functions.DefaultEmbeddingFunction()
+
+    print("="*80)
+    print("RETRIEVAL BENCHMARK")
+    print("="*80)
+    print(f"Database: {args.db_path}")
+    print(f"Collection: {args.collection}\n")
+
+    report = run_benchmark(
+        collection,
+        embed=embed,
+        db_path=args.db_path,
+        engines=args.engines,
+        n_synthetic=args.synthetic,
+        ks=args.k,
+        seed=args.seed
+    )
+
+    print(f"Chunks: {report['chunks']}  Queries: {report['query_sets']}")
+    print(f"Query embedding ms/query: {report['embed_ms_per_query']}\n")
+
+    metrics = [f"recall@{k}" for k in args.k] + ["mrr", "latency_ms_p50", "latency_ms_p99", "index_bytes"]
+    print(f"{'engine':<8} {'queries':<10} " + " ".join(f"{m:>15}" for m in metrics))
+    for engine, sets in report["results"].items():
+        for set_name, result in sets.items():
+            print(f"{engine:<8} {set_name:<10} " + " ".join(f"{str(result[m]):>15}" for m in metrics))
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"\n✓ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare the local chat titler with the LLM titler."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.benchmarks.titler import load_questions, run_benchmark, save_report
+from src.utils import PROJECT_ROOT
+
+
+def main():
+    """Run the titler benchmark and print latencies and sample titles."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measure latency and sample outputs of the local and LLM chat titlers"
+    )
+    parser.add_argument(
+        "--requests-file",
+        default=str(PROJECT_ROOT / "src" / "benchmarks" / "sample_requests.jsonl"),
+        help="JSONL file of questions (default: src/benchmarks/sample_requests.jsonl)"
+    )
+    parser.add_argument(
+        "--llm",
+        choices=["gemini", "stub"],
+        default="gemini",
+        help="LLM backend for the LLM titler (default: gemini, needs GEMINI_API_KEY)"
+    )
+    parser.add_argument(
+        "--no-chapter",
+        action="store_true",
+        help="Title from the question only, without loading the agent for chapter lookups"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help="Calls per question and titler (default: 1)"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="Write the JSON report to this path"
+    )
+
+    args = parser.parse_args()
+
+    # Must be set before the app settings are first read
+    os.environ["LLM_BACKEND"] = args.llm
+
+    from app.backend.services.chat_service import generate_llm_chat_name, get_local_titler
+    from src.agents.titler import LocalTitler
+
+    local_titler = LocalTitler() if args.no_chapter else get_local_titler()
+
+    async def local(question):
+        return local_titler.title(question)
+
+    questions = load_questions(args.requests_file)
+
+    print("="*80)
+    print("CHAT TITLER BENCHMARK")
+    print("="*80)
+    print(f"Questions: {len(questions)}  LLM backend: {args.llm}  Chapter lookup: {not args.no_chapter}\n")
+
+    if not args.no_chapter:
+        # Load the agent before timing so the first call does not pay for it
+        local_titler.title("warm up")
+
+    report = asyncio.run(run_benchmark(
+        questions,
+        {"local": local, "llm": generate_llm_chat_name},
+        repeats=args.repeats
+    ))
+
+    print(f"{'titler':<8} " + " ".join(f"{m:>10}" for m in ("p50 ms", "p95 ms", "max ms")))
+    for name, latency in report["latency_ms"].items():
+        print(f"{name:<8} {latency['p50']:>10} {latency['p95']:>10} {latency['max']:>10}")
+
+    print()
+    for sample in report["samples"]:
+        print(f"Q:     {sample['question']}")
+        print(f"local: {sample['local']}")
+        print(f"llm:   {sample['llm']}\n")
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"✓ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
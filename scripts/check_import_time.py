@@ -0,0 +1,71 @@
+"""Check import-time budgets so heavy dependencies stay lazy."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.benchmarks.import_time import (
+    CLI_BUDGETS_MS,
+    IMPORT_BUDGETS_MS,
+    measure_cli,
+    measure_import,
+    run_importtime,
+)
+
+
+def main():
+    """Measure every module and CLI against its budget; exit 1 on any regression."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Fail if imports or CLI startup exceed their time budgets or load heavy dependencies eagerly"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="Runs per measurement; the fastest is used (default: 3)"
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget, e.g. 2 on slow CI machines (default: 1.0)"
+    )
+
+    args = parser.parse_args()
+
+    startup_modules = {name for name, _, _ in run_importtime("pass")}
+    failures = []
+
+    print(f"{'module':<32} {'ms':>8} {'budget':>8}  heavy imports")
+    print("-" * 70)
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        budget *= args.scale
+        elapsed, heavy = measure_import(module, startup_modules, args.runs)
+        ok = elapsed <= budget and not heavy
+        print(f"{module:<32} {elapsed:>8.1f} {budget:>8.0f}  {', '.join(heavy) or '-'}{'' if ok else '  FAIL'}")
+        if not ok:
+            failures.append(module)
+
+    print(f"\n{'cli (--help)':<32} {'ms':>8} {'budget':>8}")
+    print("-" * 70)
+    for script, budget in CLI_BUDGETS_MS.items():
+        budget *= args.scale
+        elapsed = measure_cli(script, args.runs)
+        ok = elapsed <= budget
+        print(f"{script:<32} {elapsed:>8.1f} {budget:>8.0f}{'' if ok else '  FAIL'}")
+        if not ok:
+            failures.append(script)
+
+    if failures:
+        print(f"\n✗ Over budget: {', '.join(failures)}")
+        sys.exit(1)
+
+    print("\n✓ All import-time budgets met")
+
+
+if __name__ == "__main__":
+    main()
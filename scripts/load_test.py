@@ -0,0 +1,126 @@
+"""Load test the chat API by replaying a JSONL file of requests."""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.benchmarks.load_test import compare_reports, run_load_test, save_report
+from src.utils import PROJECT_ROOT
+
+
+def main():
+    """Run the load test and print a summary."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Replay chat requests against the FastAPI app and report latency"
+    )
+    parser.add_argument(
+        "--requests-file",
+        default=str(PROJECT_ROOT / "src" / "benchmarks" / "sample_requests.jsonl"),
+        help="JSONL file of requests (default: src/benchmarks/sample_requests.jsonl)"
+    )
+    parser.add_argument(
+        "--requests",
+        "-n",
+        type=int,
+        default=100,
+        help="Total number of requests to send (default: 100)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=10,
+        help="Requests in flight at once, closed loop (default: 10)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Open-loop arrival rate in requests per second (overrides --concurrency)"
+    )
+    parser.add_argument(
+        "--base-url",
+        help="Target a running server (e.g. http://localhost:8000) instead of the app in-process"
+    )
+    parser.add_argument(
+        "--llm",
+        choices=["gemini", "stub"],
+        default="stub",
+        help="LLM backend for in-process runs (default: stub)"
+    )
+    parser.add_argument(
+        "--disable-caches",
+        action="store_true",
+        help="Disable the answer and semantic caches for in-process runs"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="Write the JSON report to this path"
+    )
+    parser.add_argument(
+        "--compare",
+        help="Baseline report to compare against"
+    )
+
+    args = parser.parse_args()
+
+    if not args.base_url:
+        # Settings are read when the app is imported, so set them first
+        os.environ["LLM_BACKEND"] = args.llm
+        if args.disable_caches:
+            os.environ["ANSWER_CACHE_ENABLED"] = "false"
+            os.environ["SEMANTIC_CACHE_ENABLED"] = "false"
+
+    print("="*60)
+    print("LOAD TEST")
+    print("="*60)
+    print(f"Target: {args.base_url or 'in-process'}")
+    print(f"Requests: {args.requests} from {args.requests_file}")
+    if args.rate:
+        print(f"Mode: open loop at {args.rate} req/s")
+    else:
+        print(f"Mode: closed loop, concurrency {args.concurrency}")
+
+    report = asyncio.run(run_load_test(
+        requests_path=args.requests_file,
+        total=args.requests,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        base_url=args.base_url
+    ))
+
+    overall = report["overall"]
+    latency = overall["latency_ms"]
+    print(f"\nThroughput: {report['throughput_rps']} req/s over {report['wall_seconds']}s")
+    print(f"Errors: {overall['errors']} ({overall['error_rate']:.1%}) {overall['status_counts']}")
+    print(f"Latency ms: p50 {latency.get('p50')}  p95 {latency.get('p95')}  p99 {latency.get('p99')}  max {latency.get('max')}")
+
+    for name, summary in report["endpoints"].items():
+        print(f"\n[{name}] {summary['requests']} requests, p95 {summary['latency_ms'].get('p95')} ms")
+        for stage, stats in summary["stages_ms"].items():
+            print(f"  {stage:<22} p50 {stats['p50']:>9}  p95 {stats['p95']:>9}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf8") as f:
+            baseline = json.load(f)
+        report["comparison"] = compare_reports(report, baseline)
+
+        print(f"\nCompared to {args.compare}:")
+        for metric, diff in report["comparison"].items():
+            change = f"{diff['change_pct']:+.1f}%" if diff["change_pct"] is not None else "n/a"
+            print(f"  {metric:<16} {diff['baseline']} -> {diff['current']} ({change})")
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"\n✓ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
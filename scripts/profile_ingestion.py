@@ -0,0 +1,114 @@
+"""Script to profile the ingestion pipeline (extract, clean, chunk, store)."""
+
+import shutil
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion.artifacts import artifact_name
+from src.utils import PROJECT_ROOT, RAW_DATA_DIR, StageProfiler
+
+STAGES = ["extract", "clean", "chunk", "store"]
+
+
+def main():
+    """Run the pipeline on one PDF under the profiler and save a run report."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Profile wall time, CPU time, throughput and peak memory of each ingestion stage"
+    )
+    parser.add_argument(
+        "--pdf",
+        help="PDF to ingest (default: first PDF in data/raw/)"
+    )
+    parser.add_argument(
+        "--work-dir",
+        default=str(PROJECT_ROOT / "data" / "profiling"),
+        help="Directory for intermediate files and the throwaway vector DB (default: data/profiling/)"
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=STAGES,
+        help="Stages to run; later stages reuse earlier outputs in --work-dir (default: all)"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="Report path (default: <work-dir>/profile_report.json)"
+    )
+    parser.add_argument(
+        "--cprofile-dir",
+        help="Also write a cProfile .prof file per stage (view with snakeviz or pstats)"
+    )
+
+    args = parser.parse_args()
+
+    if args.pdf:
+        pdf_path = Path(args.pdf)
+    else:
+        pdf_files = sorted(RAW_DATA_DIR.glob("*.pdf"))
+        if not pdf_files:
+            print(f"No PDF files found in {RAW_DATA_DIR}")
+            return
+        pdf_path = pdf_files[0]
+
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    extracted_path = work_dir / artifact_name(pdf_path.stem, "extracted")
+    cleaned_path = work_dir / artifact_name(pdf_path.stem, "cleaned")
+    chunks_path = work_dir / artifact_name(pdf_path.stem, "chunks")
+    db_path = work_dir / "vector_db"
+
+    print("="*60)
+    print("INGESTION PROFILE")
+    print("="*60)
+    print(f"PDF: {pdf_path}")
+    print(f"Work dir: {work_dir}")
+    print(f"Stages: {', '.join(args.stages)}\n")
+
+    profiler = StageProfiler(cprofile_dir=args.cprofile_dir)
+
+    with profiler.activate():
+        if "extract" in args.stages:
+            from src.ingestion.extract_text import extract_pdf_text
+            with profiler.stage("extract") as stage:
+                pages = extract_pdf_text(str(pdf_path), str(extracted_path))
+                stage.items = len(pages)
+
+        if "clean" in args.stages:
+            from src.ingestion.clean_text import clean_extracted_text
+            with profiler.stage("clean") as stage:
+                pages = clean_extracted_text(str(extracted_path), str(cleaned_path))
+                stage.items = len(pages)
+
+        if "chunk" in args.stages:
+            from src.ingestion.chunk_text import chunk_from_json
+            with profiler.stage("chunk") as stage:
+                chunks = chunk_from_json(str(cleaned_path), str(chunks_path))
+                stage.items = len(chunks)
+
+        if "store" in args.stages:
+            from src.embeddings.store import build_vector_db_from_chunks
+            # Rebuild from scratch so repeated runs measure the same amount of work
+            shutil.rmtree(db_path, ignore_errors=True)
+            with profiler.stage("store") as stage:
+                collection = build_vector_db_from_chunks(str(chunks_path), str(db_path))
+                stage.items = collection.count()
+
+    print("\n" + "="*60)
+    profiler.print_summary()
+
+    output_path = args.output or str(work_dir / "profile_report.json")
+    profiler.save(output_path)
+    print(f"\n✓ Report saved to {output_path}")
+    if args.cprofile_dir:
+        print(f"✓ cProfile stats saved to {args.cprofile_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Run the warm query daemon used by query_rag.py and 05_search_vector_db.py."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.retrieval.daemon import QueryDaemon, connect_daemon, default_socket_path
+from src.utils import PROJECT_ROOT
+
+
+def main():
+    """Start, stop or check the query daemon."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Keep the RAG agent and retriever warm behind a Unix socket"
+    )
+    parser.add_argument(
+        "--socket",
+        default=default_socket_path(),
+        help=f"Unix socket path (default: {default_socket_path()})"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["gemini", "stub"],
+        default="gemini",
+        help="LLM backend for questions (default: gemini)"
+    )
+    parser.add_argument(
+        "--db-path",
+        default=str(PROJECT_ROOT / "data" / "vector_db"),
+        help="Database to preload the agent for (default: data/vector_db/)"
+    )
+    parser.add_argument(
+        "--search-db-path",
+        default=str(PROJECT_ROOT / "data" / "world_history_store"),
+        help="Database to preload the search embedder for (default: data/world_history_store/)"
+    )
+    parser.add_argument(
+        "--collection",
+        default="world_history",
+        help="ChromaDB collection name (default: world_history)"
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Report whether a daemon is running and exit"
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the running daemon and exit"
+    )
+
+    args = parser.parse_args()
+
+    if args.status or args.stop:
+        client = connect_daemon(args.socket)
+        if client is None:
+            print(f"No query daemon running on {args.socket}")
+            return
+        if args.status:
+            print(f"Query daemon running on {args.socket}: {client.request('ping')}")
+        else:
+            client.request("shutdown")
+            print("Query daemon stopping")
+        client.close()
+        return
+
+    daemon = QueryDaemon(socket_path=args.socket, backend=args.backend)
+
+    # Load and warm everything up front so the first query is as fast as the rest
+    if Path(args.db_path).exists():
+        try:
+            with daemon.agent_lease(args.db_path, args.collection) as agent:
+                timings = agent.warm_up()
+            print(f"Agent warm: {timings}")
+        except Exception as e:
+            print(f"Could not preload agent: {e}")
+    if Path(args.search_db_path).exists():
+        try:
+            # Leasing it once loads the embedder and collection
+            with daemon.searcher_lease(args.search_db_path, args.collection, "all-MiniLM-L6-v2"):
+                pass
+            print("Searcher warm")
+        except Exception as e:
+            print(f"Could not preload searcher: {e}")
+
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 """Query RAG system - Ask questions from the RAG system."""
 
 import sys
+import time
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.agents import HistoryAgent
+from src.agents import HistoryAgent, create_backend
+from src.retrieval.daemon import connect_daemon
 from src.utils import PROJECT_ROOT
 
 
@@ -32,12 +34,23 @@ def main():
         "-q",
         help="Ask a single question and exit"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["gemini", "stub"],
+        default="gemini",
+        help="LLM backend; 'stub' runs offline without an API key (default: gemini)"
+    )
     parser.add_argument(
         "--n-results",
         type=int,
         default=10,
         help="Number of results to retrieve (default: 10)"
     )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Always answer in-process, even if scripts/query_daemon.py is running"
+    )
     
     args = parser.parse_args()
     
@@ -51,17 +64,42 @@ def main():
     print(f"Database: {db_path}")
     print(f"Retrieving top {args.n_results} results per query\n")
     
-    # Initialize agent
-    print("Initializing AI tutor...")
-    try:
-        agent = HistoryAgent(
-            db_path=db_path,
-            collection_name=args.collection
-        )
-        print("Agent ready!\n")
-    except Exception as e:
-        print(f"Error initializing agent: {e}")
-        sys.exit(1)
+    # Use the warm daemon if one is running, otherwise initialize the agent here
+    client = None if args.no_daemon else connect_daemon()
+    if client is not None:
+        print(f"Using query daemon at {client.socket_path}\n")
+        
+        def ask(question):
+            return client.ask(
+                question,
+                db_path=db_path,
+                collection_name=args.collection,
+                n_results=args.n_results,
+                backend=args.backend
+            )
+    else:
+        print("Initializing AI tutor...")
+        start = time.perf_counter()
+        try:
+            agent = HistoryAgent(
+                db_path=db_path,
+                collection_name=args.collection,
+                backend=create_backend(args.backend)
+            )
+            print(f"Agent ready! ({time.perf_counter() - start:.1f}s)\n")
+        except Exception as e:
+            print(f"Error initializing agent: {e}")
+            sys.exit(1)
+        
+        def ask(question):
+            return agent.ask(question, n_results=args.n_results)
+    
+    def answer_question(question):
+        start = time.perf_counter()
+        result = ask(question)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Answer: {result['answer']}\n")
+        print(f"({elapsed_ms:.0f} ms{', via daemon' if client is not None else ''})\n")
     
     # Single question mode
     if args.question:
@@ -69,8 +107,7 @@ def main():
         print("🤔 Thinking...\n")
         
         try:
-            answer = agent.ask(args.question, n_results=args.n_results)
-            print(f"Answer: {answer}\n")
+            answer_question(args.question)
         except Exception as e:
             print(f"Error: {e}")
             sys.exit(1)
@@ -95,8 +132,7 @@ def main():
             
             print("\nThinking...\n")
             
-            answer = agent.ask(question, n_results=args.n_results)
-            print(f"Answer: {answer}\n")
+            answer_question(question)
             print("-" * 80 + "\n")
             
         except KeyboardInterrupt:
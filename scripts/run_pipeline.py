@@ -0,0 +1,90 @@
+"""Script to run the ingestion pipeline (extract, clean, chunk, dedup, store) with cached stages."""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion.pipeline import STAGES, IngestionPipeline, print_summary
+from src.utils import EXTRACTED_DATA_DIR, PROJECT_ROOT, RAW_DATA_DIR
+
+
+def main():
+    """Run the pipeline, skipping stages whose inputs, code and parameters are unchanged."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(
+        description="Run extract → clean → chunk → dedup → store, reusing cached stage outputs"
+    )
+    parser.add_argument("--from", dest="from_stage", choices=STAGES, default="extract",
+                        help="First stage to run; earlier stages' files on disk are used as input (default: extract)")
+    parser.add_argument("--to", dest="to_stage", choices=STAGES, default="store",
+                        help="Last stage to run (default: store)")
+    parser.add_argument("--books", nargs="+", help="Only process these books (PDF names without .pdf)")
+    parser.add_argument("--jobs", "-j", type=int, default=2, help="Books processed in parallel (default: 2)")
+    parser.add_argument("--force", action="store_true", help="Rerun every selected stage, ignoring the cache")
+    parser.add_argument("--pdf-dir", default=str(RAW_DATA_DIR), help="Directory of source PDFs (default: data/raw/)")
+    parser.add_argument("--output-dir", default=str(EXTRACTED_DATA_DIR),
+                        help="Directory for per-book files (default: data/extracted/)")
+    parser.add_argument("--cache-dir", default=str(PROJECT_ROOT / "data" / "cache" / "pipeline"),
+                        help="Artifact cache directory (default: data/cache/pipeline/)")
+    parser.add_argument("--db-dir", default=str(PROJECT_ROOT / "data" / "vector_db"),
+                        help="Root of the versioned vector database (default: data/vector_db/)")
+    parser.add_argument("--keep", type=int, default=3, help="Number of index versions to keep on disk (default: 3)")
+    parser.add_argument("--start-page", type=int, help="clean: first page to keep")
+    parser.add_argument("--end-page", type=int, help="clean: last page to keep")
+    parser.add_argument("--similarity-threshold", type=float, help="chunk: similarity below which a chunk is split")
+    parser.add_argument("--max-sentences", type=int, help="chunk: maximum sentences per chunk")
+    parser.add_argument("--dedup-threshold", type=float, help="dedup: Jaccard similarity threshold")
+    parser.add_argument("--output", "-o", help="Also save the per-stage results as JSON")
+
+    args = parser.parse_args()
+
+    overrides = {
+        "clean": {"start_page": args.start_page, "end_page": args.end_page},
+        "chunk": {"similarity_threshold": args.similarity_threshold, "max_sentences_per_chunk": args.max_sentences},
+        "dedup": {"threshold": args.dedup_threshold},
+    }
+    params = {
+        stage: {name: value for name, value in values.items() if value is not None}
+        for stage, values in overrides.items()
+    }
+
+    pipeline = IngestionPipeline(
+        output_dir=args.output_dir,
+        cache_dir=args.cache_dir,
+        db_dir=args.db_dir,
+        params=params,
+        jobs=args.jobs,
+        force=args.force,
+        keep=args.keep
+    )
+
+    print("="*60)
+    print(f"INGESTION PIPELINE: {args.from_stage} → {args.to_stage}")
+    print("="*60)
+
+    start = time.perf_counter()
+    try:
+        results = pipeline.run(args.from_stage, args.to_stage, books=args.books, pdf_dir=args.pdf_dir)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    wall_seconds = time.perf_counter() - start
+
+    print("\n" + "="*60)
+    print_summary(results, wall_seconds)
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf8") as f:
+            json.dump({"wall_seconds": round(wall_seconds, 3), "results": results}, f, indent=2)
+        print(f"\n✓ Results saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
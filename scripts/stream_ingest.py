@@ -0,0 +1,124 @@
+"""Script to ingest PDFs straight into a new vector database version in one streaming pass."""
+
+import shutil
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.embeddings.shards import (
+    book_collection_name,
+    drop_book_collection,
+    load_shard_manifest,
+    update_shard_manifest,
+)
+from src.embeddings.versions import new_version_dir, prune_versions, publish_version, resolve_db_path
+from src.utils import PROJECT_ROOT, RAW_DATA_DIR
+
+
+def main():
+    """Stream each PDF through extract → clean → chunk → dedup → embed → store, then publish."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Ingest PDFs into the vector database without writing intermediate JSON files"
+    )
+    parser.add_argument(
+        "--pdf",
+        nargs="+",
+        help="PDFs to ingest; the other books are copied from the current version "
+             "(default: every PDF in data/raw/, into a fresh version)"
+    )
+    parser.add_argument(
+        "--db-dir",
+        default=str(PROJECT_ROOT / "data" / "vector_db"),
+        help="Root of the versioned vector database (default: data/vector_db/)"
+    )
+    parser.add_argument("--keep", type=int, default=3, help="Number of index versions to keep on disk (default: 3)")
+    parser.add_argument("--debug-dir", help="Also write each stage's output as JSON lines to this directory")
+    parser.add_argument("--queue-size", type=int, default=32, help="Capacity of each queue between stages (default: 32)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Chunks embedded and stored per batch (default: 100)")
+    parser.add_argument("--start-page", type=int, default=10, help="First page to keep (default: 10)")
+    parser.add_argument("--end-page", type=int, default=486, help="Last page to keep (default: 486)")
+    parser.add_argument("--similarity-threshold", type=float, default=0.55, help="Chunking similarity threshold (default: 0.55)")
+    parser.add_argument("--max-sentences", type=int, default=10, help="Max sentences per chunk (default: 10)")
+    parser.add_argument("--dedup-threshold", type=float, default=0.8, help="Near-duplicate Jaccard threshold (default: 0.8)")
+    parser.add_argument("--no-dedup", action="store_true", help="Keep near-duplicate chunks")
+
+    args = parser.parse_args()
+
+    pdf_files = [Path(p) for p in args.pdf] if args.pdf else sorted(RAW_DATA_DIR.glob("*.pdf"))
+    if not pdf_files:
+        print(f"No PDF files found in {RAW_DATA_DIR}")
+        return
+
+    print(f"Found {len(pdf_files)} PDF file(s)")
+    print("="*60)
+
+    db_dir = new_version_dir(args.db_dir)
+    print(f"Building index version: {db_dir.name}")
+
+    current_dir = resolve_db_path(args.db_dir)
+    if args.pdf and current_dir.is_dir() and load_shard_manifest(current_dir) is not None:
+        # Only the given books are re-ingested
+        shutil.copytree(current_dir, db_dir, dirs_exist_ok=True)
+        print(f"Copied other books from: {current_dir.name}")
+
+    from src.embeddings.store import create_chroma_collection, get_embedder
+    from src.ingestion.stream import stream_ingest_pdf
+
+    embedder = get_embedder("all-MiniLM-L6-v2")
+    built = 0
+
+    for pdf_path in pdf_files:
+        print(f"\nProcessing: {pdf_path.name}")
+        book = pdf_path.stem
+
+        try:
+            # Replacing a copied book: start from an empty collection
+            drop_book_collection(db_dir, book)
+            collection = create_chroma_collection(db_dir, book_collection_name(book))
+
+            stats = stream_ingest_pdf(
+                str(pdf_path),
+                collection,
+                embedder,
+                start_page=args.start_page,
+                end_page=args.end_page,
+                similarity_threshold=args.similarity_threshold,
+                max_sentences_per_chunk=args.max_sentences,
+                dedup_threshold=None if args.no_dedup else args.dedup_threshold,
+                batch_size=args.batch_size,
+                queue_size=args.queue_size,
+                debug_dir=args.debug_dir
+            )
+            update_shard_manifest(db_dir, book, collection)
+
+            print(f"\n✓ {book}: {stats['pages']} pages ({stats['kept_pages']} kept) → "
+                  f"{stats['chunks']} chunks → {stats['stored']} stored in {stats['seconds']:.1f}s")
+            print(f"  First vectors stored after {stats.get('first_vector_s', 0):.1f}s")
+            built += 1
+
+        except Exception as e:
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
+
+    print("\n" + "="*60)
+    if built < len(pdf_files):
+        print(f"{len(pdf_files) - built} PDF(s) failed, not publishing {db_dir.name}")
+        print(f"Partial build left in: {db_dir}")
+        return
+
+    publish_version(args.db_dir, db_dir)
+    pruned = prune_versions(args.db_dir, keep=args.keep)
+
+    print("Streaming ingest complete!")
+    print(f"Published {db_dir.name} as current version of {args.db_dir}")
+    if pruned:
+        print(f"Removed old versions: {', '.join(pruned)}")
+
+
+if __name__ == "__main__":
+    main()
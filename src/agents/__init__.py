@@ -2,5 +2,21 @@
 
 from .model import HistoryAgent, get_chroma_collection
 from .prompts import build_rag_prompt
+from .context import pack_context, estimate_tokens
+from .backends import LLMBackend, GeminiBackend, StubBackend, create_backend
+from .titler import LocalTitler
+from .chunk_store import ChunkStore
 
-__all__ = ["HistoryAgent", "get_chroma_collection", "build_rag_prompt"]
+__all__ = [
+    "HistoryAgent",
+    "get_chroma_collection",
+    "build_rag_prompt",
+    "pack_context",
+    "estimate_tokens",
+    "LLMBackend",
+    "GeminiBackend",
+    "StubBackend",
+    "create_backend",
+    "LocalTitler",
+    "ChunkStore",
+]
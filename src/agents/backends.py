@@ -0,0 +1,186 @@
+"""LLM backends used by the agent: Gemini and a deterministic local stub."""
+
+import asyncio
+import hashlib
+import os
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+
+@dataclass
+class LLMResponse:
+    """Generated text plus token usage when the backend reports it."""
+
+    text: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+class LLMBackend(ABC):
+    """Interface for text generation backends."""
+
+    name = "base"
+
+    @abstractmethod
+    def generate(self, prompt: str) -> LLMResponse:
+        """Generate a full answer (blocking)."""
+
+    @abstractmethod
+    async def agenerate(self, prompt: str) -> LLMResponse:
+        """Generate a full answer without blocking the event loop."""
+
+    @abstractmethod
+    def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream answer text fragments as they are generated."""
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through the google-generativeai client."""
+
+    name = "gemini"
+
+    def __init__(self, model_name: str = "models/gemini-2.5-pro", api_key: Optional[str] = None):
+        """
+        Initialize the Gemini client.
+
+        Args:
+            model_name: Gemini model name
+            api_key: Gemini API key (defaults to GEMINI_API_KEY env var)
+        """
+        import google.generativeai as genai
+
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not found in environment variables")
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    @staticmethod
+    def _to_response(response) -> LLMResponse:
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text=response.text,
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            completion_tokens=getattr(usage, "candidates_token_count", None)
+        )
+
+    def generate(self, prompt: str) -> LLMResponse:
+        return self._to_response(self.model.generate_content(prompt))
+
+    async def agenerate(self, prompt: str) -> LLMResponse:
+        return self._to_response(await self.model.generate_content_async(prompt))
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            # Chunks without text (e.g. safety or finish metadata only) raise on .text
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            if text:
+                yield text
+
+
+class StubBackend(LLMBackend):
+    """
+    Offline backend for load testing without network access or an API key.
+
+    Answers are deterministic for a given prompt (an excerpt of the context
+    passages, or of the prompt itself when it has no context block). Latency is simulated: a
+    time to first token drawn from a normal distribution, then words
+    emitted at a fixed token rate.
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        latency_ms: float = 800.0,
+        latency_jitter_ms: float = 200.0,
+        tokens_per_second: float = 50.0,
+        answer_words: int = 60,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the stub.
+
+        Args:
+            latency_ms: Mean time to first token
+            latency_jitter_ms: Standard deviation of the time to first token
+            tokens_per_second: Generation speed after the first token (0 = instant)
+            answer_words: Maximum number of words in an answer
+            seed: Seed for the latency distribution (answers never depend on it)
+        """
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.tokens_per_second = tokens_per_second
+        self.answer_words = answer_words
+        self._rng = random.Random(seed)
+
+    def _answer(self, prompt: str) -> str:
+        context = re.search(
+            r"DELIMITED CONTEXT BLOCK START =====\s*(.*?)\s*===== DELIMITED CONTEXT BLOCK END",
+            prompt,
+            re.DOTALL
+        )
+        source = context.group(1) if context and context.group(1).strip() else prompt
+        source = re.sub(r"(?m)^\d+\.\s*", "", source.strip())
+
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        words = source.split()[:self.answer_words]
+        return f"[stub {digest}] " + " ".join(words)
+
+    def _first_token_delay(self) -> float:
+        return max(0.0, self._rng.gauss(self.latency_ms, self.latency_jitter_ms)) / 1000
+
+    def _token_delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _response(self, prompt: str, text: str) -> LLMResponse:
+        # Whitespace-separated words stand in for tokens
+        return LLMResponse(text=text, prompt_tokens=len(prompt.split()), completion_tokens=len(text.split()))
+
+    def generate(self, prompt: str) -> LLMResponse:
+        text = self._answer(prompt)
+        time.sleep(self._first_token_delay() + self._token_delay() * len(text.split()))
+        return self._response(prompt, text)
+
+    async def agenerate(self, prompt: str) -> LLMResponse:
+        text = self._answer(prompt)
+        await asyncio.sleep(self._first_token_delay() + self._token_delay() * len(text.split()))
+        return self._response(prompt, text)
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        words = self._answer(prompt).split()
+        await asyncio.sleep(self._first_token_delay())
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(self._token_delay())
+            yield word if i == 0 else " " + word
+
+
+def create_backend(name: str = "gemini", model_name: str = "models/gemini-2.5-pro", api_key: Optional[str] = None, **stub_options) -> LLMBackend:
+    """
+    Create an LLM backend by name.
+
+    Args:
+        name: 'gemini' or 'stub'
+        model_name: Gemini model name (ignored by the stub)
+        api_key: Gemini API key (ignored by the stub)
+        **stub_options: StubBackend keyword arguments
+
+    Returns:
+        LLMBackend instance
+    """
+    if name == "gemini":
+        return GeminiBackend(model_name=model_name, api_key=api_key)
+    if name == "stub":
+        return StubBackend(**stub_options)
+    raise ValueError(f"Unknown LLM backend: {name!r} (expected 'gemini' or 'stub')")
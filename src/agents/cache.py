@@ -0,0 +1,150 @@
+"""Persistent answer cache backed by SQLite."""
+
+import hashlib
+import re
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import List, Optional
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question so trivially different spellings share a cache entry.
+
+    Lowercases, collapses whitespace and strips trailing punctuation.
+    """
+    question = re.sub(r"\s+", " ", question.lower()).strip()
+    return question.rstrip("?!. ")
+
+
+def make_cache_key(question: str, chunk_ids: List[str], prompt_version: str, index_fingerprint: str) -> str:
+    """
+    Build the cache key for an answer.
+
+    The index fingerprint is part of the key, so workers serving different
+    index versions (e.g. during a rolling swap) share the cache file without
+    ever reading or clearing each other's answers.
+
+    Args:
+        question: User question (normalized internally)
+        chunk_ids: IDs of the chunks used in the prompt, in prompt order
+        prompt_version: Version of the prompt template
+        index_fingerprint: Identifier of the collection contents the chunks come from
+
+    Returns:
+        SHA-256 hex digest
+    """
+    context_hash = hashlib.sha256("\x1f".join(chunk_ids).encode("utf-8")).hexdigest()
+    raw = "\x1e".join([normalize_question(question), context_hash, prompt_version, index_fingerprint])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """
+    SQLite answer cache with TTL and LRU eviction.
+
+    The database file can be shared by several uvicorn workers: every
+    operation opens its own short-lived connection and the database runs
+    in WAL mode so readers do not block the writer. Answers of a replaced
+    index are never matched again (see make_cache_key()) and age out
+    through the TTL and LRU limits.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600
+    ):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of cached answers (least recently used are evicted)
+            ttl_seconds: Maximum age of an entry (None disables expiry)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                " key TEXT PRIMARY KEY,"
+                " answer TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS answers_last_access ON answers(last_access)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode."""
+        return sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached answer and refresh its LRU position.
+
+        Args:
+            key: Cache key from make_cache_key()
+
+        Returns:
+            Cached answer, or None on a miss or expired entry
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT answer, created_at FROM answers WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            answer, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+                return None
+
+            conn.execute("UPDATE answers SET last_access = ? WHERE key = ?", (now, key))
+            return answer
+
+    def set(self, key: str, answer: str):
+        """
+        Store an answer and evict entries over the size limit.
+
+        Args:
+            key: Cache key from make_cache_key()
+            answer: Generated answer text
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO answers (key, answer, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, answer, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Delete expired entries, then least recently used entries over max_entries."""
+        if self.ttl_seconds is not None:
+            conn.execute("DELETE FROM answers WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        conn.execute(
+            "DELETE FROM answers WHERE key IN ("
+            " SELECT key FROM answers ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        """Remove every cached answer."""
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM answers")
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
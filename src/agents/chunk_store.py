@@ -0,0 +1,101 @@
+"""In-process LRU cache of chunk text and metadata, looked up by chunk ID."""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class ChunkStore:
+    """
+    Serves chunk text by ID so answers can reference sources without embedding their text.
+
+    Misses are fetched from the collection in a single get() call and
+    kept in an LRU cache. Chunk IDs are only unique within one build of
+    the index, so entries are dropped when the collection is rebuilt
+    (see clear()).
+    """
+
+    def __init__(self, collection, max_entries: int = 5000):
+        """
+        Initialize the store.
+
+        Args:
+            collection: ChromaDB collection holding the chunks
+            max_entries: Maximum number of cached chunks
+        """
+        self.collection = collection
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # chunk ID -> {"text", "chapter_metadata"}, LRU order
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, chunk_ids: List[str]) -> Dict[str, dict]:
+        """
+        Look up several chunks, fetching the uncached ones in one query.
+
+        Args:
+            chunk_ids: Chunk IDs
+
+        Returns:
+            Dict of chunk ID -> {"text", "chapter_metadata"}; unknown IDs are omitted
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for chunk_id in dict.fromkeys(chunk_ids):
+                if chunk_id in self._entries:
+                    self._entries.move_to_end(chunk_id)
+                    found[chunk_id] = self._entries[chunk_id]
+                    self.hits += 1
+                else:
+                    missing.append(chunk_id)
+                    self.misses += 1
+
+        if missing:
+            # Outside the lock: a Chroma query must not block other lookups
+            results = self.collection.get(ids=missing, include=["documents", "metadatas"])
+            fetched = {
+                chunk_id: {"text": text, "chapter_metadata": (metadata or {}).get("chapter_metadata", "")}
+                for chunk_id, text, metadata in zip(results["ids"], results["documents"], results["metadatas"])
+            }
+            found.update(fetched)
+            self.put_many(fetched)
+
+        return found
+
+    def put_many(self, chunks: Dict[str, dict]):
+        """
+        Cache chunks that are already in hand (e.g. from a retrieval query).
+
+        Args:
+            chunks: Dict of chunk ID -> {"text", "chapter_metadata"}
+        """
+        with self._lock:
+            for chunk_id, entry in chunks.items():
+                self._entries[chunk_id] = entry
+                self._entries.move_to_end(chunk_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, chunk_id: str) -> Optional[dict]:
+        """Look up one chunk; None if the ID is not in the collection."""
+        return self.get_many([chunk_id]).get(chunk_id)
+
+    def clear(self):
+        """Drop every cached chunk (call after the collection is rebuilt)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit-rate metrics for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
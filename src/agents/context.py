@@ -0,0 +1,113 @@
+"""Token-budgeted context packing for RAG prompts."""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# Rough average for English text with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+# Query-result fields that hold one entry per retrieved chunk
+_PER_RESULT_KEYS = ("ids", "documents", "metadatas", "distances", "embeddings", "uris", "data")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text without a network call.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _normalize_rows(embeddings) -> Optional[np.ndarray]:
+    """Convert embeddings to an L2-normalized float matrix (None if unavailable)."""
+    if embeddings is None or len(embeddings) == 0:
+        return None
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def pack_context(
+    retrieved_data: dict,
+    token_budget: Optional[int] = 2000,
+    similarity_threshold: float = 0.95
+) -> Tuple[dict, dict]:
+    """
+    Select ranked chunks for the prompt under a token budget.
+
+    Chunks are visited in retrieval order. A chunk is skipped if its
+    embedding is within similarity_threshold (cosine) of an already kept
+    chunk, or if it does not fit in the remaining budget. The top-ranked
+    chunk is always kept so the prompt is never left without context.
+
+    Args:
+        retrieved_data: Result from collection.query() (embeddings optional)
+        token_budget: Maximum estimated context tokens (None disables the budget)
+        similarity_threshold: Cosine similarity above which a chunk is redundant
+
+    Returns:
+        Tuple of (packed results in the same shape as retrieved_data, stats dict)
+    """
+    documents = (retrieved_data.get("documents") or [[]])[0]
+    embeddings = retrieved_data.get("embeddings")
+    normalized = None
+    if embeddings is not None and len(embeddings) > 0:
+        normalized = _normalize_rows(embeddings[0])
+
+    kept = []
+    used_tokens = 0
+    duplicates = 0
+    over_budget = 0
+
+    for i, doc in enumerate(documents):
+        tokens = estimate_tokens(doc)
+
+        if kept:
+            if normalized is not None:
+                is_redundant = float(np.max(normalized[kept] @ normalized[i])) >= similarity_threshold
+            else:
+                is_redundant = any(doc == documents[j] for j in kept)
+
+            if is_redundant:
+                duplicates += 1
+                continue
+
+            if token_budget is not None and used_tokens + tokens > token_budget:
+                over_budget += 1
+                continue
+
+        kept.append(i)
+        used_tokens += tokens
+
+    # Rebuild the query-result shape so build_rag_prompt works unchanged
+    packed = {}
+    for key, value in retrieved_data.items():
+        if key in _PER_RESULT_KEYS and value is not None and len(value) > 0 and value[0] is not None:
+            packed[key] = [[value[0][i] for i in kept]]
+        else:
+            packed[key] = value
+
+    tokens_before = sum(estimate_tokens(doc) for doc in documents)
+    stats = {
+        "chunks_retrieved": len(documents),
+        "chunks_used": len(kept),
+        "duplicates_removed": duplicates,
+        "over_budget_removed": over_budget,
+        "context_tokens_before": tokens_before,
+        "context_tokens_after": used_tokens,
+        "dropped_tokens": tokens_before - used_tokens,
+    }
+
+    return packed, stats
@@ -1,18 +1,57 @@
 """GenAI model for RAG pipeline."""
 
-import os
+import asyncio
+import contextlib
+import functools
+import random
 import time
-from typing import Optional
-import chromadb
-import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional
 from dotenv import load_dotenv
 
-from .prompts import build_rag_prompt
+from .backends import LLMBackend, LLMResponse, create_backend
+from .cache import AnswerCache, make_cache_key
+from .context import estimate_tokens, pack_context
+from .prompts import PROMPT_VERSION, build_rag_prompt
+from .scheduler import LLMScheduler
+from .chunk_store import ChunkStore
+from .semantic_cache import SemanticCache
+from src.embeddings.versions import resolve_db_path
+from src.retrieval.router import open_index
 
 
 # Load environment variables
 load_dotenv()
 
+# Answer the prompt template instructs Gemini to give when the context has no answer
+NOT_FOUND_ANSWER = "Not found in ChromaDB"
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check whether a Gemini error is a rate limit (HTTP 429 / ResourceExhausted)."""
+    message = str(error)
+    return (
+        "ResourceExhausted" in type(error).__name__
+        or "ResourceExhausted" in message
+        or message.startswith("429")
+    )
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = 60.0) -> float:
+    """
+    Exponential backoff with jitter for retry attempt number `attempt`.
+    
+    Half of the delay is fixed and half is random, so concurrent requests
+    that hit the limit together do not retry in lockstep.
+    """
+    delay = min(max_delay, base_delay * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds elapsed since a time.perf_counter() start value."""
+    return round((time.perf_counter() - start) * 1000, 2)
+
 
 class HistoryAgent:
     """GenAI history tutor agent with RAG capabilities."""
@@ -22,46 +61,324 @@ class HistoryAgent:
         db_path: str,
         collection_name: str = "world_history",
         model_name: str = "models/gemini-2.5-pro",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        context_token_budget: Optional[int] = 2000,
+        redundancy_threshold: float = 0.95,
+        retrieval_workers: int = 4,
+        answer_cache: Optional[AnswerCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        index_check_interval: float = 30.0,
+        scheduler: Optional[LLMScheduler] = None,
+        completion_token_estimate: int = 512,
+        backend: Optional[LLMBackend] = None,
+        chunk_store_entries: int = 5000,
+        shard_prune_top: Optional[int] = None
     ):
         """
         Initialize the tutor agent.
         
         Args:
-            db_path: Path to ChromaDB database
+            db_path: Path to ChromaDB database (a versioned index root opens its CURRENT version)
             collection_name: Name of the ChromaDB collection
-            model_name: Gemini model name
+            model_name: Gemini model name (used when no backend is given)
             api_key: Gemini API key (defaults to GEMINI_API_KEY env var)
+            context_token_budget: Max estimated context tokens in the prompt (None = unlimited)
+            redundancy_threshold: Cosine similarity above which retrieved chunks are redundant
+            retrieval_workers: Size of the thread pool used by the async API for Chroma queries
+            answer_cache: Optional persistent cache of generated answers
+            semantic_cache: Optional in-process cache that serves paraphrased questions
+            index_check_interval: Seconds between checks for a rebuilt collection (cache invalidation)
+            scheduler: Optional shared admission control for async LLM calls
+            completion_token_estimate: Expected answer tokens, charged to the scheduler's token budget
+            backend: LLM backend for generation (defaults to Gemini with model_name)
+            chunk_store_entries: Chunks kept in memory for source text lookups by ID
+            shard_prune_top: For a database with one collection per book, search only
+                the books whose centroid is closest to the question (None = all books)
         """
-        # Setup ChromaDB
-        self.client = chromadb.PersistentClient(path=db_path)
-        self.collection = self.client.get_collection(name=collection_name)
+        self.context_token_budget = context_token_budget
+        self.redundancy_threshold = redundancy_threshold
+        self.answer_cache = answer_cache
+        self.semantic_cache = semantic_cache
+        self.index_check_interval = index_check_interval
+        self._last_index_check = float("-inf")
+        self._index_fingerprint = None
+        self.scheduler = scheduler
+        self.completion_token_estimate = completion_token_estimate
+        
+        # Bounded pool so blocking Chroma queries never run on the event loop
+        self._retrieval_executor = ThreadPoolExecutor(
+            max_workers=retrieval_workers,
+            thread_name_prefix="retrieval"
+        )
         
-        # Setup Gemini
-        api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
+        # Setup ChromaDB (same all-MiniLM-L6-v2 embeddings the collection was built with).
+        # Imported here: chromadb takes about a second to import
+        import chromadb
+        from chromadb.utils import embedding_functions
+        
+        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        self.db_path = str(resolve_db_path(db_path))
+        self.client = chromadb.PersistentClient(path=self.db_path)
+        # One collection, or a router over one collection per book
+        self.collection = open_index(
+            self.client,
+            self.db_path,
+            collection_name,
+            embedding_function=self.embedding_function,
+            prune_top=shard_prune_top,
+            max_workers=retrieval_workers
+        )
+        self.chunk_store = ChunkStore(self.collection, max_entries=chunk_store_entries)
         
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(model_name)
+        # Setup the LLM backend (Gemini unless e.g. the offline stub is passed in)
+        self.backend = backend or create_backend("gemini", model_name=model_name, api_key=api_key)
     
-    def query_vector_db(self, query: str, n_results: int = 10) -> dict:
+    def embed_query(self, query: str):
+        """
+        Embed a question with the collection's embedding model.
+        
+        Args:
+            query: User question
+        
+        Returns:
+            Query embedding vector
+        """
+        return self.embedding_function([query])[0]
+    
+    def query_vector_db(self, query: str, n_results: int = 10, query_embedding=None) -> dict:
         """
         Query the ChromaDB collection with a question.
         
         Args:
             query: User question
             n_results: Number of results to retrieve
+            query_embedding: Precomputed embedding of the question (computed if None)
         
         Returns:
             ChromaDB query results
         """
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
+        
         results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            include=["documents", "metadatas", "distances", "embeddings"]
         )
         return results
     
+    def retrieve(self, question: str, n_results: int, timings: dict):
+        """
+        Embed the question and query the collection, recording stage timings.
+        
+        Args:
+            question: User question
+            n_results: Number of results to retrieve
+            timings: Dict that receives 'embed' and 'retrieve' durations in ms
+        
+        Returns:
+            Tuple of (question embedding, ChromaDB query results)
+        """
+        start = time.perf_counter()
+        query_embedding = self.embed_query(question)
+        timings["embed"] = _elapsed_ms(start)
+        
+        start = time.perf_counter()
+        retrieved_data = self.query_vector_db(question, n_results=n_results, query_embedding=query_embedding)
+        timings["retrieve"] = _elapsed_ms(start)
+        
+        return query_embedding, retrieved_data
+    
+    def retrieve_batch(self, questions: List[str], n_results: int, timings: dict):
+        """
+        Embed many questions in one model call and query the collection once for all of them.
+        
+        Args:
+            questions: User questions
+            n_results: Number of results to retrieve per question
+            timings: Dict that receives the batch 'embed' and 'retrieve' durations in ms
+        
+        Returns:
+            Tuple of (question embeddings, list of per-question results shaped like query_vector_db())
+        """
+        start = time.perf_counter()
+        query_embeddings = self.embedding_function(questions)
+        timings["embed"] = _elapsed_ms(start)
+        
+        start = time.perf_counter()
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            include=["documents", "metadatas", "distances", "embeddings"]
+        )
+        timings["retrieve"] = _elapsed_ms(start)
+        
+        # Split the batched result into one single-query result per question
+        keys = ["ids", "documents", "metadatas", "distances", "embeddings"]
+        retrieved = [
+            {key: [results[key][i]] for key in keys if results.get(key) is not None}
+            for i in range(len(questions))
+        ]
+        return query_embeddings, retrieved
+    
+    def top_chapter(self, question: str) -> Optional[str]:
+        """
+        Chapter title of the chunk that best matches a question.
+        
+        Args:
+            question: User question
+        
+        Returns:
+            Chapter name, or None if the collection is empty or the chunk has none
+        """
+        results = self.collection.query(
+            query_embeddings=[self.embed_query(question)],
+            n_results=1,
+            include=["metadatas"]
+        )
+        metadatas = (results.get("metadatas") or [[]])[0]
+        if not metadatas:
+            return None
+        return self.parse_chapter_metadata((metadatas[0] or {}).get("chapter_metadata", ""))["chapter_name"]
+    
+    async def aquery_vector_db(self, query: str, n_results: int = 10) -> dict:
+        """
+        Async version of query_vector_db, run on the bounded retrieval pool.
+        
+        Args:
+            query: User question
+            n_results: Number of results to retrieve
+        
+        Returns:
+            ChromaDB query results
+        """
+        return await self._run_blocking(self.query_vector_db, query, n_results=n_results)
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call (Chroma, SQLite) on the bounded retrieval pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._retrieval_executor,
+            functools.partial(func, *args, **kwargs)
+        )
+    
+    def index_fingerprint(self) -> str:
+        """Identify the current collection contents (changes when it is rebuilt)."""
+        return f"{self.collection.id}:{self.collection.count()}"
+    
+    def check_index(self):
+        """
+        Clear the in-process answer cache and the chunk store if the collection has been rebuilt.
+        
+        Runs at most once every index_check_interval seconds.
+        """
+        now = time.monotonic()
+        if now - self._last_index_check < self.index_check_interval:
+            return
+        self._last_index_check = now
+        
+        fingerprint = self.index_fingerprint()
+        changed = self._index_fingerprint is not None and fingerprint != self._index_fingerprint
+        self._index_fingerprint = fingerprint
+        
+        # Persistent answers are keyed by the fingerprint, so only in-process caches need clearing
+        if changed:
+            if self.semantic_cache is not None:
+                self.semantic_cache.clear()
+            self.chunk_store.clear()
+            print("Vector index changed, answer caches cleared.")
+    
+    def close(self):
+        """
+        Release the retrieval threads and the Chroma client once no request
+        uses this agent (e.g. after it has been replaced by an agent on a newer index).
+        """
+        # A closed agent has no collection left to check
+        self.index_check_interval = float("inf")
+        self._retrieval_executor.shutdown(wait=False)
+        if hasattr(self.collection, "close"):
+            self.collection.close()
+        self.chunk_store.clear()
+        self.chunk_store = None
+        self.collection = None
+        # Frees the index's Chroma system (sqlite handles, loaded HNSW segments)
+        if hasattr(self.client, "close"):
+            self.client.close()
+
+    def warm_up(self, question: str = "How did the Neolithic Revolution change human societies?") -> dict:
+        """
+        Pay the first-request costs up front: load the embedding model,
+        page the HNSW index into memory, build a prompt and sync the answer
+        caches with the current index. No LLM call is made.
+        
+        Args:
+            question: Question used for the warm-up retrieval
+        
+        Returns:
+            Dict of warm-up step durations in ms
+        """
+        timings = {}
+        _, retrieved_data = self.retrieve(question, n_results=10, timings=timings)
+        
+        start = time.perf_counter()
+        self.build_prompt(question, retrieved_data)
+        timings["prompt_build"] = _elapsed_ms(start)
+        
+        start = time.perf_counter()
+        self.check_index()
+        timings["check_index"] = _elapsed_ms(start)
+        
+        return timings
+    
+    def lookup_answer(self, question: str, query_embedding, retrieved_data: dict, used_data: dict):
+        """
+        Look for a cached answer: exact match first, then a semantic match.
+        
+        Args:
+            question: User question
+            query_embedding: Embedding of the question
+            retrieved_data: Full query results (ranked chunks for the semantic cache)
+            used_data: Query results used in the prompt (key of the exact cache)
+        
+        Returns:
+            Tuple of (answer or None, 'exact' / 'semantic' / None, exact cache key or None)
+        """
+        self.check_index()
+        
+        cache_key = None
+        if self.answer_cache is not None:
+            chunk_ids = list((used_data.get("ids") or [[]])[0])
+            cache_key = make_cache_key(question, chunk_ids, PROMPT_VERSION, self._index_fingerprint)
+            answer = self.answer_cache.get(cache_key)
+            if answer is not None:
+                return answer, "exact", cache_key
+        
+        if self.semantic_cache is not None:
+            ranked_ids = list((retrieved_data.get("ids") or [[]])[0])
+            answer = self.semantic_cache.lookup(query_embedding, ranked_ids)
+            if answer is not None:
+                return answer, "semantic", cache_key
+        
+        return None, None, cache_key
+    
+    def store_answer(self, cache_key: Optional[str], question: str, query_embedding, retrieved_data: dict, answer: str):
+        """
+        Store a freshly generated answer in the enabled caches.
+        
+        Args:
+            cache_key: Exact cache key from lookup_answer()
+            question: User question
+            query_embedding: Embedding of the question
+            retrieved_data: Full query results
+            answer: Generated answer
+        """
+        if cache_key is not None:
+            self.answer_cache.set(cache_key, answer)
+        
+        if self.semantic_cache is not None:
+            ranked_ids = list((retrieved_data.get("ids") or [[]])[0])
+            self.semantic_cache.add(question, query_embedding, ranked_ids, answer)
+    
     def generate_answer(
         self,
         prompt: str,
@@ -69,7 +386,7 @@ class HistoryAgent:
         retry_delay: int = 10
     ) -> str:
         """
-        Generate answer using Gemini with retry logic.
+        Generate answer using the LLM backend with retry logic.
         
         Args:
             prompt: Formatted prompt
@@ -79,18 +396,128 @@ class HistoryAgent:
         Returns:
             Generated answer text
         """
+        return self._generate_response(prompt, max_retries, retry_delay).text
+    
+    def _generate_response(self, prompt: str, max_retries: int = 3, retry_delay: int = 10) -> LLMResponse:
+        """generate_answer() returning the full LLMResponse, including token usage."""
         for attempt in range(max_retries):
             try:
-                answer = self.model.generate_content(prompt)
-                return answer.text
+                return self.backend.generate(prompt)
             except Exception as e:
-                if "ResourceExhausted" in str(e) and attempt < max_retries - 1:
+                if is_rate_limit_error(e) and attempt < max_retries - 1:
                     wait_time = (attempt + 1) * retry_delay
                     print(f"Rate limit hit. Waiting {wait_time} seconds...")
                     time.sleep(wait_time)
                 else:
                     raise
     
+    def _slot_tokens(self, prompt: str) -> int:
+        """Tokens charged to the scheduler when an LLM call is admitted."""
+        return estimate_tokens(prompt) + self.completion_token_estimate
+    
+    def _llm_slot(self, prompt: str):
+        """Scheduler slot for one LLM call (a no-op without a scheduler)."""
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        return self.scheduler.slot(self._slot_tokens(prompt))
+    
+    def _reconcile_usage(self, prompt: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+        """Correct the scheduler's token budget with the usage a call reported (estimates fill any gap)."""
+        if self.scheduler is None or (prompt_tokens is None and completion_tokens is None):
+            return
+        actual = (
+            (estimate_tokens(prompt) if prompt_tokens is None else prompt_tokens)
+            + (self.completion_token_estimate if completion_tokens is None else completion_tokens)
+        )
+        self.scheduler.reconcile(self._slot_tokens(prompt), actual)
+    
+    def _throttle(self, seconds: float):
+        """Pause the shared scheduler after a rate limit so other requests back off too."""
+        if self.scheduler is not None:
+            self.scheduler.pause(seconds)
+    
+    async def agenerate_answer(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        retry_delay: float = 2.0
+    ) -> str:
+        """
+        Generate answer with the async backend API, without blocking the event loop.
+        
+        Rate limits are retried with exponential backoff and jitter using
+        asyncio.sleep, so other requests keep being served while we wait.
+        
+        Args:
+            prompt: Formatted prompt
+            max_retries: Maximum number of retry attempts
+            retry_delay: Base delay in seconds for the exponential backoff
+        
+        Returns:
+            Generated answer text
+        """
+        response = await self._agenerate_response(prompt, max_retries, retry_delay)
+        return response.text
+    
+    async def _agenerate_response(self, prompt: str, max_retries: int = 3, retry_delay: float = 2.0) -> LLMResponse:
+        """agenerate_answer() returning the full LLMResponse, including token usage."""
+        for attempt in range(max_retries):
+            try:
+                async with self._llm_slot(prompt):
+                    response = await self.backend.agenerate(prompt)
+                self._reconcile_usage(prompt, response.prompt_tokens, response.completion_tokens)
+                return response
+            except Exception as e:
+                if is_rate_limit_error(e) and attempt < max_retries - 1:
+                    wait_time = backoff_delay(attempt, retry_delay)
+                    print(f"Rate limit hit. Waiting {wait_time:.1f} seconds...")
+                    self._throttle(wait_time)
+                    await asyncio.sleep(wait_time)
+                else:
+                    raise
+    
+    async def astream_answer(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        retry_delay: float = 2.0
+    ) -> AsyncIterator[str]:
+        """
+        Stream answer text from the backend as it is generated.
+        
+        Rate limits are retried with backoff only until the first fragment
+        arrives; once text has been yielded, errors are raised to the caller.
+        
+        Args:
+            prompt: Formatted prompt
+            max_retries: Maximum number of attempts to open the stream
+            retry_delay: Base delay in seconds for the exponential backoff
+        
+        Yields:
+            Answer text fragments
+        """
+        for attempt in range(max_retries):
+            started = False
+            streamed = []
+            try:
+                # The slot is held until the stream is fully consumed, but not during backoff
+                async with self._llm_slot(prompt):
+                    async for text in self.backend.astream(prompt):
+                        started = True
+                        streamed.append(text)
+                        yield text
+                # Streams report no usage: charge the completion that was actually sent
+                self._reconcile_usage(prompt, None, estimate_tokens("".join(streamed)))
+                return
+            except Exception as e:
+                if not started and is_rate_limit_error(e) and attempt < max_retries - 1:
+                    wait_time = backoff_delay(attempt, retry_delay)
+                    print(f"Rate limit hit. Waiting {wait_time:.1f} seconds...")
+                    self._throttle(wait_time)
+                    await asyncio.sleep(wait_time)
+                else:
+                    raise
+    
     def parse_chapter_metadata(self, metadata_string: str) -> dict:
         """
         Parse chapter metadata string into structured data.
@@ -136,52 +563,334 @@ class HistoryAgent:
         
         return result
     
-    def ask(
-        self,
-        question: str,
-        n_results: int = 10,
-        max_retries: int = 3
-    ) -> dict:
+    def format_sources(self, retrieved_data: dict) -> list:
         """
-        Complete RAG pipeline: retrieve, prompt, and generate.
+        Format retrieved chunks into source dicts for the response.
+        
+        The chunk text is left out; it is cached in the chunk store and can be
+        fetched by chunk_id when it is actually needed.
         
         Args:
-            question: User question
-            n_results: Number of results to retrieve from vector DB
-            max_retries: Maximum number of retry attempts for generation
+            retrieved_data: ChromaDB query results
         
         Returns:
-            Dict with 'answer' (str) and 'sources' (list)
+            List of dicts with chunk_id, chapter_number, chapter_name, and page_number
         """
-        # Step 1: Retrieve relevant context
-        retrieved_data = self.query_vector_db(question, n_results=n_results)
-        
-        # Step 2: Build prompt with context
-        prompt = build_rag_prompt(question, retrieved_data)
-        
-        # Step 3: Generate answer
-        answer = self.generate_answer(prompt, max_retries=max_retries)
-        
-        # Step 4: Format sources from retrieved data
         sources = []
+        ids = retrieved_data.get("ids", [[]])[0]
         documents = retrieved_data.get("documents", [[]])[0]
         metadatas = retrieved_data.get("metadatas", [[]])[0]
         
+        chunks = {}
         for i, doc in enumerate(documents):
             if i < len(metadatas):
                 chapter_metadata = metadatas[i].get("chapter_metadata", "")
                 parsed_metadata = self.parse_chapter_metadata(chapter_metadata)
+                chunks[ids[i]] = {"text": doc, "chapter_metadata": chapter_metadata}
                 
                 sources.append({
-                    "text": doc,
+                    "chunk_id": ids[i],
                     "chapter_number": parsed_metadata["chapter_number"],
                     "chapter_name": parsed_metadata["chapter_name"],
                     "page_number": parsed_metadata["page_number"]
                 })
         
+        # The client will most likely ask for these texts next
+        self.chunk_store.put_many(chunks)
+        return sources
+    
+    def build_prompt(self, question: str, retrieved_data: dict, pack: bool = True):
+        """
+        Build the RAG prompt, packing the context into the token budget.
+        
+        Args:
+            question: User question
+            retrieved_data: ChromaDB query results
+            pack: If False, use every retrieved chunk as-is
+        
+        Returns:
+            Tuple of (prompt, results used in the prompt, metadata dict)
+        """
+        if not pack:
+            prompt = build_rag_prompt(question, retrieved_data)
+            prompt_tokens = estimate_tokens(prompt)
+            return prompt, retrieved_data, {
+                "prompt_tokens_before": prompt_tokens,
+                "prompt_tokens_after": prompt_tokens,
+            }
+        
+        packed_data, pack_stats = pack_context(
+            retrieved_data,
+            token_budget=self.context_token_budget,
+            similarity_threshold=self.redundancy_threshold
+        )
+        prompt = build_rag_prompt(question, packed_data)
+        
+        metadata = {
+            "prompt_tokens_before": estimate_tokens(build_rag_prompt(question, retrieved_data)),
+            "prompt_tokens_after": estimate_tokens(prompt),
+            **pack_stats,
+        }
+        return prompt, packed_data, metadata
+    
+    def ask(
+        self,
+        question: str,
+        n_results: int = 10,
+        max_retries: int = 3,
+        pack: bool = True
+    ) -> dict:
+        """
+        Complete RAG pipeline: retrieve, prompt, and generate.
+        
+        Args:
+            question: User question
+            n_results: Number of results to retrieve from vector DB
+            max_retries: Maximum number of retry attempts for generation
+            pack: Pack the retrieved context into the token budget (default True)
+        
+        Returns:
+            Dict with 'answer' (str), 'sources' (list) and 'metadata' (dict)
+        """
+        timings = {}
+        
+        # Step 1: Retrieve relevant context
+        query_embedding, retrieved_data = self.retrieve(question, n_results, timings)
+        
+        # Step 2: Build prompt with packed context
+        start = time.perf_counter()
+        prompt, used_data, metadata = self.build_prompt(question, retrieved_data, pack=pack)
+        timings["prompt_build"] = _elapsed_ms(start)
+        
+        # Step 3: Generate answer (or reuse a cached one)
+        start = time.perf_counter()
+        answer, cache_type, cache_key = self.lookup_answer(question, query_embedding, retrieved_data, used_data)
+        metadata["cached"] = answer is not None
+        metadata["cache_type"] = cache_type
+        metadata["usage"] = None
+        
+        if answer is None:
+            response = self._generate_response(prompt, max_retries=max_retries)
+            answer = response.text
+            metadata["usage"] = {"prompt_tokens": response.prompt_tokens, "completion_tokens": response.completion_tokens}
+            self.store_answer(cache_key, question, query_embedding, retrieved_data, answer)
+        timings["generate"] = _elapsed_ms(start)
+        
+        # Step 4: Format sources from the chunks used in the prompt
+        sources = self.format_sources(used_data)
+        metadata["timings_ms"] = timings
+        
         return {
             "answer": answer,
-            "sources": sources
+            "sources": sources,
+            "metadata": metadata
+        }
+    
+    async def aask(
+        self,
+        question: str,
+        n_results: int = 10,
+        max_retries: int = 3,
+        pack: bool = True
+    ) -> dict:
+        """
+        Async RAG pipeline for the API: same result as ask() without blocking the event loop.
+        
+        Args:
+            question: User question
+            n_results: Number of results to retrieve from vector DB
+            max_retries: Maximum number of retry attempts for generation
+            pack: Pack the retrieved context into the token budget (default True)
+        
+        Returns:
+            Dict with 'answer' (str), 'sources' (list) and 'metadata' (dict)
+        """
+        timings = {}
+        
+        query_embedding, retrieved_data = await self._run_blocking(self.retrieve, question, n_results, timings)
+        
+        return await self._aanswer(question, query_embedding, retrieved_data, timings, max_retries, pack)
+    
+    async def _aanswer(
+        self,
+        question: str,
+        query_embedding,
+        retrieved_data: dict,
+        timings: dict,
+        max_retries: int = 3,
+        pack: bool = True
+    ) -> dict:
+        """
+        Second half of aask(): build the prompt, then reuse a cached answer or generate one.
+        
+        Args:
+            question: User question
+            query_embedding: Embedding of the question
+            retrieved_data: ChromaDB query results for the question
+            timings: Dict of stage timings so far; 'prompt_build' and 'generate' are added
+            max_retries: Maximum number of retry attempts for generation
+            pack: Pack the retrieved context into the token budget
+        
+        Returns:
+            Dict with 'answer' (str), 'sources' (list) and 'metadata' (dict)
+        """
+        start = time.perf_counter()
+        prompt, used_data, metadata = self.build_prompt(question, retrieved_data, pack=pack)
+        timings["prompt_build"] = _elapsed_ms(start)
+        
+        start = time.perf_counter()
+        answer, cache_type, cache_key = await self._run_blocking(
+            self.lookup_answer, question, query_embedding, retrieved_data, used_data
+        )
+        metadata["cached"] = answer is not None
+        metadata["cache_type"] = cache_type
+        metadata["usage"] = None
+        
+        if answer is None:
+            response = await self._agenerate_response(prompt, max_retries=max_retries)
+            answer = response.text
+            metadata["usage"] = {"prompt_tokens": response.prompt_tokens, "completion_tokens": response.completion_tokens}
+            await self._run_blocking(
+                self.store_answer, cache_key, question, query_embedding, retrieved_data, answer
+            )
+        timings["generate"] = _elapsed_ms(start)
+        
+        sources = self.format_sources(used_data)
+        metadata["timings_ms"] = timings
+        
+        return {
+            "answer": answer,
+            "sources": sources,
+            "metadata": metadata
+        }
+    
+    async def astream(
+        self,
+        question: str,
+        n_results: int = 10,
+        max_retries: int = 3,
+        pack: bool = True
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming RAG pipeline: sources first, then answer tokens, then metadata.
+        
+        Args:
+            question: User question
+            n_results: Number of results to retrieve from vector DB
+            max_retries: Maximum number of attempts to open the Gemini stream
+            pack: Pack the retrieved context into the token budget (default True)
+        
+        Yields:
+            Event dicts with 'event' ('sources', 'token' or 'done') and 'data'
+        """
+        timings = {}
+        request_start = time.perf_counter()
+        
+        query_embedding, retrieved_data = await self._run_blocking(self.retrieve, question, n_results, timings)
+        
+        start = time.perf_counter()
+        prompt, used_data, metadata = self.build_prompt(question, retrieved_data, pack=pack)
+        timings["prompt_build"] = _elapsed_ms(start)
+        
+        # Sources are known before generation starts, so send them right away
+        yield {"event": "sources", "data": {"sources": self.format_sources(used_data)}}
+        
+        start = time.perf_counter()
+        cached_answer, cache_type, cache_key = await self._run_blocking(
+            self.lookup_answer, question, query_embedding, retrieved_data, used_data
+        )
+        metadata["cached"] = cached_answer is not None
+        metadata["cache_type"] = cache_type
+        # Streaming responses do not report token usage
+        metadata["usage"] = None
+        
+        if cached_answer is not None:
+            # A cached answer is sent whole as a single token event
+            timings["time_to_first_token"] = _elapsed_ms(request_start)
+            answer = cached_answer
+            yield {"event": "token", "data": {"text": answer}}
+        else:
+            answer_parts = []
+            async for text in self.astream_answer(prompt, max_retries=max_retries):
+                if not answer_parts:
+                    timings["time_to_first_token"] = _elapsed_ms(request_start)
+                answer_parts.append(text)
+                yield {"event": "token", "data": {"text": text}}
+            answer = "".join(answer_parts)
+            await self._run_blocking(
+                self.store_answer, cache_key, question, query_embedding, retrieved_data, answer
+            )
+        timings["generate"] = _elapsed_ms(start)
+        timings["total"] = _elapsed_ms(request_start)
+        
+        metadata["timings_ms"] = timings
+        
+        yield {
+            "event": "done",
+            "data": {
+                "not_found": NOT_FOUND_ANSWER in answer,
+                "metadata": metadata
+            }
+        }
+    
+    async def aask_batch(
+        self,
+        questions: List[str],
+        n_results: int = 10,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        pack: bool = True
+    ) -> AsyncIterator[dict]:
+        """
+        Answer many questions with one batched retrieval and bounded-concurrency generation.
+        
+        Args:
+            questions: User questions
+            n_results: Number of results to retrieve per question
+            max_concurrency: Maximum questions being answered at once
+            max_retries: Maximum number of retry attempts for generation
+            pack: Pack the retrieved context into the token budget (default True)
+        
+        Yields:
+            'item' events as each question finishes (in completion order), with
+            'index' and either 'answer'/'sources'/'metadata' or 'error'; then a
+            'done' event with the batch timings
+        """
+        batch_start = time.perf_counter()
+        timings = {}
+        
+        query_embeddings, retrieved = await self._run_blocking(self.retrieve_batch, questions, n_results, timings)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def answer_one(index: int) -> dict:
+            async with semaphore:
+                try:
+                    result = await self._aanswer(
+                        questions[index], query_embeddings[index], retrieved[index], {}, max_retries, pack
+                    )
+                except Exception as e:
+                    # One failed question does not fail the batch
+                    return {"index": index, "error": f"{type(e).__name__}: {e}"}
+            result["metadata"]["timings_ms"]["total"] = _elapsed_ms(batch_start)
+            return {"index": index, **result}
+        
+        tasks = [asyncio.ensure_future(answer_one(i)) for i in range(len(questions))]
+        errors = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                errors += "error" in item
+                yield {"event": "item", "data": item}
+        finally:
+            # Stop remaining work if the consumer goes away
+            for task in tasks:
+                task.cancel()
+        
+        timings["total"] = _elapsed_ms(batch_start)
+        yield {
+            "event": "done",
+            "data": {"count": len(questions), "errors": errors, "timings_ms": timings}
         }
 
 
@@ -196,5 +905,7 @@ def get_chroma_collection(db_path: str, collection_name: str):
     Returns:
         ChromaDB collection
     """
+    import chromadb
+    
     client = chromadb.PersistentClient(path=db_path)
     return client.get_collection(name=collection_name)
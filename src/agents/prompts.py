@@ -1,5 +1,8 @@
 """Prompt templates for the GenAI agent."""
 
+# Bump whenever the template below changes so cached answers are not reused
+PROMPT_VERSION = "1"
+
 
 def build_rag_prompt(query: str, retrieved_data: dict) -> str:
     """
@@ -0,0 +1,236 @@
+"""Shared scheduler for LLM calls: concurrency limit, token buckets and a fair queue."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+class SchedulerQueueFull(Exception):
+    """Raised when the LLM queue is full and the request is rejected immediately."""
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a request's deadline passes before it gets an LLM slot."""
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously at capacity per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        missing = amount - self.tokens
+        return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+
+class _Waiter:
+    __slots__ = ("tokens", "future", "enqueued")
+
+    def __init__(self, tokens: int, future: asyncio.Future):
+        self.tokens = tokens
+        self.future = future
+        self.enqueued = time.monotonic()
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls shared by every request in the worker.
+
+    Requests wait in a FIFO queue and are admitted in order when a
+    concurrency slot is free and both the requests-per-minute and
+    tokens-per-minute buckets have room. A request that cannot be queued
+    (queue full) or is not admitted before its deadline fails fast instead
+    of retrying against the API in lockstep with everyone else.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 150,
+        tokens_per_minute: int = 2_000_000,
+        max_concurrent: int = 8,
+        max_queue: int = 100,
+        default_deadline: float = 30.0
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute: LLM request budget
+            tokens_per_minute: LLM token budget (prompt + completion; estimated at
+                admission, corrected with reconcile())
+            max_concurrent: Maximum LLM calls in progress at once
+            max_queue: Maximum requests waiting for a slot
+            default_deadline: Seconds a request may wait for a slot
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.default_deadline = default_deadline
+
+        self._requests = _TokenBucket(requests_per_minute)
+        self._tokens = _TokenBucket(tokens_per_minute)
+        self._waiters = deque()
+        self._active = 0
+        self._paused_until = 0.0
+        self._timer = None
+
+        # Metrics
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_queue_depth = 0
+        # Reported minus estimated tokens, summed over reconciled calls
+        self.tokens_corrected = 0
+        self._wait_times = deque(maxlen=1000)
+
+    async def acquire(self, tokens: int, deadline: Optional[float] = None):
+        """
+        Wait for an LLM slot.
+
+        Args:
+            tokens: Estimated tokens the call will use
+            deadline: Seconds to wait before giving up (default_deadline if None)
+
+        Raises:
+            SchedulerQueueFull: if the queue is full
+            SchedulerTimeout: if no slot is granted before the deadline
+        """
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise SchedulerQueueFull(f"LLM queue is full ({self.max_queue} waiting)")
+
+        # A request larger than the whole bucket would never be admitted
+        tokens = min(tokens, int(self._tokens.capacity))
+        waiter = _Waiter(tokens, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        self._dispatch()
+
+        timeout = self.default_deadline if deadline is None else deadline
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self._remove(waiter)
+            raise SchedulerTimeout(f"No LLM slot available within {timeout:g}s")
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Cancelled right after being admitted: give the slot back
+                self.release()
+            self._remove(waiter)
+            raise
+
+        self._wait_times.append(time.monotonic() - waiter.enqueued)
+
+    def release(self):
+        """Return an LLM slot and admit the next waiter."""
+        self._active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, tokens: int, deadline: Optional[float] = None):
+        """Hold an LLM slot for the duration of the block."""
+        await self.acquire(tokens, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def reconcile(self, estimated: int, actual: int):
+        """
+        Correct the token budget once a call reports its real usage.
+
+        acquire() charges an estimate; the difference is refunded (an
+        overestimate) or charged on top (an underestimate), so the bucket
+        tracks what the API actually counts against the per-minute limit.
+
+        Args:
+            estimated: Tokens passed to acquire() for the call
+            actual: Prompt plus completion tokens the backend reported
+        """
+        # acquire() charged at most the bucket's capacity
+        estimated = min(estimated, int(self._tokens.capacity))
+        self._tokens.refill(time.monotonic())
+        self._tokens.tokens = min(self._tokens.capacity, self._tokens.tokens + estimated - actual)
+        self.tokens_corrected += actual - estimated
+        self._dispatch()
+
+    def pause(self, seconds: float):
+        """Stop admitting requests for a while, e.g. after the API returned 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._dispatch()
+
+    def _remove(self, waiter: _Waiter):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit waiters from the head of the queue while capacity allows."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+
+        while self._waiters and self._active < self.max_concurrent:
+            head = self._waiters[0]
+            if head.future.done():
+                # Cancelled or timed out while queued
+                self._waiters.popleft()
+                continue
+
+            wait = max(
+                self._paused_until - now,
+                self._requests.wait_time(1),
+                self._tokens.wait_time(head.tokens)
+            )
+            if wait > 0:
+                # Strict FIFO: later requests do not overtake the head
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(wait, self._dispatch)
+                return
+
+            self._waiters.popleft()
+            self._requests.tokens -= 1
+            self._tokens.tokens -= head.tokens
+            self._active += 1
+            self.admitted += 1
+            head.future.set_result(None)
+
+    def stats(self) -> dict:
+        """Queue-depth and wait-time metrics."""
+        waits = sorted(self._wait_times)
+
+        def percentile(p):
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 2)
+
+        return {
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "active": self._active,
+            "max_concurrent": self.max_concurrent,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "tokens_corrected": self.tokens_corrected,
+            "wait_ms_p50": percentile(0.50),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_max": round(waits[-1] * 1000, 2) if waits else 0.0,
+        }
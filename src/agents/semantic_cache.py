@@ -0,0 +1,137 @@
+"""In-process semantic cache that reuses answers for paraphrased questions."""
+
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Cache of answered questions searched by embedding similarity.
+
+    A stored answer is reused when a new question is within the cosine
+    threshold of a cached one AND retrieval returned the same top chunks,
+    so a near-paraphrase about different material never gets a stale answer.
+    Entries live in a preallocated matrix; the least recently used row is
+    overwritten once the cache is full.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 2000,
+        match_top_k: int = 3,
+        enabled: bool = True
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity between question embeddings
+            max_entries: Maximum number of cached questions
+            match_top_k: Number of top retrieved chunk IDs that must match
+            enabled: If False, lookups always miss and nothing is stored
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.match_top_k = match_top_k
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._entries = OrderedDict()  # row -> (question, top chunk IDs, answer), LRU order
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _top_ids(self, chunk_ids: List[str]) -> frozenset:
+        return frozenset(chunk_ids[:self.match_top_k])
+
+    def lookup(self, embedding, chunk_ids: List[str]) -> Optional[str]:
+        """
+        Find a cached answer for a similar question with the same top chunks.
+
+        Args:
+            embedding: Embedding of the incoming question
+            chunk_ids: Retrieved chunk IDs for the incoming question, in rank order
+
+        Returns:
+            Cached answer, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        query = self._normalize(embedding)
+        top_ids = self._top_ids(chunk_ids)
+
+        with self._lock:
+            if self._entries:
+                rows = np.fromiter(self._entries.keys(), dtype=np.int64)
+                similarities = self._matrix[rows] @ query
+
+                # Check candidates from most to least similar
+                for i in np.argsort(-similarities):
+                    if similarities[i] < self.threshold:
+                        break
+                    row = int(rows[i])
+                    _, cached_top_ids, answer = self._entries[row]
+                    if cached_top_ids == top_ids:
+                        self._entries.move_to_end(row)
+                        self.hits += 1
+                        return answer
+
+            self.misses += 1
+            return None
+
+    def add(self, question: str, embedding, chunk_ids: List[str], answer: str):
+        """
+        Store an answered question.
+
+        Args:
+            question: The question that was answered
+            embedding: Embedding of the question
+            chunk_ids: Retrieved chunk IDs for the question, in rank order
+            answer: Generated answer
+        """
+        if not self.enabled or self.max_entries <= 0:
+            return
+
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+            if len(self._entries) < self.max_entries:
+                row = len(self._entries)
+            else:
+                # Reuse the least recently used row
+                row, _ = self._entries.popitem(last=False)
+
+            self._matrix[row] = vector
+            self._entries[row] = (question, self._top_ids(chunk_ids), answer)
+
+    def clear(self):
+        """Remove every entry (e.g. after the index is rebuilt)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit-rate metrics for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,154 @@
+"""Local extractive chat titles built from the question's key phrases."""
+
+import re
+from typing import Callable, List, Optional
+
+# Function words and question scaffolding that never belong in a title
+STOPWORDS = {
+    "a", "about", "after", "all", "also", "an", "and", "any", "are", "as", "at", "be", "been",
+    "before", "being", "between", "both", "but", "by", "can", "could", "describe", "did", "do",
+    "does", "during", "each", "explain", "for", "from", "had", "has", "have", "how", "i", "if",
+    "in", "into", "is", "it", "its", "me", "more", "most", "my", "of", "on", "or", "other",
+    "over", "please", "some", "such", "tell", "than", "that", "the", "their", "them", "then",
+    "there", "these", "they", "this", "those", "through", "to", "under", "us", "was", "we",
+    "were", "what", "when", "where", "which", "while", "who", "whom", "why", "will", "with",
+    "would", "you", "your",
+}
+
+# Words that start a question but say nothing about its topic
+LEADING_VERBS = {"compare", "discuss", "list", "summarize", "give", "show", "main", "key"}
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z'\-]*|\d+(?:st|nd|rd|th|s)?")
+
+
+def _title_case(word: str) -> str:
+    # Keep acronyms and mixed case (e.g. 'USSR', 'McCarthy') as written
+    return word if any(c.isupper() for c in word[1:]) else word[:1].upper() + word[1:]
+
+
+def key_phrases(text: str) -> List[List[str]]:
+    """
+    Split text into runs of content words separated by stopwords and punctuation.
+
+    Args:
+        text: Question or message
+
+    Returns:
+        List of phrases, each a list of words, in order of appearance
+    """
+    phrases = []
+    for clause in re.split(r"[,.;:!?()\"]+", text):
+        current = []
+        for word in _WORD.findall(clause):
+            if word.lower() in STOPWORDS:
+                if current:
+                    phrases.append(current)
+                current = []
+            else:
+                current.append(word)
+        if current:
+            phrases.append(current)
+    return phrases
+
+
+class LocalTitler:
+    """
+    Builds a 3-6 word chat title without an LLM call.
+
+    Title words come from the question's key phrases, preferring phrases
+    with proper nouns. When the question is too short to fill a title,
+    the chapter title of the best-matching chunk (looked up through
+    `chapter_lookup`) is appended as context.
+    """
+
+    def __init__(
+        self,
+        chapter_lookup: Optional[Callable[[str], Optional[str]]] = None,
+        min_words: int = 3,
+        max_words: int = 6,
+        max_chars: int = 50
+    ):
+        """
+        Initialize the titler.
+
+        Args:
+            chapter_lookup: Optional function mapping a question to the chapter
+                title of its top retrieved chunk (None if there is none)
+            min_words: Titles shorter than this get the chapter title appended
+            max_words: Maximum words in a title
+            max_chars: Maximum characters in a title
+        """
+        self.chapter_lookup = chapter_lookup
+        self.min_words = min_words
+        self.max_words = max_words
+        self.max_chars = max_chars
+
+    def select_words(self, question: str) -> List[str]:
+        """
+        Pick the title words from the question.
+
+        Phrases with a proper noun rank first, then longer phrases; the
+        chosen words are returned in their original order.
+        """
+        phrases = key_phrases(question)
+        if phrases and phrases[0][0].lower() in LEADING_VERBS:
+            phrases[0] = phrases[0][1:] or phrases[0]
+
+        # The question's first word is capitalized whatever it is
+        first = _WORD.search(question)
+        first_word = first.group(0) if first else None
+
+        def rank(indexed):
+            position, phrase = indexed
+            proper = any(
+                word[:1].isupper() and not (position == 0 and i == 0 and word == first_word)
+                for i, word in enumerate(phrase)
+            )
+            return (not proper, -len(phrase), position)
+
+        chosen = []
+        total = 0
+        for position, phrase in sorted(enumerate(phrases), key=rank):
+            phrase = phrase[:self.max_words - total]
+            if not phrase:
+                break
+            chosen.append((position, phrase))
+            total += len(phrase)
+
+        return [word for _, phrase in sorted(chosen) for word in phrase]
+
+    def title(self, question: str, chapter: Optional[str] = None) -> Optional[str]:
+        """
+        Build a title for a question.
+
+        Args:
+            question: First message of the chat
+            chapter: Chapter title of the top chunk (looked up with
+                chapter_lookup if None and the question needs it)
+
+        Returns:
+            Title string, or None if no title words could be found
+        """
+        words = self.select_words(question)
+
+        context = []
+        if len(words) < self.min_words:
+            if chapter is None and self.chapter_lookup is not None:
+                chapter = self.chapter_lookup(question)
+            known = {w.lower() for w in words}
+            context = [
+                w for w in _WORD.findall(chapter or "")
+                if w.lower() not in STOPWORDS and w.lower() not in known
+            ][:self.max_words - len(words)]
+
+        if not words and not context:
+            return None
+
+        title = " ".join(_title_case(w) for w in words)
+        if context:
+            context_title = " ".join(_title_case(w) for w in context)
+            title = f"{title} in {context_title}" if title else context_title
+
+        if len(title) > self.max_chars:
+            title = title[:self.max_chars].rsplit(" ", 1)[0]
+        return title
@@ -0,0 +1,94 @@
+"""Intermediate file benchmark: size and load time of JSON vs Parquet page and chunk files."""
+
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from src.ingestion.artifacts import convert_artifact, read_chunks, read_pages
+
+# What each file holds, and the columns the next stage reads from it
+ARTIFACT_KINDS = {
+    "extracted": {"kind": "pages", "columns": ["page", "text"]},
+    "cleaned": {"kind": "pages", "columns": ["text", "chapter_details"]},
+    "chunks": {"kind": "chunks", "columns": ["chunk_id", "chapter_metadata", "text"]},
+}
+
+
+def _time_load(path: Path, kind: str, columns: Optional[Sequence[str]], repeats: int) -> float:
+    """Best-of-repeats load time in ms."""
+    reader = read_pages if kind == "pages" else read_chunks
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        reader(path, columns=columns)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return round(best, 2)
+
+
+def compare_formats(source_path, artifact: str, work_dir, repeats: int = 3) -> List[Dict]:
+    """
+    Write one page or chunk file as JSON and as Parquet, then time loading each.
+
+    Args:
+        source_path: Existing file (.json or .parquet)
+        artifact: "extracted", "cleaned" or "chunks"
+        work_dir: Directory for the converted copies
+        repeats: Loads per measurement (the fastest is reported)
+
+    Returns:
+        One row per format: size, full load time and load time of the next stage's columns
+    """
+    spec = ARTIFACT_KINDS[artifact]
+    source_path = Path(source_path)
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = []
+    for suffix in (".json", ".parquet"):
+        path = work_dir / f"{source_path.stem}{suffix}"
+        convert_artifact(source_path, path, spec["kind"])
+        rows.append({
+            "artifact": artifact,
+            "file": source_path.stem,
+            "format": suffix.lstrip("."),
+            "size_bytes": path.stat().st_size,
+            "load_ms": _time_load(path, spec["kind"], None, repeats),
+            "columns": spec["columns"],
+            "column_load_ms": _time_load(path, spec["kind"], spec["columns"], repeats),
+        })
+    return rows
+
+
+def run_benchmark(sources: Dict[str, Path], work_dir, repeats: int = 3) -> Dict:
+    """
+    Compare formats for several files.
+
+    Args:
+        sources: Artifact name ("extracted", "cleaned", "chunks") -> existing file
+        work_dir: Directory for the converted copies
+        repeats: Loads per measurement
+
+    Returns:
+        Report dict with one row per (file, format)
+    """
+    rows = []
+    for artifact, path in sources.items():
+        rows.extend(compare_formats(path, artifact, work_dir, repeats))
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "repeats": repeats,
+        "rows": rows,
+    }
+
+
+def save_report(report: Dict, output_path: str):
+    """Write a report as JSON."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf8") as f:
+        json.dump(report, f, indent=2)
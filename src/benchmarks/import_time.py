@@ -0,0 +1,97 @@
+"""Import-time budgets: how long modules and CLIs take to load, and which heavy dependencies they pull in."""
+
+import re
+import subprocess
+import sys
+import time
+
+from src.utils import PROJECT_ROOT
+
+# Cumulative import time budget per module, in milliseconds
+IMPORT_BUDGETS_MS = {
+    "src.agents": 400,
+    "src.retrieval.search": 200,
+    "src.embeddings.store": 200,
+    "src.ingestion.extract_text": 200,
+    "src.ingestion.clean_text": 200,
+    "src.ingestion.chunk_text": 200,
+    "app.backend.main": 1500,
+}
+
+# Wall-clock budget for CLI entry points run with --help, in milliseconds
+CLI_BUDGETS_MS = {
+    "scripts/query_rag.py": 1000,
+    "scripts/benchmark_retrieval.py": 1000,
+    "scripts/profile_ingestion.py": 1000,
+    "scripts/query_daemon.py": 1000,
+}
+
+# Modules that must only be imported when actually used
+HEAVY_MODULES = [
+    "chromadb", "sentence_transformers", "torch", "google.generativeai", "google.genai", "nltk", "pymupdf",
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str):
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        List of (module name, cumulative microseconds, nesting depth)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if m:
+            entries.append((m.group(4), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return entries
+
+
+def run_importtime(code: str):
+    """Run code in a fresh interpreter with -X importtime and parse the result."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(PROJECT_ROOT),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{code!r} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def measure_import(module: str, startup_modules: set, runs: int):
+    """
+    Import time of a module in ms (best of `runs`) and the heavy modules it pulled in.
+
+    Only top-level imports that a bare interpreter does not already make are counted.
+    """
+    best = None
+    heavy = set()
+    for _ in range(runs):
+        entries = run_importtime(f"import {module}")
+        total_us = sum(us for name, us, depth in entries if depth == 0 and name not in startup_modules)
+        best = total_us if best is None else min(best, total_us)
+        names = {name for name, _, _ in entries}
+        heavy |= {h for h in HEAVY_MODULES if h in names}
+    return best / 1000, sorted(heavy)
+
+
+def measure_cli(script: str, runs: int) -> float:
+    """Wall time of `python <script> --help` in ms (best of `runs`)."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, script, "--help"],
+            cwd=str(PROJECT_ROOT),
+            capture_output=True,
+            text=True
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            raise RuntimeError(f"{script} --help failed:\n{result.stderr[-2000:]}")
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -0,0 +1,282 @@
+"""Replay chat and generate-name requests against the FastAPI app and report latency."""
+
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+
+ENDPOINT_PATHS = {
+    "chat": "/api/v1/chat",
+    "generate-name": "/api/v1/chat/generate-name",
+}
+
+
+def load_requests(path: str) -> List[Dict]:
+    """
+    Load replay requests from a JSONL file.
+
+    Each line is {"endpoint": "chat", "query": ...} or
+    {"endpoint": "generate-name", "message": ...}. Lines without an
+    endpoint are inferred from the field they carry; blank lines are skipped.
+
+    Args:
+        path: Path to the JSONL file
+
+    Returns:
+        List of dicts with 'endpoint' and 'body'
+    """
+    requests = []
+    with open(path, "r", encoding="utf8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            item = json.loads(line)
+            endpoint = item.get("endpoint") or ("generate-name" if "message" in item else "chat")
+            if endpoint not in ENDPOINT_PATHS:
+                raise ValueError(f"{path}:{line_no}: unknown endpoint {endpoint!r}")
+
+            if endpoint == "chat":
+                body = {"query": item["query"]}
+            else:
+                body = {"message": item["message"]}
+            requests.append({"endpoint": endpoint, "body": body})
+
+    if not requests:
+        raise ValueError(f"No requests found in {path}")
+    return requests
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of a list of millisecond values."""
+    if not values:
+        return {"count": 0}
+
+    ordered = sorted(values)
+
+    def pick(p):
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 2),
+    }
+
+
+async def _send(client: httpx.AsyncClient, request: Dict, results: List[Dict]):
+    """Send one request and record its outcome."""
+    start = time.perf_counter()
+    record = {"endpoint": request["endpoint"], "status": None, "error": None, "stages": {}}
+
+    try:
+        response = await client.post(ENDPOINT_PATHS[request["endpoint"]], json=request["body"])
+        record["status"] = response.status_code
+        if response.status_code == 200 and request["endpoint"] == "chat":
+            metadata = response.json().get("metadata") or {}
+            record["stages"] = metadata.get("timings_ms") or {}
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["latency_ms"] = (time.perf_counter() - start) * 1000
+    results.append(record)
+
+
+async def _run_closed_loop(client, requests, total, concurrency, results):
+    """Keep `concurrency` requests in flight until `total` have been sent."""
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            await _send(client, requests[i % len(requests)], results)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+
+async def _run_open_loop(client, requests, total, rate, seed, results):
+    """Send `total` requests with Poisson arrivals at `rate` requests per second."""
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(total):
+        tasks.append(asyncio.create_task(_send(client, requests[i % len(requests)], results)))
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+
+
+def build_report(results: List[Dict], wall_seconds: float, config: Dict) -> Dict:
+    """
+    Summarize request records into a JSON-serializable report.
+
+    Args:
+        results: Records from the run
+        wall_seconds: Duration of the whole run
+        config: Run settings to store alongside the numbers
+
+    Returns:
+        Report dict
+    """
+    def summarize(records):
+        errors = [r for r in records if r["error"] or r["status"] != 200]
+        stages = {}
+        for record in records:
+            for stage, ms in record["stages"].items():
+                stages.setdefault(stage, []).append(ms)
+
+        status_counts = {}
+        for record in records:
+            key = str(record["status"]) if record["status"] is not None else "exception"
+            status_counts[key] = status_counts.get(key, 0) + 1
+
+        return {
+            "requests": len(records),
+            "errors": len(errors),
+            "error_rate": round(len(errors) / len(records), 4) if records else 0.0,
+            "status_counts": status_counts,
+            "latency_ms": percentiles([r["latency_ms"] for r in records]),
+            "stages_ms": {stage: percentiles(values) for stage, values in sorted(stages.items())},
+        }
+
+    by_endpoint = {}
+    for record in results:
+        by_endpoint.setdefault(record["endpoint"], []).append(record)
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": config,
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(len(results) / wall_seconds, 2) if wall_seconds else 0.0,
+        "overall": summarize(results),
+        "endpoints": {name: summarize(records) for name, records in sorted(by_endpoint.items())},
+    }
+
+
+def compare_reports(current: Dict, baseline: Dict) -> Dict:
+    """
+    Relative change of the headline numbers against a baseline report.
+
+    Returns:
+        Dict of metric -> {"baseline", "current", "change_pct"}
+    """
+    def headline(report):
+        overall = report["overall"]
+        return {
+            "throughput_rps": report["throughput_rps"],
+            "error_rate": overall["error_rate"],
+            "p50_ms": overall["latency_ms"].get("p50"),
+            "p95_ms": overall["latency_ms"].get("p95"),
+            "p99_ms": overall["latency_ms"].get("p99"),
+        }
+
+    diff = {}
+    now, before = headline(current), headline(baseline)
+    for key, value in now.items():
+        old = before.get(key)
+        change = round((value - old) / old * 100, 1) if old else None
+        diff[key] = {"baseline": old, "current": value, "change_pct": change}
+    return diff
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 300.0, interval: float = 0.2):
+    """
+    Poll /ready until the app reports it is warm.
+
+    Raises:
+        TimeoutError: if the app is not ready within timeout seconds
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        response = await client.get("/ready")
+        if response.status_code == 200:
+            return
+        error = response.json().get("error") if response.status_code == 503 else None
+        if error:
+            raise RuntimeError(f"App warm-up failed: {error}")
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"App not ready after {timeout:g}s")
+        await asyncio.sleep(interval)
+
+
+async def run_load_test(
+    requests_path: str,
+    total: int = 100,
+    concurrency: int = 10,
+    rate: Optional[float] = None,
+    base_url: Optional[str] = None,
+    timeout: float = 120.0,
+    seed: int = 0
+) -> Dict:
+    """
+    Replay requests against the app and build a latency report.
+
+    Args:
+        requests_path: JSONL file of requests (replayed in order, cycling)
+        total: Number of requests to send
+        concurrency: Requests in flight at once (closed loop, ignored if rate is set)
+        rate: Target arrival rate in requests per second (open loop)
+        base_url: Server URL; if None the app is driven in-process via ASGI
+        timeout: Per-request timeout in seconds
+        seed: Seed for open-loop arrival times
+
+    Returns:
+        Report dict (see build_report)
+    """
+    requests = load_requests(requests_path)
+
+    lifespan = contextlib.nullcontext()
+    if base_url:
+        transport = None
+        url = base_url
+    else:
+        # Imported here so settings such as LLM_BACKEND can be set first
+        from app.backend.main import app
+        transport = httpx.ASGITransport(app=app)
+        url = "http://loadtest"
+        # ASGITransport does not send lifespan events, so run startup/shutdown ourselves
+        lifespan = app.router.lifespan_context(app)
+
+    config = {
+        "requests_file": str(requests_path),
+        "total": total,
+        "mode": "open-loop" if rate else "closed-loop",
+        "concurrency": None if rate else concurrency,
+        "rate_rps": rate,
+        "target": base_url or "in-process",
+        "llm_backend": os.getenv("LLM_BACKEND", "gemini"),
+    }
+
+    results = []
+    limits = httpx.Limits(max_connections=max(concurrency, 100))
+    async with lifespan, httpx.AsyncClient(transport=transport, base_url=url, timeout=timeout, limits=limits) as client:
+        # Measure warm workers only, as behind a load balancer
+        await wait_until_ready(client)
+
+        start = time.perf_counter()
+        if rate:
+            await _run_open_loop(client, requests, total, rate, seed, results)
+        else:
+            await _run_closed_loop(client, requests, total, concurrency, results)
+        wall_seconds = time.perf_counter() - start
+
+    return build_report(results, wall_seconds, config)
+
+
+def save_report(report: Dict, output_path: str):
+    """Write a report as JSON."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf8") as f:
+        json.dump(report, f, indent=2)
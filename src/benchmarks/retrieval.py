@@ -0,0 +1,302 @@
+"""Retrieval benchmark: recall@k, MRR and latency for each search engine."""
+
+import json
+import platform
+import random
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Example queries from scripts/05_search_vector_db.py, labeled with the
+# keywords that identify relevant chapters in the chunk metadata
+EXAMPLE_QUERIES = [
+    {
+        "query": "How did the Neolithic Revolution change human societies?",
+        "keywords": ["neolithic", "agricultur"],
+    },
+    {
+        "query": "What were the main achievements of ancient Egyptian civilization?",
+        "keywords": ["egypt"],
+    },
+    {
+        "query": "Describe the social structure of Mesopotamian cities",
+        "keywords": ["mesopotamia", "sumer"],
+    },
+]
+
+
+def load_corpus(collection) -> Dict:
+    """
+    Read every chunk and its stored embedding from a Chroma collection.
+
+    Args:
+        collection: ChromaDB collection object
+
+    Returns:
+        Dict with 'ids', 'documents', 'metadatas' and 'embeddings' (float32 matrix)
+    """
+    data = collection.get(include=["documents", "metadatas", "embeddings"])
+    return {
+        "ids": list(data["ids"]),
+        "documents": list(data["documents"]),
+        "metadatas": [m or {} for m in data["metadatas"]],
+        "embeddings": np.asarray(data["embeddings"], dtype=np.float32),
+    }
+
+
+def label_example_queries(corpus: Dict, examples: Sequence[Dict] = EXAMPLE_QUERIES) -> List[Dict]:
+    """
+    Turn keyword-labeled example queries into queries with relevant chunk IDs.
+
+    A chunk is relevant if its chapter metadata contains one of the keywords.
+    Queries with no matching chapter in this corpus are skipped.
+
+    Args:
+        corpus: Output of load_corpus()
+        examples: Dicts with 'query' and 'keywords'
+
+    Returns:
+        List of {'query', 'relevant', 'source'} dicts
+    """
+    labeled = []
+    for example in examples:
+        keywords = [k.lower() for k in example["keywords"]]
+        relevant = {
+            chunk_id
+            for chunk_id, metadata in zip(corpus["ids"], corpus["metadatas"])
+            if any(k in str(metadata.get("chapter_metadata", "")).lower() for k in keywords)
+        }
+        if relevant:
+            labeled.append({"query": example["query"], "relevant": relevant, "source": "example"})
+    return labeled
+
+
+def synthetic_queries(
+    corpus: Dict,
+    n: int = 200,
+    min_words: int = 8,
+    max_words: int = 40,
+    seed: int = 0
+) -> List[Dict]:
+    """
+    Sample sentences from chunks as queries whose answer is the source chunk.
+
+    Args:
+        corpus: Output of load_corpus()
+        n: Number of queries to generate
+        min_words: Shortest sentence to use
+        max_words: Longest sentence to use
+        seed: Random seed
+
+    Returns:
+        List of {'query', 'relevant', 'source'} dicts
+    """
+    rng = random.Random(seed)
+    order = list(range(len(corpus["ids"])))
+    rng.shuffle(order)
+
+    queries = []
+    for index in order:
+        if len(queries) >= n:
+            break
+
+        sentences = [
+            s.strip()
+            for s in re.split(r"(?<=[.!?])\s+", corpus["documents"][index] or "")
+            if min_words <= len(s.split()) <= max_words
+        ]
+        if sentences:
+            queries.append({
+                "query": rng.choice(sentences),
+                "relevant": {corpus["ids"][index]},
+                "source": "synthetic",
+            })
+
+    return queries
+
+
+class ChromaEngine:
+    """Approximate search through the collection's HNSW index."""
+
+    name = "chroma"
+
+    def __init__(self, collection, db_path: Optional[str] = None):
+        self.collection = collection
+        self.db_path = db_path
+
+    def search(self, query_embedding: np.ndarray, k: int) -> List[str]:
+        results = self.collection.query(
+            query_embeddings=[query_embedding.tolist()],
+            n_results=k,
+            include=[]
+        )
+        return results["ids"][0]
+
+    def index_bytes(self) -> Optional[int]:
+        """On-disk size of the vector segment directories in the database."""
+        if not self.db_path:
+            return None
+        # Chroma stores each HNSW segment in a UUID-named directory next to chroma.sqlite3
+        return sum(
+            f.stat().st_size
+            for d in Path(self.db_path).iterdir() if d.is_dir()
+            for f in d.rglob("*") if f.is_file()
+        )
+
+
+class ExactEngine:
+    """Brute-force cosine search over the stored embeddings with numpy."""
+
+    name = "exact"
+
+    def __init__(self, corpus: Dict):
+        matrix = corpus["embeddings"]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = matrix / np.where(norms == 0, 1, norms)
+        self.ids = corpus["ids"]
+
+    def search(self, query_embedding: np.ndarray, k: int) -> List[str]:
+        query = query_embedding / (np.linalg.norm(query_embedding) or 1)
+        scores = self.matrix @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self.ids[i] for i in top]
+
+    def index_bytes(self) -> int:
+        return int(self.matrix.nbytes)
+
+
+def evaluate(
+    engine,
+    queries: List[Dict],
+    query_embeddings: np.ndarray,
+    ks: Sequence[int] = (1, 5, 10)
+) -> Dict:
+    """
+    Run every query through an engine and score the rankings.
+
+    recall@k is the number of relevant chunks in the top k divided by
+    min(k, number of relevant chunks), so a whole-chapter label can still
+    reach 1.0; MRR uses the rank of the first relevant chunk.
+
+    Args:
+        engine: Object with search(embedding, k) and index_bytes()
+        queries: Labeled queries
+        query_embeddings: One embedding per query
+        ks: Cutoffs to report
+
+    Returns:
+        Metrics dict
+    """
+    depth = max(ks)
+    recall = {k: [] for k in ks}
+    reciprocal_ranks = []
+    latencies = []
+
+    for query, embedding in zip(queries, query_embeddings):
+        start = time.perf_counter()
+        ranked = engine.search(embedding, depth)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        relevant = query["relevant"]
+        for k in ks:
+            found = len(relevant.intersection(ranked[:k]))
+            recall[k].append(found / min(k, len(relevant)))
+
+        rank = next((i for i, chunk_id in enumerate(ranked, 1) if chunk_id in relevant), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+    latencies.sort()
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+    return {
+        "queries": len(queries),
+        **{f"recall@{k}": round(float(np.mean(values)), 4) for k, values in recall.items()},
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        "latency_ms_p50": percentile(0.50),
+        "latency_ms_p99": percentile(0.99),
+        "index_bytes": engine.index_bytes(),
+    }
+
+
+def run_benchmark(
+    collection,
+    embed: Callable[[List[str]], Sequence],
+    db_path: Optional[str] = None,
+    engines: Sequence[str] = ("chroma", "exact"),
+    n_synthetic: int = 200,
+    ks: Sequence[int] = (1, 5, 10),
+    seed: int = 0
+) -> Dict:
+    """
+    Benchmark every requested engine on example and synthetic queries.
+
+    Args:
+        collection: ChromaDB collection to benchmark
+        embed: Function mapping a list of texts to embeddings (same model as the index)
+        db_path: Database directory, used to size the Chroma index on disk
+        engines: Engine names to run ('chroma', 'exact')
+        n_synthetic: Number of synthetic queries
+        ks: Cutoffs for recall@k
+        seed: Seed for synthetic query sampling
+
+    Returns:
+        Report dict with per-engine results for each query set
+    """
+    corpus = load_corpus(collection)
+    query_sets = {
+        "example": label_example_queries(corpus),
+        "synthetic": synthetic_queries(corpus, n=n_synthetic, seed=seed),
+    }
+
+    available = {
+        "chroma": lambda: ChromaEngine(collection, db_path),
+        "exact": lambda: ExactEngine(corpus),
+    }
+    unknown = set(engines) - set(available)
+    if unknown:
+        raise ValueError(f"Unknown engines: {sorted(unknown)} (expected {sorted(available)})")
+
+    # Embed every query once so engine latency excludes the embedding model
+    embedded = {}
+    embed_ms = {}
+    for name, queries in query_sets.items():
+        if not queries:
+            continue
+        start = time.perf_counter()
+        embedded[name] = np.asarray(embed([q["query"] for q in queries]), dtype=np.float32)
+        embed_ms[name] = round((time.perf_counter() - start) * 1000 / len(queries), 3)
+
+    results = {}
+    for engine_name in engines:
+        engine = available[engine_name]()
+        results[engine_name] = {
+            set_name: evaluate(engine, query_sets[set_name], embedded[set_name], ks)
+            for set_name in embedded
+        }
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "collection": collection.name,
+        "chunks": len(corpus["ids"]),
+        "query_sets": {name: len(queries) for name, queries in query_sets.items()},
+        "embed_ms_per_query": embed_ms,
+        "results": results,
+    }
+
+
+def save_report(report: Dict, output_path: str):
+    """Write a report as JSON."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf8") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,87 @@
+"""Chat title benchmark: latency and sample outputs of each titler."""
+
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+from src.benchmarks.load_test import percentiles
+
+
+def load_questions(path: str) -> List[str]:
+    """
+    Load first messages from a replay JSONL file (see load_test.load_requests).
+
+    Both 'query' and 'message' lines are used; duplicates are dropped.
+
+    Args:
+        path: Path to the JSONL file
+
+    Returns:
+        Unique questions in file order
+    """
+    questions = []
+    with open(path, "r", encoding="utf8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            question = item.get("message") or item.get("query")
+            if question and question not in questions:
+                questions.append(question)
+
+    if not questions:
+        raise ValueError(f"No questions found in {path}")
+    return questions
+
+
+async def run_benchmark(
+    questions: List[str],
+    titlers: Dict[str, Callable[[str], Awaitable[str]]],
+    repeats: int = 1
+) -> Dict:
+    """
+    Title every question with every titler and time each call.
+
+    Args:
+        questions: First messages to title
+        titlers: Name -> async function returning a title
+        repeats: Calls per question (titles are taken from the first call)
+
+    Returns:
+        Report dict with latency percentiles per titler and one sample row per question
+    """
+    latencies = {name: [] for name in titlers}
+    samples = [{"question": question} for question in questions]
+
+    for name, titler in titlers.items():
+        for sample in samples:
+            for attempt in range(repeats):
+                start = time.perf_counter()
+                try:
+                    title = await titler(sample["question"])
+                except Exception as e:
+                    title = f"<error: {type(e).__name__}: {e}>"
+                latencies[name].append((time.perf_counter() - start) * 1000)
+                if attempt == 0:
+                    sample[name] = title
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "questions": len(questions),
+        "repeats": repeats,
+        "latency_ms": {name: percentiles(values) for name, values in latencies.items()},
+        "samples": samples,
+    }
+
+
+def save_report(report: Dict, output_path: str):
+    """Write a report as JSON."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf8") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,158 @@
+"""Shard-per-book layout: one Chroma collection per book plus a manifest with book centroids."""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.ingestion.artifacts import book_from_artifact
+
+SHARD_MANIFEST = "shards.json"
+
+
+def book_collection_name(book: str) -> str:
+    """
+    Chroma collection name for a book's shard.
+
+    Chroma names must be 3-63 characters of [a-zA-Z0-9._-] and start and
+    end with a letter or digit.
+    """
+    slug = re.sub(r"[^a-zA-Z0-9._-]+", "_", book).strip("._-") or "book"
+    return f"book_{slug}"[:63].rstrip("._-")
+
+
+def compute_centroid(collection, batch_size: int = 5000) -> Optional[list]:
+    """
+    Mean of the unit-normalized embeddings in a collection, normalized again.
+
+    Used to skip books whose centroid is far from the query.
+
+    Args:
+        collection: ChromaDB collection
+        batch_size: Embeddings read per get() call
+
+    Returns:
+        Centroid as a list of floats, or None if the collection is empty
+    """
+    total = None
+    for offset in range(0, collection.count(), batch_size):
+        batch = collection.get(include=["embeddings"], limit=batch_size, offset=offset)
+        embeddings = np.asarray(batch["embeddings"], dtype=np.float32)
+        if not len(embeddings):
+            continue
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        summed = (embeddings / np.where(norms == 0, 1, norms)).sum(axis=0)
+        total = summed if total is None else total + summed
+
+    if total is None:
+        return None
+    norm = np.linalg.norm(total)
+    return (total / norm if norm else total).tolist()
+
+
+def load_shard_manifest(db_path) -> Optional[Dict]:
+    """
+    Read the shard manifest of a database directory.
+
+    Returns:
+        {"shards": {book: {"collection", "count", "centroid"}}}, or None for a
+        single-collection database
+    """
+    path = Path(db_path) / SHARD_MANIFEST
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf8") as f:
+        return json.load(f)
+
+
+def update_shard_manifest(db_path, book: str, collection, source_key: Optional[str] = None) -> Dict:
+    """
+    Record (or refresh) one book's shard in the manifest.
+
+    Args:
+        db_path: Database directory
+        book: Book name
+        collection: The book's collection, already filled
+        source_key: Optional hash of the chunks and settings the shard was built
+            from, so a later build can tell whether the shard is up to date
+
+    Returns:
+        The updated manifest
+    """
+    manifest = load_shard_manifest(db_path) or {"shards": {}}
+    manifest["shards"][book] = {
+        "collection": collection.name,
+        "count": collection.count(),
+        "centroid": compute_centroid(collection),
+    }
+    if source_key is not None:
+        manifest["shards"][book]["source_key"] = source_key
+
+    path = Path(db_path) / SHARD_MANIFEST
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf8") as f:
+        json.dump(manifest, f)
+    tmp_path.replace(path)
+    return manifest
+
+
+def drop_book_collection(db_path, book: str) -> bool:
+    """
+    Delete a book's collection if it exists (other books are not touched).
+
+    Returns:
+        True if a collection was deleted
+    """
+    import chromadb
+
+    client = chromadb.PersistentClient(path=str(db_path))
+    collection_name = book_collection_name(book)
+    # list_collections() returns names on older Chroma, collections on newer
+    existing = {getattr(c, "name", c) for c in client.list_collections()}
+    if collection_name not in existing:
+        return False
+    client.delete_collection(collection_name)
+    return True
+
+
+def build_book_shard(
+    db_path,
+    chunks_path,
+    book: Optional[str] = None,
+    model_name: str = "all-MiniLM-L6-v2",
+    batch_size: int = 100,
+    source_key: Optional[str] = None
+):
+    """
+    (Re)build one book's collection from its chunks file and record it in the manifest.
+
+    Any existing collection for the book is dropped first; other books'
+    collections are not touched.
+
+    Args:
+        db_path: Database directory (a version directory)
+        chunks_path: Path to the book's chunks JSON file
+        book: Book name (default: derived from the chunks file name)
+        model_name: SentenceTransformer model name
+        batch_size: Batch size for storing chunks
+        source_key: Optional build key recorded in the manifest
+
+    Returns:
+        The book's ChromaDB collection
+    """
+    from src.embeddings.store import build_vector_db_from_chunks
+
+    book = book or book_from_artifact(chunks_path, "chunks")
+    drop_book_collection(db_path, book)
+
+    collection = build_vector_db_from_chunks(
+        chunks_path=str(chunks_path),
+        db_path=str(db_path),
+        collection_name=book_collection_name(book),
+        model_name=model_name,
+        batch_size=batch_size
+    )
+    update_shard_manifest(db_path, book, collection, source_key=source_key)
+    return collection
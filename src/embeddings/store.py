@@ -1,9 +1,9 @@
 """Store embeddings in ChromaDB vector database."""
 
-import json
-import chromadb
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
+
+from src.ingestion.artifacts import read_chunks
+from src.utils import profile_stage
 
 
 def get_embedder(model_name="all-MiniLM-L6-v2"):
@@ -16,6 +16,9 @@ def get_embedder(model_name="all-MiniLM-L6-v2"):
     Returns:
         SentenceTransformer model instance
     """
+    # Imported on use: sentence_transformers pulls in torch
+    from sentence_transformers import SentenceTransformer
+    
     print(f"Loading embedding model: {model_name}...")
     return SentenceTransformer(model_name)
 
@@ -31,6 +34,8 @@ def create_chroma_collection(persist_path, collection_name="history_book"):
     Returns:
         ChromaDB collection object
     """
+    import chromadb
+    
     Path(persist_path).mkdir(parents=True, exist_ok=True)
     
     client = chromadb.PersistentClient(path=str(persist_path))
@@ -66,7 +71,8 @@ def store_chunks_in_chroma(chunks, collection, embedder, batch_size=100):
         })
     
     print("Generating embeddings...")
-    embeddings = embedder.encode(texts, show_progress_bar=True).tolist()
+    with profile_stage("encode", items=len(texts)):
+        embeddings = embedder.encode(texts, show_progress_bar=True).tolist()
     
     # Add in batches to avoid ChromaDB batch size limits
     total_chunks = len(chunks)
@@ -75,12 +81,13 @@ def store_chunks_in_chroma(chunks, collection, embedder, batch_size=100):
     for i in range(0, total_chunks, batch_size):
         end_idx = min(i + batch_size, total_chunks)
         
-        collection.add(
-            ids=ids[i:end_idx],
-            documents=texts[i:end_idx],
-            metadatas=metadatas[i:end_idx],
-            embeddings=embeddings[i:end_idx]
-        )
+        with profile_stage("collection_add", items=end_idx - i):
+            collection.add(
+                ids=ids[i:end_idx],
+                documents=texts[i:end_idx],
+                metadatas=metadatas[i:end_idx],
+                embeddings=embeddings[i:end_idx]
+            )
         
         print(f"Batch {i//batch_size + 1}: {end_idx}/{total_chunks} chunks stored")
     
@@ -93,10 +100,10 @@ def build_vector_db_from_chunks(chunks_path,
                                   model_name="all-MiniLM-L6-v2",
                                   batch_size=100):
     """
-    Load chunks from JSON and build a ChromaDB vector database.
+    Load chunks from a chunks file and build a ChromaDB vector database.
     
     Args:
-        chunks_path: Path to chunks JSON file
+        chunks_path: Path to chunks file (.parquet or .json)
         db_path: Directory path to store ChromaDB
         collection_name: Name for the ChromaDB collection
         model_name: SentenceTransformer model name
@@ -106,13 +113,17 @@ def build_vector_db_from_chunks(chunks_path,
         ChromaDB collection object
     """
     print(f"Loading chunks from {chunks_path}...")
-    with open(chunks_path, 'r', encoding='utf-8') as f:
-        chunks = json.load(f)
+    # Only the columns stored in Chroma (Parquet skips the rest on disk)
+    with profile_stage("load_artifact") as stage:
+        chunks = read_chunks(chunks_path, columns=["chunk_id", "chapter_metadata", "text"])
+        stage.items = len(chunks)
     
     print(f"Loaded {len(chunks)} chunks")
     
-    embedder = get_embedder(model_name)
-    collection = create_chroma_collection(db_path, collection_name)
+    with profile_stage("load_model"):
+        embedder = get_embedder(model_name)
+    with profile_stage("open_collection"):
+        collection = create_chroma_collection(db_path, collection_name)
     
     store_chunks_in_chroma(chunks, collection, embedder, batch_size)
     
@@ -0,0 +1,139 @@
+"""Versioned vector index directories with an atomically updated CURRENT pointer."""
+
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+def new_version_dir(index_root) -> Path:
+    """
+    Create an empty directory for a new index version.
+
+    Versions are named <UTC timestamp>-<random suffix>, so they sort by
+    build time and two concurrent builds never share a directory.
+
+    Args:
+        index_root: Root directory of the versioned index (e.g. data/vector_db)
+
+    Returns:
+        Path of the new version directory
+    """
+    name = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%fZ}-{uuid.uuid4().hex[:8]}"
+    path = Path(index_root) / VERSIONS_DIR / name
+    path.mkdir(parents=True)
+    return path
+
+
+def current_version(index_root) -> Optional[str]:
+    """
+    Name of the version CURRENT points to, or None if the index is not versioned.
+    """
+    try:
+        with open(Path(index_root) / CURRENT_FILE, "r", encoding="utf8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve_db_path(index_root) -> Path:
+    """
+    Directory to open with Chroma for an index root.
+
+    Returns the version CURRENT points to; an unversioned root (no
+    CURRENT file, e.g. built before versioning) is returned as is, and
+    so is a version directory passed directly.
+
+    Args:
+        index_root: Root directory of the index
+
+    Returns:
+        Database directory
+    """
+    version = current_version(index_root)
+    if version is None:
+        return Path(index_root)
+    return Path(index_root) / VERSIONS_DIR / version
+
+
+def is_current_version(db_path) -> bool:
+    """
+    Whether a database directory is still the one to serve.
+
+    A version directory is current while CURRENT points to it; an
+    unversioned database stops being current once versions are published
+    under it.
+
+    Args:
+        db_path: Database directory, e.g. as returned by resolve_db_path()
+
+    Returns:
+        False for a version that has been replaced
+    """
+    db_path = Path(db_path)
+    if db_path.parent.name != VERSIONS_DIR:
+        return current_version(db_path) is None
+    return current_version(db_path.parent.parent) == db_path.name
+
+
+def publish_version(index_root, version_dir) -> str:
+    """
+    Point CURRENT at a finished version.
+
+    The pointer is written to a temporary file and renamed over CURRENT,
+    so readers see either the old or the new version, never a partial write.
+
+    Args:
+        index_root: Root directory of the index
+        version_dir: Version directory returned by new_version_dir()
+
+    Returns:
+        Name of the published version
+    """
+    version = Path(version_dir).name
+    if not (Path(index_root) / VERSIONS_DIR / version).is_dir():
+        raise FileNotFoundError(f"Not a version of {index_root}: {version_dir}")
+
+    tmp_path = Path(index_root) / f"{CURRENT_FILE}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf8") as f:
+        f.write(version + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, Path(index_root) / CURRENT_FILE)
+    return version
+
+
+def list_versions(index_root) -> List[str]:
+    """Version names, oldest first."""
+    versions_dir = Path(index_root) / VERSIONS_DIR
+    if not versions_dir.is_dir():
+        return []
+    return sorted(p.name for p in versions_dir.iterdir() if p.is_dir())
+
+
+def prune_versions(index_root, keep: int = 3) -> List[str]:
+    """
+    Delete old versions, keeping the newest `keep` and always the current one.
+
+    Servers that have not swapped yet may still read a recent version,
+    so keep at least 2.
+
+    Args:
+        index_root: Root directory of the index
+        keep: Number of newest versions to keep
+
+    Returns:
+        Names of the deleted versions
+    """
+    current = current_version(index_root)
+    versions = list_versions(index_root)
+    stale = [v for v in versions[:max(0, len(versions) - keep)] if v != current]
+
+    for version in stale:
+        shutil.rmtree(Path(index_root) / VERSIONS_DIR / version, ignore_errors=True)
+    return stale
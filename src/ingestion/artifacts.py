@@ -0,0 +1,295 @@
+"""Readers and writers for the page and chunk files passed between ingestion stages.
+
+Files are Parquet (columnar, compressed, readable column by column) when
+pyarrow is installed, or the original pretty-printed JSON. The format is
+picked from the file extension, so every stage reads either one; JSON
+stays available as an export format (see convert_artifact()).
+"""
+
+import importlib.util
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Column holding the "page_<n>" key of each page row
+PAGE_KEY = "key"
+
+# Chunk fields that only some chunks have (dropped from a row when null)
+OPTIONAL_CHUNK_FIELDS = ("duplicate_ids", "duplicate_locations", "embedding")
+
+FORMAT_SUFFIXES = {"parquet": ".parquet", "json": ".json"}
+
+
+def pyarrow_available() -> bool:
+    """True if pyarrow can be imported (checked without importing it)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def default_format() -> str:
+    """
+    Format for new intermediate files: $ARTIFACT_FORMAT if set, else
+    Parquet when pyarrow is installed, else JSON.
+    """
+    fmt = os.getenv("ARTIFACT_FORMAT") or ("parquet" if pyarrow_available() else "json")
+    if fmt not in FORMAT_SUFFIXES:
+        raise ValueError(f"Unknown ARTIFACT_FORMAT {fmt!r}; expected one of {', '.join(FORMAT_SUFFIXES)}")
+    return fmt
+
+
+def artifact_format(path) -> str:
+    """Format of a file, from its extension."""
+    suffix = Path(path).suffix.lower()
+    for fmt, fmt_suffix in FORMAT_SUFFIXES.items():
+        if suffix == fmt_suffix:
+            return fmt
+    raise ValueError(f"Unsupported artifact file: {path} (expected .parquet or .json)")
+
+
+def artifact_name(book: str, kind: str, fmt: Optional[str] = None) -> str:
+    """File name of a book's artifact, e.g. artifact_name("world_history", "cleaned") -> 'world_history_cleaned.parquet'."""
+    return f"{book}_{kind}{FORMAT_SUFFIXES[fmt or default_format()]}"
+
+
+def book_from_artifact(path, kind: str) -> str:
+    """'world_history_cleaned.parquet' -> 'world_history' (for kind "cleaned")."""
+    path = Path(path)
+    return path.name[:-len(f"_{kind}{path.suffix}")]
+
+
+def find_artifacts(directory, kind: str) -> List[Path]:
+    """
+    Files of one kind ("extracted", "cleaned", "chunks") in a directory,
+    one per book. If a book has both a Parquet and a JSON file, the most
+    recently written one wins (the other is left over from an earlier run
+    in the other format) and a warning is printed.
+    """
+    by_book = {}
+    for fmt in ("json", "parquet"):
+        for path in Path(directory).glob(f"*_{kind}{FORMAT_SUFFIXES[fmt]}"):
+            by_book.setdefault(book_from_artifact(path, kind), []).append(path)
+
+    found = []
+    for book in sorted(by_book):
+        paths = sorted(by_book[book], key=lambda p: p.stat().st_mtime)
+        if len(paths) > 1:
+            print(f"Warning: {book} has both {paths[0].name} and {paths[1].name}; "
+                  f"using the newer {paths[-1].name}")
+        found.append(paths[-1])
+    return found
+
+
+def _import_parquet():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet artifacts need pyarrow: pip install pyarrow") from e
+    return pa, pq
+
+
+def _write_json(data, path: Path):
+    with open(path, "w", encoding="utf8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _read_json(path: Path):
+    with open(path, "r", encoding="utf8") as f:
+        return json.load(f)
+
+
+def _table_rows(table) -> List[Dict]:
+    """Rows of an Arrow table as dicts (column-wise conversion is faster than Table.to_pylist())."""
+    names = table.column_names
+    columns = [table.column(name).to_pylist() for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _write_parquet(table, path: Path):
+    _, pq = _import_parquet()
+    pq.write_table(table, str(path), compression="zstd")
+
+
+def write_pages(pages: Dict[str, Dict], path) -> Path:
+    """
+    Write pages ({"page_<n>": {field: value}}) as Parquet or JSON, by extension.
+
+    In Parquet, each page is a row with a 'key' column plus one column per field.
+
+    Args:
+        pages: Pages keyed like the extracted/cleaned JSON
+        path: Output path (.parquet or .json)
+
+    Returns:
+        The output path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if artifact_format(path) == "json":
+        _write_json(pages, path)
+        return path
+
+    pa, _ = _import_parquet()
+    rows = [{PAGE_KEY: key, **value} for key, value in pages.items()]
+    _write_parquet(pa.Table.from_pylist(rows), path)
+    return path
+
+
+def read_pages(path, columns: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+    """
+    Read pages written by write_pages() (or an original JSON file).
+
+    Args:
+        path: Input path (.parquet or .json)
+        columns: Only these fields (e.g. ["text", "chapter_details"]); None reads all.
+            Parquet reads only these columns from disk.
+
+    Returns:
+        Pages keyed like the extracted/cleaned JSON
+    """
+    path = Path(path)
+
+    if artifact_format(path) == "json":
+        pages = _read_json(path)
+        if columns is None:
+            return pages
+        return {key: {c: value[c] for c in columns if c in value} for key, value in pages.items()}
+
+    _, pq = _import_parquet()
+    parquet_file = pq.ParquetFile(str(path))
+    if columns is not None:
+        columns = [PAGE_KEY] + [c for c in columns if c != PAGE_KEY and c in parquet_file.schema_arrow.names]
+    rows = _table_rows(parquet_file.read(columns=columns))
+    return {row.pop(PAGE_KEY): row for row in rows}
+
+
+def _chunk_table(chunks: List[Dict]):
+    """Arrow table of chunks with a fixed schema, so empty optional columns keep their types."""
+    pa, _ = _import_parquet()
+    string_list = pa.list_(pa.string())
+    fields = [
+        pa.field("chunk_id", pa.string()),
+        pa.field("chapter_metadata", pa.string()),
+        pa.field("text", pa.string()),
+        pa.field("duplicate_ids", string_list),
+        pa.field("duplicate_locations", string_list),
+        pa.field("embedding", pa.list_(pa.float32())),
+    ]
+    # Keep any extra fields a stage added, with inferred types
+    known = {field.name for field in fields}
+    extra = sorted({name for chunk in chunks for name in chunk} - known)
+    if extra:
+        inferred = pa.Table.from_pylist([{name: chunk.get(name) for name in extra} for chunk in chunks]).schema
+        fields.extend(inferred.field(name) for name in extra)
+
+    schema = pa.schema(fields)
+    return pa.Table.from_pylist([{name: chunk.get(name) for name in schema.names} for chunk in chunks], schema=schema)
+
+
+def _chunk_rows(rows: List[Dict]) -> List[Dict]:
+    for row in rows:
+        for name in OPTIONAL_CHUNK_FIELDS:
+            if name in row and row[name] is None:
+                del row[name]
+    return rows
+
+
+def write_chunks(chunks: List[Dict], path, embeddings=None) -> Path:
+    """
+    Write chunks as Parquet or JSON, by extension.
+
+    Args:
+        chunks: Chunk dicts with chunk_id, chapter_metadata, text (and optionally
+            duplicate_ids, duplicate_locations)
+        path: Output path (.parquet or .json)
+        embeddings: Optional per-chunk embeddings, stored in an 'embedding' column
+
+    Returns:
+        The output path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if embeddings is not None:
+        chunks = [{**chunk, "embedding": [float(x) for x in embedding]} for chunk, embedding in zip(chunks, embeddings)]
+
+    if artifact_format(path) == "json":
+        _write_json(chunks, path)
+    else:
+        _write_parquet(_chunk_table(chunks), path)
+    return path
+
+
+def read_chunks(path, columns: Optional[Sequence[str]] = None) -> List[Dict]:
+    """
+    Read chunks written by write_chunks() (or an original JSON file).
+
+    Args:
+        path: Input path (.parquet or .json)
+        columns: Only these fields (e.g. ["chunk_id", "text"]); None reads all.
+            Parquet reads only these columns from disk.
+
+    Returns:
+        List of chunk dicts
+    """
+    path = Path(path)
+
+    if artifact_format(path) == "json":
+        chunks = _read_json(path)
+        if columns is None:
+            return chunks
+        return [{c: chunk[c] for c in columns if c in chunk} for chunk in chunks]
+
+    _, pq = _import_parquet()
+    parquet_file = pq.ParquetFile(str(path))
+    if columns is not None:
+        columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+    return _chunk_rows(_table_rows(parquet_file.read(columns=columns)))
+
+
+def iter_chunk_batches(path, batch_size: int = 1000, columns: Optional[Sequence[str]] = None) -> Iterator[List[Dict]]:
+    """
+    Read chunks in batches without loading the whole file (Parquet); JSON is loaded once and sliced.
+
+    Args:
+        path: Input path (.parquet or .json)
+        batch_size: Chunks per batch
+        columns: Only these fields; None reads all
+
+    Yields:
+        Lists of chunk dicts
+    """
+    path = Path(path)
+
+    if artifact_format(path) == "json":
+        chunks = read_chunks(path, columns)
+        for i in range(0, len(chunks), batch_size):
+            yield chunks[i:i + batch_size]
+        return
+
+    _, pq = _import_parquet()
+    parquet_file = pq.ParquetFile(str(path))
+    if columns is not None:
+        columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield _chunk_rows(batch.to_pylist())
+
+
+def convert_artifact(input_path, output_path, kind: str) -> Path:
+    """
+    Convert a page or chunk file between Parquet and JSON (e.g. to export JSON).
+
+    Args:
+        input_path: Source file
+        output_path: Destination; its extension picks the format
+        kind: "pages" or "chunks"
+
+    Returns:
+        The output path
+    """
+    if kind == "pages":
+        return write_pages(read_pages(input_path), output_path)
+    if kind == "chunks":
+        return write_chunks(read_chunks(input_path), output_path)
+    raise ValueError(f"Unknown artifact kind: {kind} (expected 'pages' or 'chunks')")
@@ -1,12 +1,13 @@
-import json
 import uuid
-import nltk
-from nltk.tokenize import sent_tokenize
-from sentence_transformers import SentenceTransformer, util
+
+from src.ingestion.artifacts import read_pages, write_chunks
+from src.utils import profile_stage
 
 
 def ensure_nltk_data():
     """Download required NLTK data if not present."""
+    import nltk
+    
     try:
         nltk.data.find('tokenizers/punkt')
     except LookupError:
@@ -14,61 +15,81 @@ def ensure_nltk_data():
         nltk.download('punkt')
 
 
-def split_into_sentences(pages_data):
+def iter_page_sentences(pages):
     """
-    Add a 'sentences' list to each page in the data.
+    Add a 'sentences' list to pages one at a time.
     
     Args:
-        pages_data: Dict of page data with 'text' field
+        pages: Iterable of (page key, page dict with 'text' field)
     
-    Returns:
-        Updated pages_data with 'sentences' field added
+    Yields:
+        (page key, page dict with 'sentences' field added)
     """
+    from nltk.tokenize import sent_tokenize
+    
     ensure_nltk_data()
     
-    for key, value in pages_data.items():
+    for key, value in pages:
         text = value.get("text", "").strip()
         
         if text:
-            sentences = sent_tokenize(text)
+            with profile_stage("sent_tokenize", items=1):
+                sentences = sent_tokenize(text)
         else:
             sentences = []
         
         value["sentences"] = sentences
+        yield key, value
+
+
+def split_into_sentences(pages_data):
+    """
+    Add a 'sentences' list to each page in the data.
+    
+    Args:
+        pages_data: Dict of page data with 'text' field
+    
+    Returns:
+        Updated pages_data with 'sentences' field added
+    """
+    for _ in iter_page_sentences(pages_data.items()):
+        pass
     
     return pages_data
 
 
-def build_semantic_chunks(pages_data,
-                          model_name="all-MiniLM-L6-v2",
-                          similarity_threshold=0.55,
-                          max_sentences_per_chunk=10):
+def iter_semantic_chunks(pages,
+                         model,
+                         similarity_threshold=0.55,
+                         max_sentences_per_chunk=10):
     """
-    Build semantic chunks from pages using sentence similarity.
+    Build semantic chunks page by page, yielding each page's chunks as soon as it is done.
+    
+    Chunks never span pages, so this needs only one page in memory.
     
     Args:
-        pages_data: Dict of page data with 'sentences' and 'chapter_details' fields
-        model_name: SentenceTransformer model to use for embeddings
+        pages: Iterable of (page key, page dict with 'sentences' and 'chapter_details' fields)
+        model: Loaded SentenceTransformer model
         similarity_threshold: Minimum cosine similarity to keep sentences together
         max_sentences_per_chunk: Maximum sentences per chunk before forcing split
     
-    Returns:
-        List of chunk dicts with chunk_id, chapter_metadata, and text
+    Yields:
+        Chunk dicts with chunk_id, chapter_metadata, and text
     """
-    print(f"Loading embedding model: {model_name}...")
-    model = SentenceTransformer(model_name)
-    
-    all_chunks = []
+    from sentence_transformers import util
     
-    for page_num, page in pages_data.items():
+    for page_num, page in pages:
         sentences = page.get("sentences", [])
         chapter_metadata = page.get("chapter_details")
         
         if not sentences:
             continue
         
+        page_chunks = []
+        
         # Embed all sentences for this page
-        embeddings = model.encode(sentences, convert_to_tensor=True)
+        with profile_stage("encode", items=len(sentences)):
+            embeddings = model.encode(sentences, convert_to_tensor=True)
         
         current_chunk_sentences = []
         current_chunk_embeddings = []
@@ -82,42 +103,76 @@ def build_semantic_chunks(pages_data,
             if not chunk_text:
                 return
             
-            all_chunks.append({
+            page_chunks.append({
                 "chunk_id": str(uuid.uuid4()),
                 "chapter_metadata": chapter_metadata if chapter_metadata else "UNKNOWN",
                 "text": chunk_text,
             })
         
         # Build chunks by iterating through sentences
-        for i, sentence in enumerate(sentences):
-            sent_embedding = embeddings[i]
+        with profile_stage("split_by_similarity", items=len(sentences)):
+            for i, sentence in enumerate(sentences):
+                sent_embedding = embeddings[i]
             
-            # First sentence always starts a new chunk
-            if not current_chunk_embeddings:
-                current_chunk_sentences.append(sentence)
-                current_chunk_embeddings.append(sent_embedding)
-                continue
+                # First sentence always starts a new chunk
+                if not current_chunk_embeddings:
+                    current_chunk_sentences.append(sentence)
+                    current_chunk_embeddings.append(sent_embedding)
+                    continue
             
-            # Calculate similarity with previous sentence
-            prev_embedding = current_chunk_embeddings[-1]
-            similarity = util.pytorch_cos_sim(prev_embedding, sent_embedding).item()
+                # Calculate similarity with previous sentence
+                prev_embedding = current_chunk_embeddings[-1]
+                similarity = util.pytorch_cos_sim(prev_embedding, sent_embedding).item()
             
-            # Decide whether to split chunk
-            split_by_size = len(current_chunk_sentences) >= max_sentences_per_chunk
-            split_by_similarity = similarity < similarity_threshold
+                # Decide whether to split chunk
+                split_by_size = len(current_chunk_sentences) >= max_sentences_per_chunk
+                split_by_similarity = similarity < similarity_threshold
             
-            if split_by_size or split_by_similarity:
-                # Save current chunk and start new one
-                flush_chunk()
-                current_chunk_sentences = [sentence]
-                current_chunk_embeddings = [sent_embedding]
-            else:
-                # Add to current chunk
-                current_chunk_sentences.append(sentence)
-                current_chunk_embeddings.append(sent_embedding)
+                if split_by_size or split_by_similarity:
+                    # Save current chunk and start new one
+                    flush_chunk()
+                    current_chunk_sentences = [sentence]
+                    current_chunk_embeddings = [sent_embedding]
+                else:
+                    # Add to current chunk
+                    current_chunk_sentences.append(sentence)
+                    current_chunk_embeddings.append(sent_embedding)
+        
+            # Flush any remaining chunk for this page
+            flush_chunk()
         
-        # Flush any remaining chunk for this page
-        flush_chunk()
+        yield from page_chunks
+
+
+def build_semantic_chunks(pages_data,
+                          model_name="all-MiniLM-L6-v2",
+                          similarity_threshold=0.55,
+                          max_sentences_per_chunk=10):
+    """
+    Build semantic chunks from pages using sentence similarity.
+    
+    Args:
+        pages_data: Dict of page data with 'sentences' and 'chapter_details' fields
+        model_name: SentenceTransformer model to use for embeddings
+        similarity_threshold: Minimum cosine similarity to keep sentences together
+        max_sentences_per_chunk: Maximum sentences per chunk before forcing split
+    
+    Returns:
+        List of chunk dicts with chunk_id, chapter_metadata, and text
+    """
+    # Imported on use: sentence_transformers pulls in torch
+    from sentence_transformers import SentenceTransformer
+    
+    print(f"Loading embedding model: {model_name}...")
+    with profile_stage("load_model"):
+        model = SentenceTransformer(model_name)
+    
+    all_chunks = list(iter_semantic_chunks(
+        pages_data.items(),
+        model,
+        similarity_threshold=similarity_threshold,
+        max_sentences_per_chunk=max_sentences_per_chunk
+    ))
     
     print(f"Created {len(all_chunks)} semantic chunks")
     return all_chunks
@@ -128,11 +183,11 @@ def chunk_from_json(input_path,
                     similarity_threshold=0.55,
                     max_sentences_per_chunk=10):
     """
-    Load cleaned book JSON, tokenize into sentences, and create semantic chunks.
+    Load cleaned book pages, tokenize into sentences, and create semantic chunks.
     
     Args:
-        input_path: Path to cleaned_book.json
-        output_path: Optional path to save chunks JSON
+        input_path: Path to <book>_cleaned.parquet or <book>_cleaned.json
+        output_path: Optional path to save chunks (.parquet or .json)
         similarity_threshold: Semantic similarity threshold for chunking
         max_sentences_per_chunk: Max sentences per chunk
     
@@ -140,8 +195,9 @@ def chunk_from_json(input_path,
         List of chunks
     """
     print(f"Loading data from {input_path}...")
-    with open(input_path, 'r', encoding='utf-8') as f:
-        pages_data = json.load(f)
+    with profile_stage("load_artifact") as stage:
+        pages_data = read_pages(input_path, columns=["text", "chapter_details"])
+        stage.items = len(pages_data)
     
     print("Tokenizing sentences...")
     pages_with_sentences = split_into_sentences(pages_data)
@@ -155,20 +211,29 @@ def chunk_from_json(input_path,
     
     if output_path:
         print(f"Saving chunks to {output_path}...")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(chunks, f, indent=2, ensure_ascii=False)
+        with profile_stage("write_artifact", items=len(chunks)):
+            write_chunks(chunks, output_path)
         print(f"✓ Saved {len(chunks)} chunks")
     
     return chunks
 
 
 if __name__ == "__main__":
-    # Example usage
-    input_file = "../data/clean/cleaned_book.json"
-    output_file = "../data/clean/semantic_chunks.json"
+    import argparse
+    from pathlib import Path
+    
+    parser = argparse.ArgumentParser(description="Create semantic chunks from cleaned text")
+    parser.add_argument("input_path", help="Path to <book>_cleaned.parquet or <book>_cleaned.json")
+    parser.add_argument("-o", "--output", help="Output path (default: <book>_chunks.<ext> next to the input)")
+    
+    args = parser.parse_args()
+    
+    # Same naming as scripts/03_create_chunks.py, so 04_build_vector_db.py finds the file
+    input_path = Path(args.input_path)
+    output_file = args.output or str(input_path.parent / input_path.name.replace("_cleaned", "_chunks"))
     
     chunks = chunk_from_json(
-        input_path=input_file,
+        input_path=str(input_path),
         output_path=output_file,
         similarity_threshold=0.55,
         max_sentences_per_chunk=10
@@ -1,11 +1,11 @@
 """Clean extracted text and add chapter metadata."""
 
-import json
 import re
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
-from src.utils import setup_logger, EXTRACTED_DATA_DIR
+from src.ingestion.artifacts import read_pages, write_pages
+from src.utils import setup_logger, profile_stage, EXTRACTED_DATA_DIR
 
 logger = setup_logger(__name__)
 
@@ -116,6 +116,47 @@ def backfill_chapter_details(pages: Dict) -> Dict:
     return pages
 
 
+def iter_clean_pages(
+    pages: Iterable[Tuple[str, Dict]],
+    start_page: int = 10,
+    end_page: int = 486
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    Streaming version of filter_pages → add_chapter_metadata → backfill_chapter_details.
+
+    Backfill only looks backwards (the last chapter header seen), so pages
+    can be cleaned as they arrive.
+
+    Args:
+        pages: Iterable of (page key, extracted page dict)
+        start_page: First page to keep
+        end_page: Last page to keep
+
+    Yields:
+        (page key, {"text", "chapter_details"}), as in the cleaned JSON
+    """
+    last_chapter_number = None
+    last_chapter_title = None
+
+    for key, value in pages:
+        page_number = value["page"]
+        if not start_page <= page_number <= end_page:
+            continue
+
+        text = value.get("text", "")
+        chapter_number, chapter_title = extract_chapter_details(text)
+
+        # Update memory when a chapter header appears, otherwise backfill
+        if chapter_number is not None:
+            last_chapter_number = chapter_number
+            last_chapter_title = chapter_title
+
+        yield key, {
+            "text": text,
+            "chapter_details": f"CHAPTER: {last_chapter_number} - {last_chapter_title} | pg-{page_number}",
+        }
+
+
 def clean_extracted_text(
     input_path: str,
     output_path: str,
@@ -133,8 +174,8 @@ def clean_extracted_text(
     5. Save cleaned data
     
     Args:
-        input_path: Path to extracted JSON file
-        output_path: Path to save cleaned JSON
+        input_path: Path to extracted pages (.parquet or .json)
+        output_path: Path to save cleaned pages (.parquet or .json)
         start_page: First page to keep (default 10)
         end_page: Last page to keep (default 486)
         
@@ -147,22 +188,24 @@ def clean_extracted_text(
 
     logger.info(f"Loading extracted text from: {input_path}")
     
-    with open(input_path, "r", encoding="utf8") as f:
-        data = json.load(f)
+    # Only the columns cleaning uses (Parquet skips the rest on disk)
+    with profile_stage("load_artifact") as stage:
+        data = read_pages(input_path, columns=["page", "text"])
+        stage.items = len(data)
     
     logger.info(f"Loaded {len(data)} pages")
 
     # Process data
-    filtered = filter_pages(data, start_page, end_page)
-    with_metadata = add_chapter_metadata(filtered)
-    backfilled = backfill_chapter_details(with_metadata)
-
-    # Save output
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_path, "w", encoding="utf8") as f:
-        json.dump(backfilled, f, indent=2, ensure_ascii=False)
+    with profile_stage("filter_pages", items=len(data)):
+        filtered = filter_pages(data, start_page, end_page)
+    with profile_stage("add_chapter_metadata", items=len(filtered)):
+        with_metadata = add_chapter_metadata(filtered)
+    with profile_stage("backfill_chapter_details", items=len(with_metadata)):
+        backfilled = backfill_chapter_details(with_metadata)
+
+    # Save output as Parquet or JSON (by extension)
+    with profile_stage("write_artifact", items=len(backfilled)):
+        output_path = write_pages(backfilled, output_path)
     
     logger.info(f"Saved cleaned data to: {output_path}")
     
@@ -178,14 +221,16 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Clean extracted text")
-    parser.add_argument("input_path", help="Path to extracted JSON file")
-    parser.add_argument("-o", "--output", help="Output JSON path")
+    parser.add_argument("input_path", help="Path to extracted pages (.parquet or .json)")
+    parser.add_argument("-o", "--output", help="Output path (.parquet or .json)")
     parser.add_argument("--start-page", type=int, default=10, help="First page to keep")
     parser.add_argument("--end-page", type=int, default=486, help="Last page to keep")
     
     args = parser.parse_args()
     
-    output = args.output or str(EXTRACTED_DATA_DIR / "cleaned_book.json")
+    # Same naming as scripts/02_clean_text.py, so 03_create_chunks.py finds the file
+    input_path = Path(args.input_path)
+    output = args.output or str(EXTRACTED_DATA_DIR / input_path.name.replace("_extracted", "_cleaned"))
     
     clean_extracted_text(
         args.input_path,
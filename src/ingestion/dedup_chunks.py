@@ -0,0 +1,308 @@
+"""Corpus-level near-duplicate chunk detection with MinHash LSH."""
+
+import hashlib
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+from src.ingestion.artifacts import read_chunks, write_chunks
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Mersenne prime used as the modulus of the universal hash family
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def shingle(text: str, k: int = 5) -> Set[str]:
+    """
+    Build the set of word k-shingles for a text.
+
+    Args:
+        text: Chunk text
+        k: Number of words per shingle
+
+    Returns:
+        Set of shingles (the whole normalized text if shorter than k words)
+    """
+    words = re.sub(r"[^a-z0-9]+", " ", text.lower()).split()
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def _hash_shingle(value: str) -> int:
+    """Stable 32-bit hash of a shingle (independent of PYTHONHASHSEED)."""
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+def make_permutations(num_perm: int = 128, seed: int = 1) -> np.ndarray:
+    """
+    Generate the (a, b) coefficients of the MinHash hash functions.
+
+    Args:
+        num_perm: Number of hash functions (signature length)
+        seed: Seed so signatures are reproducible across runs
+
+    Returns:
+        Array of shape (2, num_perm) holding the a and b coefficients
+    """
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    return np.stack([a, b])
+
+
+def minhash_signature(shingles: Set[str], permutations: np.ndarray) -> np.ndarray:
+    """
+    Compute the MinHash signature of a shingle set.
+
+    Args:
+        shingles: Set of shingles
+        permutations: Hash coefficients from make_permutations()
+
+    Returns:
+        Signature array with one value per permutation
+    """
+    num_perm = permutations.shape[1]
+    if not shingles:
+        return np.full(num_perm, _MAX_HASH, dtype=np.uint64)
+
+    hashed = np.array([_hash_shingle(s) for s in shingles], dtype=np.uint64)
+    a, b = permutations
+
+    # (num_shingles, num_perm) matrix of permuted hashes; uint64 overflow is intended
+    permuted = np.bitwise_and((np.outer(hashed, a) + b) % _MERSENNE_PRIME, _MAX_HASH)
+    return permuted.min(axis=0)
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures."""
+    return float(np.mean(sig_a == sig_b))
+
+
+class LSHIndex:
+    """
+    LSH band buckets of MinHash signatures, filled one signature at a time.
+
+    Candidates of a signature are the indexed signatures that share at
+    least one identical band with it.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def candidates(self, signature: np.ndarray) -> Set[int]:
+        """IDs of indexed signatures sharing a band with this one."""
+        found = set()
+        for band, band_key in self._band_keys(signature):
+            found.update(self._buckets[band].get(band_key, ()))
+        return found
+
+    def add(self, item_id: int, signature: np.ndarray):
+        """Index a signature under an ID."""
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].append(item_id)
+
+
+def find_near_duplicates(
+    chunks: List[Dict],
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    bands: int = 32,
+    shingle_size: int = 5
+) -> Dict[int, int]:
+    """
+    Find near-duplicate chunks using MinHash signatures with LSH banding.
+
+    Candidate pairs are chunks that share at least one identical band of
+    their signature; candidates are then verified against the estimated
+    Jaccard similarity so LSH false positives are not dropped.
+
+    Args:
+        chunks: List of chunk dicts with a 'text' field
+        threshold: Minimum estimated Jaccard similarity to count as duplicate
+        num_perm: Signature length
+        bands: Number of LSH bands (must divide num_perm)
+        shingle_size: Words per shingle
+
+    Returns:
+        Dict mapping duplicate chunk index -> index of the chunk it duplicates
+    """
+    index = LSHIndex(num_perm, bands)
+    permutations = make_permutations(num_perm)
+
+    signatures = [
+        minhash_signature(shingle(chunk.get("text", ""), shingle_size), permutations)
+        for chunk in chunks
+    ]
+
+    duplicate_of = {}
+
+    # Chunks are visited in corpus order, so the first occurrence is kept
+    for idx, signature in enumerate(signatures):
+        for candidate in sorted(index.candidates(signature)):
+            if estimate_jaccard(signature, signatures[candidate]) >= threshold:
+                duplicate_of[idx] = candidate
+                break
+        else:
+            # Only kept chunks are indexed, so duplicates always point at a kept chunk
+            index.add(idx, signature)
+
+    return duplicate_of
+
+
+def iter_unique_chunks(
+    chunks: Iterable[Dict],
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    bands: int = 32,
+    shingle_size: int = 5
+) -> Iterator[Dict]:
+    """
+    Streaming version of dedup_chunks(): yield each chunk unless it
+    near-duplicates one already yielded.
+
+    Keeps the same chunks as dedup_chunks(merge=False), holding only the
+    signatures of kept chunks in memory.
+
+    Args:
+        chunks: Chunk dicts with a 'text' field, in corpus order
+        threshold: Minimum estimated Jaccard similarity to count as duplicate
+        num_perm: Signature length
+        bands: Number of LSH bands
+        shingle_size: Words per shingle
+
+    Yields:
+        Kept chunks
+    """
+    index = LSHIndex(num_perm, bands)
+    permutations = make_permutations(num_perm)
+    signatures = []
+    dropped = 0
+
+    for chunk in chunks:
+        signature = minhash_signature(shingle(chunk.get("text", ""), shingle_size), permutations)
+        if any(
+            estimate_jaccard(signature, signatures[candidate]) >= threshold
+            for candidate in index.candidates(signature)
+        ):
+            dropped += 1
+            continue
+
+        index.add(len(signatures), signature)
+        signatures.append(signature)
+        yield chunk
+
+    logger.info(f"Dedup: {len(signatures)} chunks kept, {dropped} near-duplicates removed")
+
+
+def dedup_chunks(
+    chunks: List[Dict],
+    threshold: float = 0.8,
+    merge: bool = True,
+    num_perm: int = 128,
+    bands: int = 32
+) -> List[Dict]:
+    """
+    Remove near-duplicate chunks from a corpus.
+
+    Args:
+        chunks: List of chunk dicts with chunk_id, chapter_metadata, text
+        threshold: Minimum estimated Jaccard similarity to count as duplicate
+        merge: If True, record dropped chunk IDs and locations on the kept chunk
+        num_perm: Signature length
+        bands: Number of LSH bands
+
+    Returns:
+        List of kept chunks in their original order
+    """
+    duplicate_of = find_near_duplicates(chunks, threshold, num_perm, bands)
+
+    kept = []
+    kept_by_index = {}
+
+    for idx, chunk in enumerate(chunks):
+        if idx in duplicate_of:
+            continue
+        chunk = dict(chunk)
+        kept_by_index[idx] = chunk
+        kept.append(chunk)
+
+    if merge:
+        for idx, original in duplicate_of.items():
+            duplicate = chunks[idx]
+            target = kept_by_index[original]
+            target.setdefault("duplicate_ids", []).append(duplicate["chunk_id"])
+            location = duplicate.get("chapter_metadata")
+            if location and location != target.get("chapter_metadata"):
+                target.setdefault("duplicate_locations", []).append(location)
+
+    logger.info(
+        f"Dedup: {len(chunks)} → {len(kept)} chunks "
+        f"({len(duplicate_of)} near-duplicates removed at threshold {threshold})"
+    )
+    return kept
+
+
+def dedup_from_json(
+    input_path: str,
+    output_path: Optional[str] = None,
+    threshold: float = 0.8,
+    merge: bool = True
+) -> List[Dict]:
+    """
+    Load a chunks file, remove near-duplicates, and save the result.
+
+    Args:
+        input_path: Path to chunks file (.parquet or .json)
+        output_path: Path to save deduplicated chunks (defaults to input_path)
+        threshold: Minimum estimated Jaccard similarity to count as duplicate
+        merge: If True, record dropped chunk IDs on the kept chunk
+
+    Returns:
+        List of deduplicated chunks
+    """
+    input_path = Path(input_path)
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+
+    logger.info(f"Loading chunks from: {input_path}")
+    chunks = read_chunks(input_path)
+
+    deduped = dedup_chunks(chunks, threshold=threshold, merge=merge)
+
+    output_path = Path(output_path) if output_path else input_path
+    write_chunks(deduped, output_path)
+
+    logger.info(f"Saved deduplicated chunks to: {output_path}")
+    return deduped
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Remove near-duplicate chunks")
+    parser.add_argument("input_path", help="Path to chunks file (.parquet or .json)")
+    parser.add_argument("-o", "--output", help="Output path (default: overwrite input)")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Jaccard similarity threshold")
+    parser.add_argument("--no-merge", action="store_true", help="Drop duplicates without recording them")
+
+    args = parser.parse_args()
+
+    dedup_from_json(args.input_path, args.output, args.threshold, not args.no_merge)
@@ -1,13 +1,11 @@
 """PDF text extraction with deduplication and cleaning."""
 
-import json
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-import pymupdf
-
-from src.utils import setup_logger, EXTRACTED_DATA_DIR
+from src.ingestion.artifacts import artifact_name, write_pages
+from src.utils import setup_logger, profile_stage, EXTRACTED_DATA_DIR
 
 
 logger = setup_logger(__name__)
@@ -95,52 +93,68 @@ def clean_page(page) -> str:
     return full_page
 
 
-def extract_pdf_text(
-    pdf_path: str,
-    output_path: Optional[str] = None
-) -> Dict[str, Dict]:
-    
-    """Extract text from all pages of a PDF file."""
+def iter_pdf_pages(pdf_path: str) -> Iterator[Tuple[str, Dict]]:
+    """
+    Extract and clean a PDF's pages one at a time.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Yields:
+        ("page_<n>", {"page", "text", "char_count", "word_count"})
+    """
     pdf_path = Path(pdf_path)
 
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
+    import pymupdf
+
     logger.info(f"Opening PDF: {pdf_path.name}")
-    doc = pymupdf.open(str(pdf_path))
-    output = {}
+    with profile_stage("open_pdf"):
+        doc = pymupdf.open(str(pdf_path))
 
-    total_pages = len(doc)
-    logger.info(f"Processing {total_pages} pages...")
+    try:
+        total_pages = len(doc)
+        logger.info(f"Processing {total_pages} pages...")
 
-    for i in range(total_pages):
-        page = doc[i]
-        cleaned = clean_page(page)
+        for i in range(total_pages):
+            with profile_stage("clean_page", items=1):
+                page = doc[i]
+                cleaned = clean_page(page)
 
-        output[f"page_{i+1}"] = {
-            "page": i + 1,
-            "text": cleaned,
-            "char_count": len(cleaned),
-            "word_count": len(cleaned.split())
-        }
+            yield f"page_{i+1}", {
+                "page": i + 1,
+                "text": cleaned,
+                "char_count": len(cleaned),
+                "word_count": len(cleaned.split())
+            }
 
-        if (i + 1) % 10 == 0:
-            logger.info(f"Processed {i + 1}/{total_pages} pages")
+            if (i + 1) % 10 == 0:
+                logger.info(f"Processed {i + 1}/{total_pages} pages")
+    finally:
+        doc.close()
 
-    doc.close()
+
+def extract_pdf_text(
+    pdf_path: str,
+    output_path: Optional[str] = None
+) -> Dict[str, Dict]:
+    
+    """Extract text from all pages of a PDF file."""
+    pdf_path = Path(pdf_path)
+    output = dict(iter_pdf_pages(str(pdf_path)))
+    total_pages = len(output)
 
     total_words = sum(p['word_count'] for p in output.values())
     logger.info(f"Extraction complete: {total_pages} pages, {total_words:,} words")
 
-    # Save to JSON
+    # Save as Parquet or JSON (by extension)
     if not output_path:
-        output_path = EXTRACTED_DATA_DIR / f"{pdf_path.stem}_extracted.json"
-    
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path = EXTRACTED_DATA_DIR / artifact_name(pdf_path.stem, "extracted")
     
-    with open(output_path, "w", encoding="utf8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    with profile_stage("write_artifact", items=len(output)):
+        output_path = write_pages(output, output_path)
     
     logger.info(f"Saved to: {output_path}")
 
@@ -152,7 +166,7 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Extract text from PDF")
     parser.add_argument("pdf_path", help="Path to PDF file")
-    parser.add_argument("-o", "--output", help="Output JSON path")
+    parser.add_argument("-o", "--output", help="Output path (.parquet or .json)")
     
     args = parser.parse_args()
     extract_pdf_text(args.pdf_path, args.output)
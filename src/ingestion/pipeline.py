@@ -0,0 +1,472 @@
+"""Content-addressed DAG runner for the ingestion stages (extract → clean → chunk → dedup → store)."""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.ingestion.artifacts import artifact_name, book_from_artifact, default_format, find_artifacts
+from src.utils import EXTRACTED_DATA_DIR, PROJECT_ROOT, RAW_DATA_DIR
+
+# Per-book stages run in this order; "store" then builds one index from every book
+BOOK_STAGES = ["extract", "clean", "chunk", "dedup"]
+STAGES = BOOK_STAGES + ["store"]
+
+# File each book stage leaves in the output directory (<book>_<kind>.parquet
+# or .json), named the way scripts 01-04 expect (dedup rewrites the chunks
+# file, like 03b does)
+ARTIFACT_KINDS = {
+    "extract": "extracted",
+    "clean": "cleaned",
+    "chunk": "chunks",
+    "dedup": "chunks",
+}
+
+# Source files whose contents are part of each stage's cache key
+STAGE_CODE = {
+    "extract": ["src/ingestion/extract_text.py", "src/ingestion/artifacts.py"],
+    "clean": ["src/ingestion/clean_text.py", "src/ingestion/artifacts.py"],
+    "chunk": ["src/ingestion/chunk_text.py", "src/ingestion/artifacts.py"],
+    "dedup": ["src/ingestion/dedup_chunks.py", "src/ingestion/artifacts.py"],
+    "store": ["src/embeddings/store.py", "src/embeddings/shards.py", "src/ingestion/artifacts.py"],
+}
+
+# Same settings as the numbered scripts
+DEFAULT_PARAMS = {
+    "extract": {},
+    "clean": {"start_page": 10, "end_page": 486},
+    "chunk": {"similarity_threshold": 0.55, "max_sentences_per_chunk": 10},
+    "dedup": {"threshold": 0.8, "merge": True},
+    "store": {"model_name": "all-MiniLM-L6-v2", "batch_size": 100},
+}
+
+
+def file_sha256(path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_version(stage: str) -> str:
+    """Hash of the source files that implement a stage."""
+    digest = hashlib.sha256()
+    for relative_path in STAGE_CODE[stage]:
+        digest.update(relative_path.encode("utf8"))
+        digest.update(file_sha256(PROJECT_ROOT / relative_path).encode("utf8"))
+    return digest.hexdigest()
+
+
+def stage_key(stage: str, params: Dict, input_hashes: List[str]) -> str:
+    """
+    Cache key of one stage run: a hash of its code, parameters, input
+    contents and the artifact format it writes.
+
+    Args:
+        stage: Stage name
+        params: Stage parameters (e.g. similarity_threshold)
+        input_hashes: SHA-256 of each input file
+
+    Returns:
+        Hex digest
+    """
+    payload = json.dumps(
+        {
+            "stage": stage,
+            "code": code_version(stage),
+            "params": params,
+            "inputs": input_hashes,
+            "format": default_format(),
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+def artifact_path(book: str, stage: str, output_dir=EXTRACTED_DATA_DIR) -> Path:
+    """Conventional output file of a book stage, e.g. data/extracted/<book>_cleaned.parquet."""
+    return Path(output_dir) / artifact_name(book, ARTIFACT_KINDS[stage])
+
+
+def _copy_atomic(source, destination):
+    """Copy a file so readers of the destination never see a partial write."""
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+
+class ArtifactCache:
+    """
+    Stage outputs stored by cache key under <root>/<stage>/<key>/.
+
+    Each entry holds the output file and a record.json with its hash,
+    item count and how long the stage took. Entries are written to a
+    temporary directory and renamed into place, so an interrupted run
+    never leaves a half-written entry behind. The cache can be deleted
+    at any time; the next run simply recomputes.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def entry_dir(self, stage: str, key: str) -> Path:
+        return self.root / stage / key
+
+    def lookup(self, stage: str, key: str) -> Optional[Dict]:
+        """Record of a cached output, or None on a miss."""
+        record_path = self.entry_dir(stage, key) / "record.json"
+        try:
+            with open(record_path, "r", encoding="utf8") as f:
+                record = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if not (self.entry_dir(stage, key) / record["file"]).exists():
+            return None
+        return record
+
+    def artifact(self, stage: str, key: str, record: Dict) -> Path:
+        return self.entry_dir(stage, key) / record["file"]
+
+    def reserve(self, stage: str, key: str) -> Path:
+        """Temporary directory to write a new entry into (see commit())."""
+        tmp_dir = self.root / stage / f".{key}.{uuid.uuid4().hex}.tmp"
+        tmp_dir.mkdir(parents=True)
+        return tmp_dir
+
+    def commit(self, stage: str, key: str, tmp_dir: Path, record: Dict) -> Dict:
+        """Write the record and move a reserved directory into place."""
+        with open(tmp_dir / "record.json", "w", encoding="utf8") as f:
+            json.dump(record, f, indent=2)
+
+        entry_dir = self.entry_dir(stage, key)
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # The entry exists (a forced rerun, or a concurrent run with the same key):
+            # replace it so the record matches the file next to it
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        return record
+
+
+def _run_stage(stage: str, input_path: Path, output_path: Path, params: Dict) -> int:
+    """Run one book stage; returns the number of items it produced."""
+    if stage == "extract":
+        from src.ingestion.extract_text import extract_pdf_text
+        return len(extract_pdf_text(str(input_path), str(output_path)))
+
+    if stage == "clean":
+        from src.ingestion.clean_text import clean_extracted_text
+        return len(clean_extracted_text(str(input_path), str(output_path), **params))
+
+    if stage == "chunk":
+        from src.ingestion.chunk_text import chunk_from_json
+        return len(chunk_from_json(str(input_path), str(output_path), **params))
+
+    if stage == "dedup":
+        from src.ingestion.dedup_chunks import dedup_from_json
+        return len(dedup_from_json(str(input_path), str(output_path), **params))
+
+    raise ValueError(f"Unknown book stage: {stage}")
+
+
+def run_book(
+    book: str,
+    source_path: str,
+    stages: List[str],
+    params: Dict[str, Dict],
+    output_dir: str,
+    cache_dir: str,
+    force: bool = False
+) -> List[Dict]:
+    """
+    Run a chain of book stages, skipping any whose cache key is already stored.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        book: Book name
+        source_path: Input of the first stage (the PDF, or an earlier stage's output file)
+        stages: Consecutive book stages to run
+        params: Stage name -> parameters
+        output_dir: Directory for the conventional output files
+        cache_dir: Root of the artifact cache
+        force: Rerun stages even on a cache hit
+
+    Returns:
+        One result dict per stage (status "ran" or "cached", seconds, key)
+    """
+    cache = ArtifactCache(cache_dir)
+    results = []
+    input_path = Path(source_path)
+    input_hash = file_sha256(input_path)
+
+    for stage in stages:
+        start = time.perf_counter()
+        key = stage_key(stage, params.get(stage, {}), [input_hash])
+        record = None if force else cache.lookup(stage, key)
+
+        if record is not None:
+            status = "cached"
+        else:
+            status = "ran"
+            print(f"[{book}] {stage}: running", flush=True)
+            tmp_dir = cache.reserve(stage, key)
+            file_name = artifact_path(book, stage, output_dir).name
+            try:
+                stage_start = time.perf_counter()
+                items = _run_stage(stage, input_path, tmp_dir / file_name, params.get(stage, {}))
+                record = cache.commit(stage, key, tmp_dir, {
+                    "stage": stage,
+                    "book": book,
+                    "key": key,
+                    "file": file_name,
+                    "output_sha256": file_sha256(tmp_dir / file_name),
+                    "items": items,
+                    "seconds": round(time.perf_counter() - stage_start, 3),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                })
+            except BaseException:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+
+        output_path = artifact_path(book, stage, output_dir)
+        _copy_atomic(cache.artifact(stage, key, record), output_path)
+
+        results.append({
+            "book": book,
+            "stage": stage,
+            "status": status,
+            "key": key[:12],
+            "items": record["items"],
+            "seconds": round(time.perf_counter() - start, 3),
+            "saved_seconds": record["seconds"] if status == "cached" else 0.0,
+        })
+        if status == "cached":
+            print(f"[{book}] {stage}: cached ({key[:12]})", flush=True)
+
+        # The next stage reads what this one wrote
+        input_path = output_path
+        input_hash = record["output_sha256"]
+
+    return results
+
+
+def run_store(
+    chunks_paths: Dict[str, Path],
+    db_dir: str,
+    params: Dict,
+    force: bool = False,
+    keep: int = 3
+) -> List[Dict]:
+    """
+    Build the sharded index, re-embedding only the books whose chunks or settings changed.
+
+    Each shard records the cache key it was built from in the index's
+    shard manifest. Every shard not rebuilt here (up to date, or a book
+    not selected in this run) is copied from the current version; if
+    every book is up to date, nothing is built or published.
+
+    Args:
+        chunks_paths: Book name -> chunks JSON file
+        db_dir: Root of the versioned vector database
+        params: Store parameters (model_name, batch_size)
+        force: Rebuild every book
+        keep: Number of index versions to keep on disk
+
+    Returns:
+        One result dict per book
+    """
+    from src.embeddings.shards import build_book_shard, load_shard_manifest
+    from src.embeddings.versions import new_version_dir, prune_versions, publish_version, resolve_db_path
+
+    current_dir = resolve_db_path(db_dir)
+    manifest = load_shard_manifest(current_dir) if current_dir.is_dir() else None
+    shards = (manifest or {}).get("shards", {})
+
+    keys = {book: stage_key("store", params, [file_sha256(path)]) for book, path in chunks_paths.items()}
+    stale = [book for book in chunks_paths if force or shards.get(book, {}).get("source_key") != keys[book]]
+
+    results = {
+        book: {"book": book, "stage": "store", "status": "cached", "key": keys[book][:12],
+               "items": shards.get(book, {}).get("count", 0), "seconds": 0.0, "saved_seconds": 0.0}
+        for book in chunks_paths
+    }
+    if not stale:
+        print("store: index is up to date")
+        return list(results.values())
+
+    version_dir = new_version_dir(db_dir)
+    try:
+        if manifest is not None and set(shards) - set(stale):
+            # Keep the other books' collections (up to date, or not selected
+            # in this run) instead of dropping or re-embedding them
+            shutil.copytree(current_dir, version_dir, dirs_exist_ok=True)
+
+        for book in stale:
+            print(f"[{book}] store: running")
+            start = time.perf_counter()
+            collection = build_book_shard(
+                version_dir,
+                chunks_paths[book],
+                book=book,
+                source_key=keys[book],
+                **params
+            )
+            results[book].update(status="ran", items=collection.count(), seconds=round(time.perf_counter() - start, 3))
+    except BaseException:
+        print(f"Store failed, not publishing {version_dir.name}")
+        # Never leave a half-built version around to be counted by prune_versions()
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+
+    publish_version(db_dir, version_dir)
+    prune_versions(db_dir, keep=keep)
+    print(f"store: published index version {version_dir.name}")
+    return list(results.values())
+
+
+class IngestionPipeline:
+    """
+    Runs extract → clean → chunk → dedup → store as a DAG with cached stage outputs.
+
+    Each stage's output is stored under a key that hashes the stage's
+    code, its parameters and the contents of its input, so a stage only
+    reruns when one of those changes. The per-book chains are independent
+    and run in parallel worker processes; the store stage then builds one
+    index from all books.
+    """
+
+    def __init__(
+        self,
+        output_dir=EXTRACTED_DATA_DIR,
+        cache_dir=PROJECT_ROOT / "data" / "cache" / "pipeline",
+        db_dir=PROJECT_ROOT / "data" / "vector_db",
+        params: Optional[Dict[str, Dict]] = None,
+        jobs: int = 2,
+        force: bool = False,
+        keep: int = 3
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            output_dir: Directory for the conventional per-book files
+            cache_dir: Root of the artifact cache
+            db_dir: Root of the versioned vector database
+            params: Stage name -> parameter overrides (merged into DEFAULT_PARAMS)
+            jobs: Books processed in parallel
+            force: Rerun stages even on a cache hit
+            keep: Number of index versions to keep on disk
+        """
+        self.output_dir = Path(output_dir)
+        self.cache_dir = Path(cache_dir)
+        self.db_dir = Path(db_dir)
+        self.params = {stage: dict(values) for stage, values in DEFAULT_PARAMS.items()}
+        for stage, values in (params or {}).items():
+            self.params[stage].update(values)
+        self.jobs = jobs
+        self.force = force
+        self.keep = keep
+
+    def discover_books(self, first_stage: str, pdf_dir=RAW_DATA_DIR) -> Dict[str, Path]:
+        """
+        Books to process and the input file of their first stage.
+
+        Starting at extract reads the PDFs; starting later reads the
+        previous stage's files from the output directory.
+        """
+        if first_stage == "extract":
+            return {path.stem: path for path in sorted(Path(pdf_dir).glob("*.pdf"))}
+
+        kind = ARTIFACT_KINDS[STAGES[STAGES.index(first_stage) - 1]]
+        return {book_from_artifact(path, kind): path for path in find_artifacts(self.output_dir, kind)}
+
+    def run(
+        self,
+        from_stage: str = "extract",
+        to_stage: str = "store",
+        books: Optional[List[str]] = None,
+        pdf_dir=RAW_DATA_DIR
+    ) -> List[Dict]:
+        """
+        Run the stages from from_stage to to_stage (inclusive).
+
+        Stages before from_stage are not run: their existing output files
+        are used as inputs.
+
+        Args:
+            from_stage: First stage to run
+            to_stage: Last stage to run
+            books: Only process these books (default: all found)
+            pdf_dir: Directory of the source PDFs
+
+        Returns:
+            One result dict per (book, stage)
+        """
+        first, last = STAGES.index(from_stage), STAGES.index(to_stage)
+        if first > last:
+            raise ValueError(f"Stage {from_stage} comes after {to_stage}")
+
+        sources = self.discover_books(from_stage, pdf_dir)
+        if books:
+            missing = sorted(set(books) - set(sources))
+            if missing:
+                raise FileNotFoundError(f"No input for book(s): {', '.join(missing)}")
+            sources = {book: sources[book] for book in books}
+        if not sources:
+            raise FileNotFoundError(f"No inputs found for stage {from_stage}")
+
+        book_stages = [stage for stage in STAGES[first:last + 1] if stage in BOOK_STAGES]
+        results = []
+
+        if book_stages:
+            jobs = max(1, min(self.jobs, len(sources)))
+            args = [
+                (book, str(path), book_stages, self.params, str(self.output_dir), str(self.cache_dir), self.force)
+                for book, path in sources.items()
+            ]
+            if jobs == 1:
+                for book_args in args:
+                    results.extend(run_book(*book_args))
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as executor:
+                    for book_results in executor.map(run_book, *zip(*args)):
+                        results.extend(book_results)
+
+        if to_stage == "store":
+            if book_stages:
+                chunks_paths = {book: artifact_path(book, book_stages[-1], self.output_dir) for book in sources}
+            else:
+                chunks_paths = dict(sources)
+            results.extend(run_store(chunks_paths, str(self.db_dir), self.params["store"], self.force, self.keep))
+
+        return results
+
+
+def print_summary(results: List[Dict], wall_seconds: float):
+    """Print per-stage status and timings, plus the time saved by cache hits."""
+    print(f"{'book':<30} {'stage':<8} {'status':<8} {'items':>7} {'seconds':>9} {'key':<12}")
+    print("-" * 79)
+    for result in results:
+        print(
+            f"{result['book'][:30]:<30} {result['stage']:<8} {result['status']:<8} "
+            f"{result['items']:>7} {result['seconds']:>9.2f} {result['key']:<12}"
+        )
+
+    ran = [r for r in results if r["status"] == "ran"]
+    cached = [r for r in results if r["status"] == "cached"]
+    print("-" * 79)
+    print(f"Ran {len(ran)} stage(s) in {sum(r['seconds'] for r in ran):.2f}s of work, "
+          f"{len(cached)} cached (saved ~{sum(r['saved_seconds'] for r in cached):.2f}s)")
+    print(f"Wall time: {wall_seconds:.2f}s")
@@ -0,0 +1,220 @@
+"""Single-pass streaming ingest: PDF pages flow through generator stages straight into Chroma."""
+
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from src.ingestion.chunk_text import iter_page_sentences, iter_semantic_chunks
+from src.ingestion.clean_text import iter_clean_pages
+from src.ingestion.dedup_chunks import iter_unique_chunks
+from src.ingestion.extract_text import iter_pdf_pages
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries a producer thread's exception to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def bounded(items: Iterable, maxsize: int = 32, name: str = "stage") -> Iterator:
+    """
+    Run an iterator in a background thread, handing items over through a bounded queue.
+
+    The producer blocks when the queue is full, so a fast stage never
+    runs more than maxsize items ahead of a slow one. An exception in the
+    producer is re-raised in the consumer; if the consumer stops early,
+    the producer stops and closes its iterator.
+
+    Args:
+        items: Upstream iterable (e.g. a generator stage)
+        maxsize: Queue capacity
+        name: Thread name suffix
+
+    Yields:
+        The upstream items, in order
+    """
+    handoff = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    break
+            else:
+                put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            close = getattr(items, "close", None)
+            if stop.is_set() and close is not None:
+                close()
+
+    threading.Thread(target=produce, name=f"ingest-{name}", daemon=True).start()
+
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+def tee_jsonl(items: Iterable, path) -> Iterator:
+    """
+    Pass items through while writing each one as a JSON line (optional debug output).
+
+    (key, page) pairs are written as {"key": key, **page}.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf8") as f:
+        for item in items:
+            record = {"key": item[0], **item[1]} if isinstance(item, tuple) else item
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            yield item
+
+
+def _count(items: Iterable, stats: Dict, name: str) -> Iterator:
+    """Pass items through, counting them in stats[name]."""
+    stats[name] = 0
+    for item in items:
+        stats[name] += 1
+        yield item
+
+
+def store_chunk_stream(chunks: Iterable[Dict], collection, embedder, batch_size: int = 100, stats: Optional[Dict] = None) -> int:
+    """
+    Embed and add chunks to a collection in batches as they arrive.
+
+    Args:
+        chunks: Chunk dicts with chunk_id, chapter_metadata, text
+        collection: ChromaDB collection
+        embedder: SentenceTransformer model
+        batch_size: Chunks embedded and added per batch
+        stats: Optional dict that receives 'first_vector_s' (seconds from the
+            first call until the first batch was stored), relative to stats['started']
+
+    Returns:
+        Number of chunks stored
+    """
+    stored = 0
+    batch = []
+
+    def flush():
+        nonlocal stored
+        texts = [chunk["text"] for chunk in batch]
+        collection.add(
+            ids=[chunk["chunk_id"] for chunk in batch],
+            documents=texts,
+            metadatas=[{"chapter_metadata": chunk.get("chapter_metadata", "UNKNOWN")} for chunk in batch],
+            embeddings=embedder.encode(texts).tolist()
+        )
+        stored += len(batch)
+        batch.clear()
+        if stats is not None and "first_vector_s" not in stats:
+            stats["first_vector_s"] = round(time.perf_counter() - stats["started"], 3)
+        logger.info(f"Stored {stored} chunks")
+
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return stored
+
+
+def stream_ingest_pdf(
+    pdf_path: str,
+    collection,
+    embedder,
+    start_page: int = 10,
+    end_page: int = 486,
+    similarity_threshold: float = 0.55,
+    max_sentences_per_chunk: int = 10,
+    dedup_threshold: Optional[float] = 0.8,
+    batch_size: int = 100,
+    queue_size: int = 32,
+    debug_dir: Optional[str] = None
+) -> Dict:
+    """
+    Ingest one PDF into a collection in a single pass, without intermediate files.
+
+    Stages run concurrently, connected by bounded queues:
+    extract (thread) → clean + sentence split (thread) → semantic chunking
+    (thread) → dedup + embed + store (calling thread). The first chunks
+    reach Chroma while later pages are still being extracted, and memory
+    stays bounded by the queue sizes rather than the book size.
+
+    The same embedder is used for chunking and storing, so the model is
+    loaded once.
+
+    Args:
+        pdf_path: Path to the PDF file
+        collection: ChromaDB collection to add the chunks to
+        embedder: SentenceTransformer model
+        start_page: First page to keep
+        end_page: Last page to keep
+        similarity_threshold: Chunking similarity threshold
+        max_sentences_per_chunk: Max sentences per chunk
+        dedup_threshold: Near-duplicate Jaccard threshold (None disables dedup)
+        batch_size: Chunks embedded and stored per batch
+        queue_size: Capacity of each queue between stages
+        debug_dir: If set, also write each stage's output as <book>_<stage>.jsonl
+
+    Returns:
+        Stats dict: pages, kept_pages, chunks, stored, seconds, first_vector_s
+    """
+    book = Path(pdf_path).stem
+    stats = {"book": book, "started": time.perf_counter()}
+
+    def debug(items, stage):
+        if debug_dir is None:
+            return items
+        return tee_jsonl(items, Path(debug_dir) / f"{book}_{stage}.jsonl")
+
+    pages = bounded(debug(_count(iter_pdf_pages(pdf_path), stats, "pages"), "extracted"), queue_size, "extract")
+
+    cleaned = debug(_count(iter_clean_pages(pages, start_page, end_page), stats, "kept_pages"), "cleaned")
+    split_pages = bounded(iter_page_sentences(cleaned), queue_size, "split")
+
+    chunks = bounded(
+        _count(iter_semantic_chunks(
+            split_pages,
+            embedder,
+            similarity_threshold=similarity_threshold,
+            max_sentences_per_chunk=max_sentences_per_chunk
+        ), stats, "chunks"),
+        queue_size,
+        "chunk"
+    )
+    if dedup_threshold is not None:
+        chunks = iter_unique_chunks(chunks, threshold=dedup_threshold)
+
+    stats["stored"] = store_chunk_stream(debug(chunks, "chunks"), collection, embedder, batch_size, stats)
+    stats["seconds"] = round(time.perf_counter() - stats.pop("started"), 3)
+    return stats
@@ -0,0 +1,352 @@
+"""Warm query daemon: keeps the agent and retriever loaded behind a Unix domain socket."""
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def default_socket_path() -> str:
+    """
+    Socket path shared by the daemon and the CLIs.
+
+    Overridable with QUERY_DAEMON_SOCKET. Kept in the temp directory
+    because Unix socket paths are limited to ~100 characters.
+    """
+    env_path = os.getenv("QUERY_DAEMON_SOCKET")
+    if env_path:
+        return env_path
+    user = os.getuid() if hasattr(os, "getuid") else "user"
+    return str(Path(tempfile.gettempdir()) / f"world-history-query-{user}.sock")
+
+
+class QueryDaemon:
+    """
+    Serves search and ask requests from warm, cached resources.
+
+    Each (database, collection, model) combination is loaded once and reused
+    by every later request. When a new index version is published, the
+    resources of the old version are unloaded once no request uses them.
+    The protocol is one JSON object per line in each direction; a
+    connection may send any number of requests.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, backend: str = "gemini"):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Unix socket to listen on (default_socket_path() if None)
+            backend: Default LLM backend for ask requests ('gemini' or 'stub')
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.backend = backend
+        self.started_at = time.time()
+
+        # key -> (resource, close function)
+        self._agents = {}
+        self._searchers = {}
+        # id(resource) -> number of requests using it
+        self._in_flight = {}
+        # id(resource) -> close function, for replaced resources still in use
+        self._retired = {}
+        # (id(cache), key) -> Future resolved when a resource being loaded is cached
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    @contextmanager
+    def _lease(self, cache: Dict, key: tuple, load: Callable[[], Tuple[Any, Callable[[], None]]]):
+        """
+        Use a cached resource for one request, loading it on first use.
+
+        The daemon lock is only held to look up and count leases: a resource
+        is loaded outside it, once, while other requests for the same key
+        wait for that load and requests for other keys carry on. Resources
+        of index versions that are no longer CURRENT are removed from the
+        cache and closed once their last request finishes.
+        """
+        loading_key = (id(cache), key)
+        while True:
+            with self._lock:
+                self._retire_stale(cache)
+                if key in cache:
+                    resource, _ = cache[key]
+                    self._in_flight[id(resource)] = self._in_flight.get(id(resource), 0) + 1
+                    break
+                loading = self._loading.get(loading_key)
+                if loading is None:
+                    loading = self._loading[loading_key] = Future()
+                    owner = True
+                else:
+                    owner = False
+
+            if not owner:
+                # Raises the loader's error, so a failed load fails its waiters too
+                loading.result()
+                continue
+
+            try:
+                loaded = load()
+            except BaseException as e:
+                with self._lock:
+                    del self._loading[loading_key]
+                loading.set_exception(e)
+                raise
+
+            with self._lock:
+                del self._loading[loading_key]
+                cache[key] = loaded
+                resource, _ = loaded
+                self._in_flight[id(resource)] = self._in_flight.get(id(resource), 0) + 1
+            loading.set_result(None)
+            break
+
+        try:
+            yield resource
+        finally:
+            with self._lock:
+                self._in_flight[id(resource)] -= 1
+                if self._in_flight[id(resource)] == 0:
+                    del self._in_flight[id(resource)]
+                    close = self._retired.pop(id(resource), None)
+                else:
+                    close = None
+            if close is not None:
+                self._close(close)
+
+    def _retire_stale(self, cache: Dict):
+        """Drop cached resources whose version CURRENT no longer points to (call with the lock held)."""
+        from src.embeddings.versions import is_current_version
+
+        for key in [key for key in cache if not is_current_version(key[0])]:
+            resource, close = cache.pop(key)
+            print(f"Unloading retired index version: {key[0]}")
+            if id(resource) in self._in_flight:
+                self._retired[id(resource)] = close
+            else:
+                self._close(close)
+
+    @staticmethod
+    def _close(close: Callable[[], None]):
+        try:
+            close()
+        except Exception as e:
+            print(f"Error closing retired index: {type(e).__name__}: {e}")
+
+    def agent_lease(self, db_path: str, collection_name: str, backend: Optional[str] = None):
+        """Context manager yielding the cached HistoryAgent for a database, building it on first use."""
+        from src.embeddings.versions import resolve_db_path
+
+        backend = backend or self.backend
+        # Keyed by the resolved version, so a newly published index gets a fresh agent
+        key = (str(resolve_db_path(db_path).resolve()), collection_name, backend)
+
+        def load():
+            from src.agents import HistoryAgent, create_backend
+
+            print(f"Loading agent: {db_path} [{collection_name}] ({backend})")
+            agent = HistoryAgent(
+                db_path=key[0],
+                collection_name=collection_name,
+                backend=create_backend(backend)
+            )
+            return agent, agent.close
+
+        return self._lease(self._agents, key, load)
+
+    def searcher_lease(self, db_path: str, collection_name: str, model_name: str):
+        """Context manager yielding the cached (embedder, collection) pair for a database, loading it on first use."""
+        from src.embeddings.versions import resolve_db_path
+
+        key = (str(resolve_db_path(db_path).resolve()), collection_name, model_name)
+
+        def load():
+            from src.retrieval.search import get_embedder, open_collection
+
+            print(f"Loading searcher: {db_path} [{collection_name}] ({model_name})")
+            client, collection = open_collection(key[0], collection_name)
+
+            def close():
+                if hasattr(collection, "close"):
+                    collection.close()
+                if hasattr(client, "close"):
+                    client.close()
+
+            return (get_embedder(model_name), collection), close
+
+        return self._lease(self._searchers, key, load)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute one request.
+
+        Args:
+            request: Dict with 'op' ('ping', 'search', 'ask' or 'shutdown') and its arguments
+
+        Returns:
+            Dict with 'ok' and either the result or an 'error' message
+        """
+        from src.retrieval.search import format_search_results, search
+
+        start = time.perf_counter()
+        op = request.get("op")
+
+        try:
+            if op == "ping":
+                result = {
+                    "pid": os.getpid(),
+                    "uptime_s": round(time.time() - self.started_at, 1),
+                    "agents": len(self._agents),
+                    "searchers": len(self._searchers),
+                }
+            elif op == "search":
+                with self.searcher_lease(
+                    request["db_path"],
+                    request.get("collection", "world_history"),
+                    request.get("model_name", "all-MiniLM-L6-v2")
+                ) as (embedder, collection):
+                    raw = search(request["query"], collection, embedder, k=request.get("k", 5))
+                result = format_search_results(raw)
+            elif op == "ask":
+                with self.agent_lease(
+                    request["db_path"],
+                    request.get("collection", "world_history"),
+                    request.get("backend")
+                ) as agent:
+                    result = agent.ask(request["question"], n_results=request.get("n_results", 10))
+            elif op == "shutdown":
+                # shutdown() waits for serve_forever() to return, so it cannot run on a handler thread
+                threading.Thread(target=self._server.shutdown, daemon=True).start()
+                result = None
+            else:
+                raise ValueError(f"Unknown op: {op!r}")
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+        return {"ok": True, "result": result, "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+    def serve_forever(self):
+        """
+        Listen on the socket until shut down (Ctrl+C or a 'shutdown' request).
+
+        Raises:
+            RuntimeError: if another daemon is already listening on the socket
+        """
+        if os.path.exists(self.socket_path):
+            client = connect_daemon(self.socket_path)
+            if client is not None:
+                client.close()
+                raise RuntimeError(f"A query daemon is already running on {self.socket_path}")
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(self.socket_path)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        response = daemon.handle(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        response = {"ok": False, "error": f"Invalid JSON: {e}"}
+                    self.wfile.write((json.dumps(response, default=str) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        # Only the current user may connect
+        os.chmod(self.socket_path, 0o600)
+
+        print(f"Query daemon listening on {self.socket_path} (pid {os.getpid()})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("Query daemon stopped")
+
+
+class DaemonClient:
+    """Client for a running QueryDaemon."""
+
+    def __init__(self, sock: socket.socket, socket_path: str):
+        self.socket_path = socket_path
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    def request(self, op: str, **kwargs) -> Any:
+        """
+        Send one request and wait for its response.
+
+        Returns:
+            The 'result' of the response
+
+        Raises:
+            RuntimeError: if the daemon reports an error or closes the connection
+        """
+        self._sock.sendall((json.dumps({"op": op, **kwargs}) + "\n").encode("utf-8"))
+        line = self._reader.readline()
+        if not line:
+            raise RuntimeError("Query daemon closed the connection")
+
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(f"Query daemon error: {response.get('error')}")
+        return response.get("result")
+
+    def search(self, query: str, db_path: str, collection_name: str = "world_history",
+               model_name: str = "all-MiniLM-L6-v2", k: int = 5) -> List[Dict[str, Any]]:
+        """Same result as retrieve_context(), served by the daemon."""
+        return self.request(
+            "search", query=query, db_path=str(db_path), collection=collection_name, model_name=model_name, k=k
+        )
+
+    def ask(self, question: str, db_path: str, collection_name: str = "world_history",
+            n_results: int = 10, backend: Optional[str] = None) -> Dict[str, Any]:
+        """Same result as HistoryAgent.ask(), served by the daemon."""
+        return self.request(
+            "ask", question=question, db_path=str(db_path), collection=collection_name, n_results=n_results, backend=backend
+        )
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+
+def connect_daemon(socket_path: Optional[str] = None, timeout: float = 0.5) -> Optional[DaemonClient]:
+    """
+    Connect to a running daemon.
+
+    Args:
+        socket_path: Socket path (default_socket_path() if None)
+        timeout: Seconds to wait for the connection
+
+    Returns:
+        DaemonClient, or None if no daemon is listening (or Unix sockets are unsupported)
+    """
+    socket_path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+
+    # Queries (especially 'ask') can take much longer than connecting
+    sock.settimeout(None)
+    return DaemonClient(sock, socket_path)
@@ -0,0 +1,201 @@
+"""Fan-out search over one collection per book, merged into a single ranking."""
+
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_INCLUDE = ("documents", "metadatas", "distances")
+
+
+class ShardRouter:
+    """
+    Searches every book's collection concurrently and merges the results.
+
+    Exposes the parts of the Chroma collection API the agent and the
+    search helpers use (query, get, count, id, name), so it can stand in
+    for a single collection. All shards use cosine distance, so distances
+    are comparable across books and the global top k is a heap merge of
+    each shard's top k.
+
+    With prune_top set, each query only searches the books whose centroid
+    is most similar to it, so latency stays flat as books are added.
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, object],
+        centroids: Optional[Dict[str, Sequence[float]]] = None,
+        prune_top: Optional[int] = None,
+        max_workers: int = 8
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            shards: Book name -> ChromaDB collection
+            centroids: Book name -> unit-normalized centroid embedding (for pruning)
+            prune_top: Search only this many closest books per query (None = all)
+            max_workers: Threads used to query shards concurrently
+        """
+        if not shards:
+            raise ValueError("ShardRouter needs at least one shard")
+
+        self.shards = dict(shards)
+        self.books = list(self.shards)
+        self.prune_top = prune_top if prune_top and prune_top < len(self.books) else None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(self.books))),
+            thread_name_prefix="shard"
+        )
+
+        self._centroids = None
+        if self.prune_top and centroids and all(centroids.get(book) for book in self.books):
+            self._centroids = np.asarray([centroids[book] for book in self.books], dtype=np.float32)
+        elif self.prune_top:
+            print("Shard pruning disabled: some books have no centroid")
+            self.prune_top = None
+
+    @classmethod
+    def from_manifest(cls, client, manifest: Dict, embedding_function=None, **kwargs) -> "ShardRouter":
+        """
+        Open every shard listed in a manifest (see src.embeddings.shards).
+
+        Args:
+            client: ChromaDB client of the database directory
+            manifest: Loaded shard manifest
+            embedding_function: Embedding function for the collections
+            **kwargs: Passed to the constructor (prune_top, max_workers)
+        """
+        shards = {}
+        centroids = {}
+        for book, info in sorted(manifest["shards"].items()):
+            options = {"embedding_function": embedding_function} if embedding_function is not None else {}
+            shards[book] = client.get_collection(name=info["collection"], **options)
+            centroids[book] = info.get("centroid")
+        return cls(shards, centroids=centroids, **kwargs)
+
+    @property
+    def name(self) -> str:
+        return "+".join(shard.name for shard in self.shards.values())
+
+    @property
+    def id(self) -> str:
+        # Changes whenever any shard is rebuilt
+        return ",".join(str(shard.id) for shard in self.shards.values())
+
+    def count(self) -> int:
+        return sum(self._map(lambda shard: shard.count(), self.books).values())
+
+    def _map(self, func, books) -> Dict[str, object]:
+        futures = {book: self._executor.submit(func, self.shards[book]) for book in books}
+        return {book: future.result() for book, future in futures.items()}
+
+    def select_books(self, query_embedding) -> List[str]:
+        """Books to search for one query: all of them, or the closest prune_top by centroid."""
+        if self._centroids is None:
+            return self.books
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = self._centroids @ (query / norm if norm else query)
+        top = np.argsort(-scores)[:self.prune_top]
+        return [self.books[i] for i in sorted(top)]
+
+    def query(self, query_embeddings, n_results: int = 10, include: Sequence[str] = DEFAULT_INCLUDE, **kwargs) -> Dict:
+        """
+        Same contract as Collection.query() with query_embeddings.
+
+        Each shard is queried once with all the queries routed to it; the
+        per-shard rankings are merged by distance.
+        """
+        include = list(include)
+        fields = [field for field in ("documents", "metadatas", "embeddings") if field in include]
+        # Distances are needed to merge, even if the caller did not ask for them
+        shard_include = list(dict.fromkeys(include + ["distances"]))
+
+        routes = {}
+        for index, embedding in enumerate(query_embeddings):
+            for book in self.select_books(embedding):
+                routes.setdefault(book, []).append(index)
+
+        def query_shard(book):
+            indices = routes[book]
+            return self.shards[book].query(
+                query_embeddings=[query_embeddings[i] for i in indices],
+                n_results=n_results,
+                include=shard_include,
+                **kwargs
+            )
+
+        futures = {book: self._executor.submit(query_shard, book) for book in routes}
+        shard_results = {book: future.result() for book, future in futures.items()}
+
+        # Candidates per query: (distance, book, position in that shard's result row)
+        candidates = [[] for _ in query_embeddings]
+        for book, result in shard_results.items():
+            for row, index in enumerate(routes[book]):
+                for position, distance in enumerate(result["distances"][row]):
+                    candidates[index].append((distance, book, row, position))
+
+        merged = {"ids": []}
+        for field in fields + (["distances"] if "distances" in include else []):
+            merged[field] = []
+
+        for ranked in candidates:
+            top = heapq.nsmallest(n_results, ranked)
+            merged["ids"].append([shard_results[book]["ids"][row][pos] for _, book, row, pos in top])
+            for field in fields:
+                merged[field].append([shard_results[book][field][row][pos] for _, book, row, pos in top])
+            if "distances" in include:
+                merged["distances"].append([distance for distance, *_ in top])
+
+        return merged
+
+    def get(self, ids: Optional[List[str]] = None, include: Sequence[str] = ("documents", "metadatas"), **kwargs) -> Dict:
+        """
+        Same contract as Collection.get(): results from every shard, concatenated.
+        """
+        include = list(include)
+        results = self._map(lambda shard: shard.get(ids=ids, include=include, **kwargs), self.books)
+
+        merged = {"ids": []}
+        for field in include:
+            merged[field] = []
+        for book in self.books:
+            result = results[book]
+            merged["ids"].extend(result["ids"])
+            for field in include:
+                values = result.get(field)
+                merged[field].extend(list(values) if values is not None else [None] * len(result["ids"]))
+        return merged
+
+    def close(self):
+        """Stop the shard query threads."""
+        self._executor.shutdown(wait=False)
+
+
+def open_index(client, db_path, collection_name: str = "world_history", embedding_function=None, **router_options):
+    """
+    Open a database directory for search: a ShardRouter if it has a shard
+    manifest (one collection per book), otherwise the named collection.
+
+    Args:
+        client: ChromaDB client of the database directory
+        db_path: Database directory (already resolved to a version)
+        collection_name: Collection to open in a single-collection database
+        embedding_function: Embedding function for the collections
+        **router_options: ShardRouter options (prune_top, max_workers)
+
+    Returns:
+        ShardRouter or ChromaDB collection
+    """
+    from src.embeddings.shards import load_shard_manifest
+
+    manifest = load_shard_manifest(db_path)
+    if manifest and manifest.get("shards"):
+        return ShardRouter.from_manifest(client, manifest, embedding_function=embedding_function, **router_options)
+
+    options = {"embedding_function": embedding_function} if embedding_function is not None else {}
+    return client.get_collection(name=collection_name, **options)
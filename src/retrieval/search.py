@@ -1,10 +1,11 @@
 """Search and retrieve relevant content from ChromaDB vector database."""
 
-import chromadb
-from sentence_transformers import SentenceTransformer
 from pathlib import Path
 from typing import List, Dict, Any
 
+from src.embeddings.versions import resolve_db_path
+from src.retrieval.router import open_index
+
 
 def get_embedder(model_name="all-MiniLM-L6-v2"):
     """
@@ -16,6 +17,9 @@ def get_embedder(model_name="all-MiniLM-L6-v2"):
     Returns:
         SentenceTransformer model instance
     """
+    # Imported on use: sentence_transformers pulls in torch
+    from sentence_transformers import SentenceTransformer
+    
     return SentenceTransformer(model_name)
 
 
@@ -23,20 +27,44 @@ def load_collection(db_path, collection_name="world_history"):
     """
     Load an existing ChromaDB collection.
     
+    A database built with one collection per book is returned as a
+    ShardRouter, which searches all books and merges the results.
+    
+    Args:
+        db_path: Directory path where the database is stored
+        collection_name: Name of the collection to load (single-collection databases)
+    
+    Returns:
+        ChromaDB collection object (or ShardRouter)
+    """
+    _, collection = open_collection(db_path, collection_name)
+    return collection
+
+
+def open_collection(db_path, collection_name="world_history"):
+    """
+    load_collection() that also returns the Chroma client, for callers
+    that keep the collection open and must close the client later.
+    
     Args:
         db_path: Directory path where the database is stored
-        collection_name: Name of the collection to load
+        collection_name: Name of the collection to load (single-collection databases)
     
     Returns:
-        ChromaDB collection object
+        Tuple of (Chroma client, collection or ShardRouter)
     """
     if not Path(db_path).exists():
         raise FileNotFoundError(f"Database path not found: {db_path}")
     
+    import chromadb
+    
+    # A versioned index root opens the version CURRENT points to
+    db_path = resolve_db_path(db_path)
+    
     client = chromadb.PersistentClient(path=str(db_path))
-    collection = client.get_collection(name=collection_name)
+    collection = open_index(client, db_path, collection_name)
     
-    return collection
+    return client, collection
 
 
 def search(query: str, 
@@ -1,6 +1,7 @@
 """Utilities package for AI Tutor Agent."""
 
 from .logger import setup_logger
+from .profiling import StageProfiler, profile_stage
 from .config import (
     PROJECT_ROOT,
     RAW_DATA_DIR,
@@ -10,6 +11,8 @@ from .config import (
 
 __all__ = [
     "setup_logger",
+    "StageProfiler",
+    "profile_stage",
     "PROJECT_ROOT",
     "RAW_DATA_DIR",
     "EXTRACTED_DATA_DIR",
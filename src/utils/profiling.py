@@ -0,0 +1,276 @@
+"""Per-stage wall time, CPU time, throughput and memory profiling for the pipeline."""
+
+import cProfile
+import json
+import os
+import platform
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def current_rss() -> int:
+    """
+    Resident set size of this process in bytes (0 if it cannot be read).
+
+    Uses /proc on Linux, psutil if installed, and the peak RSS from
+    getrusage as a last resort.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Frame:
+    """One running stage. `items` can be incremented inside the block."""
+
+    __slots__ = ("path", "items", "wall_start", "cpu_start", "rss_start", "peak_rss")
+
+    def __init__(self, path: str, items: int, rss: int):
+        self.path = path
+        self.items = items
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.rss_start = rss
+        self.peak_rss = rss
+
+
+class _NullFrame:
+    """Stand-in yielded by profile_stage() when no profiler is active."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: int = 0):
+        self.items = items
+
+
+class StageProfiler:
+    """
+    Collects timing and memory for nested pipeline stages.
+
+    Stages are context managers; nesting builds paths like
+    'chunk/encode'. Repeated stages (e.g. one per page) are aggregated
+    into a single entry with a call count. Peak RSS is sampled by a
+    background thread while any stage is running, so it catches spikes
+    inside a stage, not just at its boundaries.
+
+    Library code reports sub-steps through profile_stage(), which is a
+    no-op unless a profiler has been activated.
+    """
+
+    def __init__(self, cprofile_dir: Optional[str] = None, sample_interval: float = 0.05):
+        """
+        Initialize the profiler.
+
+        Args:
+            cprofile_dir: If set, each top-level stage is run under cProfile
+                and its stats are written there as <stage>.prof
+            sample_interval: Seconds between RSS samples
+        """
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.sample_interval = sample_interval
+
+        self._stats: Dict[str, Dict] = {}
+        self._stack = []
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+        self._started_at = datetime.now(timezone.utc)
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0):
+        """
+        Profile a block as a stage.
+
+        Args:
+            name: Stage name (nested under the currently running stage)
+            items: Items processed; can also be added via the yielded frame's `items`
+
+        Yields:
+            Frame whose `items` attribute may be incremented
+        """
+        top_level = not self._stack
+        path = f"{self._stack[-1].path}/{name}" if self._stack else name
+        frame = _Frame(path, items, current_rss())
+
+        profile = None
+        if top_level and self.cprofile_dir is not None:
+            profile = cProfile.Profile()
+
+        with self._lock:
+            # Register on entry so the report lists parents before their children
+            self._stats.setdefault(path, {
+                "calls": 0,
+                "wall_s": 0.0,
+                "cpu_s": 0.0,
+                "items": 0,
+                "peak_rss_bytes": 0,
+                "rss_delta_bytes": 0,
+            })
+            self._stack.append(frame)
+        if top_level:
+            self._start_sampler()
+        if profile is not None:
+            profile.enable()
+
+        try:
+            yield frame
+        finally:
+            if profile is not None:
+                profile.disable()
+
+            wall = time.perf_counter() - frame.wall_start
+            cpu = time.process_time() - frame.cpu_start
+            rss = current_rss()
+
+            with self._lock:
+                self._stack.pop()
+                frame.peak_rss = max(frame.peak_rss, rss)
+                # A parent's peak includes its children's
+                if self._stack:
+                    self._stack[-1].peak_rss = max(self._stack[-1].peak_rss, frame.peak_rss)
+                self._record(frame, wall, cpu, rss)
+
+            if top_level:
+                self._stop_sampler()
+            if profile is not None:
+                self._dump_cprofile(profile, path)
+
+    def _record(self, frame: _Frame, wall: float, cpu: float, rss: int):
+        stats = self._stats[frame.path]
+        stats["calls"] += 1
+        stats["wall_s"] += wall
+        stats["cpu_s"] += cpu
+        stats["items"] += frame.items
+        stats["peak_rss_bytes"] = max(stats["peak_rss_bytes"], frame.peak_rss)
+        stats["rss_delta_bytes"] += rss - frame.rss_start
+
+    def _dump_cprofile(self, profile: cProfile.Profile, path: str):
+        self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+        calls = self._stats[path]["calls"]
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", path)
+        suffix = f"-{calls}" if calls > 1 else ""
+        profile.dump_stats(str(self.cprofile_dir / f"{name}{suffix}.prof"))
+
+    def _start_sampler(self):
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._sampler.start()
+
+    def _stop_sampler(self):
+        self._stop_sampling.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _sample(self):
+        while not self._stop_sampling.wait(self.sample_interval):
+            rss = current_rss()
+            with self._lock:
+                for frame in self._stack:
+                    frame.peak_rss = max(frame.peak_rss, rss)
+
+    @contextmanager
+    def activate(self):
+        """Route profile_stage() calls in library code to this profiler."""
+        global _active_profiler
+        previous = _active_profiler
+        _active_profiler = self
+        try:
+            yield self
+        finally:
+            _active_profiler = previous
+
+    def report(self) -> Dict:
+        """
+        Build a JSON-serializable run report.
+
+        Returns:
+            Dict with run info and one entry per stage path, in first-run order
+        """
+        stages = []
+        for path, stats in self._stats.items():
+            wall = stats["wall_s"]
+            stages.append({
+                "stage": path,
+                "depth": path.count("/"),
+                "calls": stats["calls"],
+                "wall_s": round(wall, 4),
+                "cpu_s": round(stats["cpu_s"], 4),
+                "cpu_utilization": round(stats["cpu_s"] / wall, 3) if wall else None,
+                "items": stats["items"],
+                "items_per_s": round(stats["items"] / wall, 2) if stats["items"] and wall else None,
+                "peak_rss_mb": round(stats["peak_rss_bytes"] / 2**20, 1),
+                "rss_delta_mb": round(stats["rss_delta_bytes"] / 2**20, 1),
+            })
+
+        return {
+            "started_at": self._started_at.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "stages": stages,
+        }
+
+    def save(self, output_path: str):
+        """Write the report as JSON."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf8") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def print_summary(self):
+        """Print the report as an indented table."""
+        print(f"{'stage':<40} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'items/s':>10} {'peak MB':>9} {'Δ MB':>8}")
+        print("-" * 97)
+        for stage in self.report()["stages"]:
+            label = "  " * stage["depth"] + stage["stage"].rsplit("/", 1)[-1]
+            rate = stage["items_per_s"] if stage["items_per_s"] is not None else "-"
+            print(
+                f"{label:<40} {stage['calls']:>6} {stage['wall_s']:>9.3f} {stage['cpu_s']:>9.3f} "
+                f"{rate:>10} {stage['peak_rss_mb']:>9.1f} {stage['rss_delta_mb']:>8.1f}"
+            )
+
+
+_active_profiler: Optional[StageProfiler] = None
+
+
+@contextmanager
+def profile_stage(name: str, items: int = 0):
+    """
+    Profile a sub-step under the active profiler, or do nothing if none is active.
+
+    Args:
+        name: Stage name
+        items: Items processed (can also be added via the yielded frame)
+
+    Yields:
+        Frame whose `items` attribute may be incremented
+    """
+    if _active_profiler is None:
+        yield _NullFrame(items)
+        return
+
+    with _active_profiler.stage(name, items) as frame:
+        yield frame
@@ -0,0 +1,35 @@
+"""Shared test setup: put the project root on the path and build agents on an empty index."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the path (like the scripts do)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture
+def make_agent(tmp_path):
+    """
+    Build HistoryAgents on an empty Chroma collection with a given backend.
+
+    No embedding model is loaded and no network is used; the agents are
+    closed when the test ends.
+    """
+    import chromadb
+
+    from src.agents.model import HistoryAgent
+
+    db_path = tmp_path / "vector_db"
+    chromadb.PersistentClient(path=str(db_path)).get_or_create_collection("world_history")
+    agents = []
+
+    def make(backend, **kwargs):
+        agent = HistoryAgent(str(db_path), backend=backend, **kwargs)
+        agents.append(agent)
+        return agent
+
+    yield make
+    for agent in agents:
+        agent.close()
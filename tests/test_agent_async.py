@@ -0,0 +1,103 @@
+"""Async generation: rate-limit backoff must not hold up other requests."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.agents.backends import StubBackend
+from src.agents.scheduler import LLMScheduler
+
+
+class RateLimitedOnce(StubBackend):
+    """Stub backend that answers one prompt with a 429 the first time it sees it."""
+
+    def __init__(self, failing_prompt: str):
+        super().__init__(latency_ms=0, latency_jitter_ms=0, tokens_per_second=0)
+        self.failing_prompt = failing_prompt
+        self.failed_at = None
+
+    async def agenerate(self, prompt):
+        if prompt == self.failing_prompt and self.failed_at is None:
+            self.failed_at = time.monotonic()
+            raise RuntimeError("429 Resource has been exhausted (e.g. check quota).")
+        return await super().agenerate(prompt)
+
+
+def test_other_requests_finish_during_backoff(make_agent):
+    backend = RateLimitedOnce("slow question")
+    agent = make_agent(backend)
+
+    async def run():
+        # backoff_delay(0, 1.0) sleeps between 0.5 and 1 second
+        slow = asyncio.create_task(agent.agenerate_answer("slow question", retry_delay=1.0))
+        while backend.failed_at is None:
+            await asyncio.sleep(0.01)
+
+        fast_answer = await asyncio.wait_for(agent.agenerate_answer("fast question"), timeout=0.4)
+        fast_done = time.monotonic()
+        slow_still_backing_off = not slow.done()
+
+        slow_answer = await slow
+        return fast_answer, fast_done, slow_still_backing_off, slow_answer
+
+    fast_answer, fast_done, slow_still_backing_off, slow_answer = asyncio.run(run())
+
+    assert slow_still_backing_off
+    assert fast_done - backend.failed_at < 0.5
+    assert fast_answer.startswith("[stub ")
+    assert slow_answer.startswith("[stub ")
+
+
+def test_non_rate_limit_errors_are_not_retried(make_agent):
+    class Broken(StubBackend):
+        calls = 0
+
+        async def agenerate(self, prompt):
+            Broken.calls += 1
+            raise ValueError("bad request")
+
+    agent = make_agent(Broken())
+
+    with pytest.raises(ValueError):
+        asyncio.run(agent.agenerate_answer("question", retry_delay=1.0))
+    assert Broken.calls == 1
+
+
+class StreamRateLimitedOnce(StubBackend):
+    """Stub backend whose first stream fails with a 429 before any text."""
+
+    def __init__(self):
+        super().__init__(latency_ms=0, latency_jitter_ms=0, tokens_per_second=0)
+        self.failed_at = None
+
+    async def astream(self, prompt):
+        if self.failed_at is None:
+            self.failed_at = time.monotonic()
+            raise RuntimeError("429 Resource has been exhausted (e.g. check quota).")
+        async for text in super().astream(prompt):
+            yield text
+
+
+def test_stream_backoff_releases_scheduler_slot(make_agent):
+    scheduler = LLMScheduler(max_concurrent=1)
+    backend = StreamRateLimitedOnce()
+    agent = make_agent(backend, scheduler=scheduler)
+
+    async def run():
+        async def consume():
+            return "".join([text async for text in agent.astream_answer("question", retry_delay=0.4)])
+
+        stream = asyncio.create_task(consume())
+        while backend.failed_at is None:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        active_during_backoff = scheduler.stats()["active"]
+        return active_during_backoff, await stream
+
+    active_during_backoff, answer = asyncio.run(run())
+
+    assert active_during_backoff == 0
+    assert answer.startswith("[stub ")
+    assert scheduler.stats()["active"] == 0
+    assert scheduler.stats()["admitted"] == 2
@@ -0,0 +1,90 @@
+"""Batch answers: one batched retrieval, per-question results and isolated failures."""
+
+import asyncio
+
+import numpy as np
+
+from src.agents.backends import StubBackend
+
+CHUNKS = {
+    "egypt": ("The pharaohs ruled Egypt along the Nile.", "CHAPTER: 3 - Ancient Egypt | pg-40"),
+    "rome": ("Rome became an empire around the Mediterranean.", "CHAPTER: 6 - Rome | pg-90"),
+    "china": ("The Han dynasty opened the Silk Road.", "CHAPTER: 7 - Han China | pg-120"),
+}
+TOPICS = list(CHUNKS)
+
+
+def one_hot(topic):
+    vector = np.zeros(len(TOPICS), dtype=np.float32)
+    vector[TOPICS.index(topic)] = 1.0
+    return vector.tolist()
+
+
+class KeywordEmbedding:
+    """Embeds a question as the one-hot vector of the topic it mentions; counts model calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts):
+        self.calls += 1
+        return [one_hot(next(t for t in TOPICS if t in text.lower())) for text in texts]
+
+
+class FailingFor(StubBackend):
+    """Stub backend that fails for prompts mentioning a word."""
+
+    def __init__(self, word):
+        super().__init__(latency_ms=0, latency_jitter_ms=0, tokens_per_second=0)
+        self.word = word
+
+    async def agenerate(self, prompt):
+        if self.word in prompt:
+            raise ValueError("backend exploded")
+        return await super().agenerate(prompt)
+
+
+def make_batch_agent(make_agent, backend):
+    agent = make_agent(backend, context_token_budget=None)
+    agent.collection.add(
+        ids=TOPICS,
+        documents=[text for text, _ in CHUNKS.values()],
+        metadatas=[{"chapter_metadata": metadata} for _, metadata in CHUNKS.values()],
+        embeddings=[one_hot(topic) for topic in TOPICS],
+    )
+    agent.embedding_function = KeywordEmbedding()
+    return agent
+
+
+def test_retrieve_batch_splits_results_per_question(make_agent):
+    agent = make_batch_agent(make_agent, StubBackend())
+    questions = ["Tell me about Rome", "What did China trade?"]
+
+    _, retrieved = agent.retrieve_batch(questions, n_results=1, timings={})
+
+    assert agent.embedding_function.calls == 1
+    assert [r["ids"] for r in retrieved] == [[["rome"]], [["china"]]]
+    for question, result in zip(questions, retrieved):
+        single = agent.query_vector_db(question, n_results=1)
+        assert result["documents"] == single["documents"]
+
+
+def test_batch_isolates_failed_questions(make_agent):
+    agent = make_batch_agent(make_agent, FailingFor("Silk Road"))
+    questions = ["Who ruled Egypt?", "How did China trade?", "When did Rome become an empire?"]
+
+    async def run():
+        return [event async for event in agent.aask_batch(questions, n_results=1, max_concurrency=2)]
+
+    events = asyncio.run(run())
+    items = {e["data"]["index"]: e["data"] for e in events if e["event"] == "item"}
+
+    assert events[-1]["event"] == "done"
+    assert events[-1]["data"]["count"] == 3
+    assert events[-1]["data"]["errors"] == 1
+    assert items[1]["error"] == "ValueError: backend exploded"
+    assert items[0]["sources"][0]["chunk_id"] == "egypt"
+    assert items[2]["sources"][0]["chapter_name"] == "Rome"
+    assert items[2]["answer"].startswith("[stub ")
+    # Embedding ran once for the whole batch
+    assert agent.embedding_function.calls == 1
@@ -0,0 +1,59 @@
+"""Persistent answer cache: keys, sharing between index versions, TTL and LRU eviction."""
+
+import time
+
+from src.agents.cache import AnswerCache, make_cache_key, normalize_question
+
+
+def test_normalized_questions_share_a_key():
+    assert normalize_question("  Who built the Pyramids?? ") == "who built the pyramids"
+    assert make_cache_key("Who built the pyramids?", ["a", "b"], "v1", "idx") == \
+        make_cache_key("who built  the pyramids", ["a", "b"], "v1", "idx")
+
+
+def test_key_depends_on_context_prompt_and_index():
+    key = make_cache_key("q", ["a", "b"], "v1", "idx")
+    assert key != make_cache_key("q", ["b", "a"], "v1", "idx")
+    assert key != make_cache_key("q", ["a", "b"], "v2", "idx")
+    assert key != make_cache_key("q", ["a", "b"], "v1", "other-idx")
+
+
+def test_workers_on_different_index_versions_share_the_file(tmp_path):
+    # Two workers during a rolling swap, one per index version
+    old_worker = AnswerCache(tmp_path / "answers.db")
+    new_worker = AnswerCache(tmp_path / "answers.db")
+    old_key = make_cache_key("q", ["a"], "v1", "old-index")
+    new_key = make_cache_key("q", ["a"], "v1", "new-index")
+
+    old_worker.set(old_key, "old answer")
+    new_worker.set(new_key, "new answer")
+
+    assert old_worker.get(old_key) == "old answer"
+    assert new_worker.get(new_key) == "new answer"
+    assert new_worker.get(old_key) == "old answer"
+    assert len(old_worker) == 2
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = AnswerCache(tmp_path / "answers.db", ttl_seconds=0.05)
+    cache.set("key", "answer")
+    assert cache.get("key") == "answer"
+
+    time.sleep(0.1)
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = AnswerCache(tmp_path / "answers.db", max_entries=2)
+    cache.set("a", "1")
+    time.sleep(0.01)
+    cache.set("b", "2")
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
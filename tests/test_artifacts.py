@@ -0,0 +1,105 @@
+"""Intermediate page and chunk files: formats, naming and lookup."""
+
+import os
+
+import pytest
+
+from src.ingestion.artifacts import (
+    artifact_format,
+    artifact_name,
+    book_from_artifact,
+    convert_artifact,
+    default_format,
+    find_artifacts,
+    iter_chunk_batches,
+    read_chunks,
+    read_pages,
+    write_chunks,
+    write_pages,
+)
+
+PAGES = {
+    "page_10": {"page": 10, "text": "The Nile flooded.", "chapter_details": "CHAPTER: 1 - Egypt"},
+    "page_11": {"page": 11, "text": "Rome grew.", "chapter_details": "CHAPTER: 2 - Rome"},
+}
+
+CHUNKS = [
+    {"chunk_id": "c1", "chapter_metadata": "CHAPTER: 1 - Egypt | pg-10", "text": "The Nile flooded.",
+     "duplicate_ids": ["c9"], "duplicate_locations": ["CHAPTER: 5 - Egypt | pg-80"]},
+    {"chunk_id": "c2", "chapter_metadata": "CHAPTER: 2 - Rome | pg-11", "text": "Rome grew."},
+    {"chunk_id": "c3", "chapter_metadata": "CHAPTER: 2 - Rome | pg-12", "text": "Rome fell."},
+]
+
+
+def touch(path, mtime):
+    path.write_text("[]", encoding="utf8")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_find_artifacts_one_file_per_book(tmp_path):
+    touch(tmp_path / "world_history_chunks.json", 100)
+    touch(tmp_path / "ancient_rome_chunks.parquet", 100)
+    touch(tmp_path / "world_history_cleaned.json", 100)
+
+    found = find_artifacts(tmp_path, "chunks")
+
+    assert [p.name for p in found] == ["ancient_rome_chunks.parquet", "world_history_chunks.json"]
+
+
+def test_find_artifacts_prefers_newest_format(tmp_path, capsys):
+    # A JSON run after a Parquet run must not read the stale Parquet file
+    touch(tmp_path / "world_history_chunks.parquet", 100)
+    touch(tmp_path / "world_history_chunks.json", 200)
+    assert find_artifacts(tmp_path, "chunks") == [tmp_path / "world_history_chunks.json"]
+    assert "using the newer world_history_chunks.json" in capsys.readouterr().out
+
+    touch(tmp_path / "world_history_chunks.parquet", 300)
+    assert find_artifacts(tmp_path, "chunks") == [tmp_path / "world_history_chunks.parquet"]
+
+
+def test_artifact_names_round_trip():
+    assert artifact_name("world_history", "cleaned", "json") == "world_history_cleaned.json"
+    assert book_from_artifact("data/extracted/world_history_cleaned.parquet", "cleaned") == "world_history"
+    assert book_from_artifact("my_book_chunks.json", "chunks") == "my_book"
+
+
+@pytest.mark.parametrize("fmt", ["json", "parquet"])
+def test_pages_and_chunks_round_trip(tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+
+    pages_path = write_pages(PAGES, tmp_path / f"book_cleaned.{fmt}")
+    chunks_path = write_chunks(CHUNKS, tmp_path / f"book_chunks.{fmt}")
+
+    assert read_pages(pages_path) == PAGES
+    assert read_pages(pages_path, columns=["text"]) == {key: {"text": page["text"]} for key, page in PAGES.items()}
+    assert read_chunks(chunks_path) == CHUNKS
+    assert read_chunks(chunks_path, columns=["chunk_id", "missing"]) == [{"chunk_id": c["chunk_id"]} for c in CHUNKS]
+    assert [len(batch) for batch in iter_chunk_batches(chunks_path, batch_size=2)] == [2, 1]
+
+
+def test_chunk_embeddings_are_stored_as_floats(tmp_path):
+    path = write_chunks(CHUNKS[1:], tmp_path / "book_chunks.json", embeddings=[[1, 0], [0.5, 0.5]])
+
+    assert [chunk["embedding"] for chunk in read_chunks(path)] == [[1.0, 0.0], [0.5, 0.5]]
+
+
+def test_convert_between_formats(tmp_path):
+    pytest.importorskip("pyarrow")
+    parquet_path = convert_artifact(write_chunks(CHUNKS, tmp_path / "a_chunks.json"), tmp_path / "a_chunks.parquet", "chunks")
+    json_path = convert_artifact(parquet_path, tmp_path / "b_chunks.json", "chunks")
+
+    assert read_chunks(json_path) == CHUNKS
+
+
+def test_format_comes_from_extension_and_environment(monkeypatch):
+    assert artifact_format("x/book_chunks.PARQUET") == "parquet"
+    with pytest.raises(ValueError):
+        artifact_format("book_chunks.csv")
+
+    monkeypatch.setenv("ARTIFACT_FORMAT", "json")
+    assert default_format() == "json"
+    monkeypatch.setenv("ARTIFACT_FORMAT", "xml")
+    with pytest.raises(ValueError):
+        default_format()
@@ -0,0 +1,56 @@
+"""LLM backends: the offline stub used by the tests and load tests."""
+
+import asyncio
+
+import pytest
+
+from src.agents.backends import StubBackend, create_backend
+
+PROMPT = """Answer from the context.
+===== DELIMITED CONTEXT BLOCK START =====
+1. The pharaohs ruled Egypt along the Nile for three thousand years.
+2. Pyramids were built as royal tombs.
+===== DELIMITED CONTEXT BLOCK END =====
+Question: Who ruled Egypt?"""
+
+
+def instant_stub(**kwargs):
+    return StubBackend(latency_ms=0, latency_jitter_ms=0, tokens_per_second=0, **kwargs)
+
+
+def test_same_prompt_gives_the_same_answer():
+    # Latency seeds differ, answers do not
+    first = instant_stub(seed=1).generate(PROMPT)
+    second = asyncio.run(instant_stub(seed=2).agenerate(PROMPT))
+
+    assert first.text == second.text
+    assert first.text.startswith("[stub ")
+    assert "pharaohs ruled Egypt" in first.text
+    assert "Question" not in first.text
+    assert instant_stub().generate(PROMPT + "?").text != first.text
+
+
+def test_stream_matches_the_full_answer():
+    backend = instant_stub()
+
+    async def collect():
+        return [text async for text in backend.astream(PROMPT)]
+
+    fragments = asyncio.run(collect())
+
+    assert len(fragments) > 1
+    assert "".join(fragments) == asyncio.run(backend.agenerate(PROMPT)).text
+
+
+def test_usage_is_reported():
+    response = instant_stub(answer_words=5).generate(PROMPT)
+
+    assert response.prompt_tokens == len(PROMPT.split())
+    # "[stub <digest>]" plus the five answer words
+    assert response.completion_tokens == len(response.text.split()) == 7
+
+
+def test_create_backend_rejects_unknown_names():
+    assert isinstance(create_backend("stub", latency_ms=0), StubBackend)
+    with pytest.raises(ValueError):
+        create_backend("openai")
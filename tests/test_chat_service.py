@@ -0,0 +1,263 @@
+"""Chat service: single-flight answers and index hot swaps."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.backend.services import chat_service
+from app.backend.services.index_swap import AgentNotReady, IndexHotSwap
+from app.backend.services.singleflight import SingleFlight
+from src.agents.titler import LocalTitler
+from src.embeddings.versions import new_version_dir, publish_version
+
+
+class FakeAgent:
+    """Agent whose answers wait until released; fails like a closed agent if used after close()."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.closed = False
+        self.release = asyncio.Event()
+
+    async def aask(self, question):
+        await self.release.wait()
+        if self.closed:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        return {"answer": f"{question} from {self.db_path}", "sources": [], "metadata": {}}
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def index_swap(tmp_path, monkeypatch):
+    publish_version(tmp_path, new_version_dir(tmp_path))
+    swap = IndexHotSwap(str(tmp_path), build_agent=FakeAgent, poll_interval=0, drain_timeout=5)
+    settings = SimpleNamespace(SINGLE_FLIGHT_TIMEOUT_SECONDS=5.0)
+
+    monkeypatch.setattr(chat_service, "get_index_swap", lambda: swap)
+    monkeypatch.setattr(chat_service, "get_settings", lambda: settings)
+    monkeypatch.setattr(chat_service, "question_flight", SingleFlight())
+    swap.get_agent()
+    return swap, settings
+
+
+def test_swap_waits_for_answer_whose_caller_timed_out(index_swap, tmp_path):
+    swap, settings = index_swap
+    old_agent = swap.get_agent()
+    settings.SINGLE_FLIGHT_TIMEOUT_SECONDS = 0.05
+
+    async def run():
+        # The only caller gives up, but the shared answer keeps running (and will be cached)
+        with pytest.raises(asyncio.TimeoutError):
+            await chat_service.process_user_question("Who built the pyramids?")
+
+        publish_version(tmp_path, new_version_dir(tmp_path))
+        assert await asyncio.to_thread(swap.check_for_update)
+        await asyncio.sleep(0.1)
+        closed_during_answer = old_agent.closed
+
+        old_agent.release.set()
+        while chat_service.question_flight.stats()["in_flight"]:
+            await asyncio.sleep(0.01)
+        return closed_during_answer
+
+    closed_during_answer = asyncio.run(run())
+
+    assert not closed_during_answer
+    assert chat_service.question_flight.stats()["errors"] == 0
+
+    # Closed by the drain thread once the shared answer finished
+    deadline = time.monotonic() + 2
+    while not old_agent.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert old_agent.closed
+    assert swap.get_agent() is not old_agent
+
+
+def test_identical_questions_share_one_answer(index_swap):
+    swap, _ = index_swap
+    agent = swap.get_agent()
+
+    async def run():
+        tasks = [
+            asyncio.create_task(chat_service.process_user_question(question))
+            for question in ("Who built the pyramids?", "who built  the pyramids")
+        ]
+        await asyncio.sleep(0.01)
+        agent.release.set()
+        return await asyncio.gather(*tasks)
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert chat_service.question_flight.stats()["coalesced"] == 1
+
+
+@pytest.fixture
+def loading_swap(tmp_path, monkeypatch):
+    """An index swap whose agent build blocks until the test sets `release`."""
+    release = threading.Event()
+    builds = []
+
+    def build_agent(db_path):
+        builds.append(db_path)
+        release.wait(5)
+        return FakeAgent(db_path)
+
+    swap = IndexHotSwap(str(tmp_path), build_agent=build_agent, poll_interval=0)
+    monkeypatch.setattr(chat_service, "get_index_swap", lambda: swap)
+    return swap, release, builds
+
+
+def test_lease_does_not_load_the_agent(loading_swap):
+    swap, _, builds = loading_swap
+
+    with pytest.raises(AgentNotReady):
+        with swap.lease():
+            pass
+    with pytest.raises(AgentNotReady):
+        chat_service.get_scheduler_stats()
+    assert builds == []
+
+
+def test_aload_keeps_event_loop_free_and_builds_once(loading_swap):
+    swap, release, builds = loading_swap
+
+    async def run():
+        loads = [asyncio.create_task(swap.aload()) for _ in range(3)]
+        ticks = 0
+        while not builds or ticks < 5:
+            # The loop keeps running while the agent is built in a thread
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert not swap.loaded
+        release.set()
+        await asyncio.gather(*loads)
+
+    asyncio.run(run())
+
+    assert swap.loaded
+    assert len(builds) == 1
+
+
+def test_aload_reports_build_failure_as_not_ready(tmp_path):
+    def build_agent(db_path):
+        raise FileNotFoundError("no index")
+
+    swap = IndexHotSwap(str(tmp_path), build_agent=build_agent, poll_interval=0)
+
+    with pytest.raises(AgentNotReady):
+        asyncio.run(swap.aload())
+
+
+def test_endpoints_return_503_while_agent_loads(loading_swap, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.backend import main
+
+    monkeypatch.setattr(main, "get_index_swap", chat_service.get_index_swap)
+    # No lifespan: nothing warms the agent up
+    client = TestClient(main.app)
+
+    assert client.get("/health").status_code == 200
+    for path in ("/api/v1/chat/cache-stats", "/api/v1/chat/scheduler-stats", "/api/v1/sources/stats"):
+        response = client.get(path)
+        assert response.status_code == 503, path
+        assert response.headers["Retry-After"] == "5"
+    assert client.get("/metrics").status_code == 200
+
+
+def test_start_chat_answers_and_names_concurrently(monkeypatch):
+    async def answer(query):
+        await asyncio.sleep(0.2)
+        return {"answer": f"answer to {query}"}
+
+    async def name(query):
+        await asyncio.sleep(0.2)
+        return "Ancient Egypt"
+
+    monkeypatch.setattr(chat_service, "get_settings", lambda: SimpleNamespace(CHAT_TITLER="llm"))
+    monkeypatch.setattr(chat_service, "process_user_question", answer)
+    monkeypatch.setattr(chat_service, "generate_chat_name", name)
+
+    start = time.perf_counter()
+    result, chat_name = asyncio.run(chat_service.start_chat("Who ruled Egypt?"))
+    elapsed = time.perf_counter() - start
+
+    assert result == {"answer": "answer to Who ruled Egypt?"}
+    assert chat_name == "Ancient Egypt"
+    assert elapsed < 0.35
+
+
+def test_start_chat_cancels_the_name_when_the_answer_fails(monkeypatch):
+    name_calls = []
+
+    async def answer(query):
+        await asyncio.sleep(0.05)
+        raise AgentNotReady("The RAG agent is still loading")
+
+    async def name(query):
+        try:
+            await asyncio.sleep(0.5)
+            name_calls.append("finished")
+        except asyncio.CancelledError:
+            name_calls.append("cancelled")
+            raise
+
+    async def run():
+        with pytest.raises(AgentNotReady):
+            await chat_service.start_chat("Who ruled Egypt?")
+        # Give a name call that was not cancelled the time to finish
+        await asyncio.sleep(0.6)
+
+    monkeypatch.setattr(chat_service, "get_settings", lambda: SimpleNamespace(CHAT_TITLER="llm"))
+    monkeypatch.setattr(chat_service, "process_user_question", answer)
+    monkeypatch.setattr(chat_service, "generate_chat_name", name)
+    asyncio.run(run())
+
+    assert name_calls == ["cancelled"]
+
+
+def test_start_chat_names_locally_from_the_answer_sources(monkeypatch):
+    async def answer(query):
+        return {"answer": "The pharaohs.", "sources": [{"chunk_id": "c1", "chapter_name": "Ancient Egypt"}]}
+
+    def lookup(question):
+        raise AssertionError("the question was already retrieved")
+
+    settings = SimpleNamespace(CHAT_TITLER="local", CHAT_TITLER_LLM_FALLBACK=False)
+    monkeypatch.setattr(chat_service, "get_settings", lambda: settings)
+    monkeypatch.setattr(chat_service, "process_user_question", answer)
+    monkeypatch.setattr(chat_service, "get_local_titler", lambda: LocalTitler(chapter_lookup=lookup))
+
+    result, chat_name = asyncio.run(chat_service.start_chat("Who were the pharaohs?"))
+
+    assert result["answer"] == "The pharaohs."
+    assert chat_name == "Pharaohs in Ancient Egypt"
+
+
+def test_chapter_lookup_skips_an_unloaded_agent(tmp_path, monkeypatch, capsys):
+    swap = IndexHotSwap(str(tmp_path), build_agent=FakeAgent, poll_interval=0)
+    monkeypatch.setattr(chat_service, "get_index_swap", lambda: swap)
+
+    assert chat_service._top_chapter("Who were the pharaohs?") is None
+    assert capsys.readouterr().out == ""
+
+
+def test_llm_chat_name_falls_back_to_the_message(monkeypatch):
+    class Broken:
+        async def agenerate(self, prompt):
+            raise RuntimeError("503 unavailable")
+
+    settings = SimpleNamespace(LLM_BACKEND="stub", GEMINI_API_KEY="")
+    monkeypatch.setattr(chat_service, "get_settings", lambda: settings)
+    monkeypatch.setattr(chat_service, "get_title_backend", lambda: Broken())
+
+    message = "What were the main achievements of ancient Egyptian civilization?"
+    chat_name = asyncio.run(chat_service.generate_llm_chat_name(message))
+
+    assert chat_name == message[:40] + "..."
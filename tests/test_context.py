@@ -0,0 +1,72 @@
+"""Context packing: token budget, redundancy filter and rank order."""
+
+import pytest
+
+from src.agents.context import estimate_tokens, pack_context
+
+
+def results(documents, embeddings=None):
+    data = {
+        "ids": [[f"c{i}" for i in range(len(documents))]],
+        "documents": [documents],
+        "metadatas": [[{"chapter_metadata": f"CHAPTER: {i} - X | pg-{i}"} for i in range(len(documents))]],
+        "distances": [[0.1 * i for i in range(len(documents))]],
+    }
+    if embeddings is not None:
+        data["embeddings"] = [embeddings]
+    return data
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_chunks_over_budget_are_dropped_but_later_ones_still_fit():
+    # 10, 25, 5 and 20 tokens: the second and fourth chunks do not fit in 30
+    documents = ["a" * 40, "b" * 100, "c" * 20, "d" * 80]
+
+    packed, stats = pack_context(results(documents), token_budget=30)
+
+    assert packed["ids"] == [["c0", "c2"]]
+    assert stats["over_budget_removed"] == 2
+    assert stats["context_tokens_after"] == 15
+    assert stats["dropped_tokens"] == 45
+
+
+def test_top_chunk_is_kept_even_over_budget():
+    packed, stats = pack_context(results(["a" * 400, "b" * 4]), token_budget=10)
+
+    assert packed["ids"] == [["c0"]]
+    assert stats["context_tokens_after"] == 100
+
+
+def test_near_duplicate_embeddings_are_skipped():
+    embeddings = [[1.0, 0.0], [0.99, 0.05], [0.0, 1.0], [2.0, 0.01]]
+
+    packed, stats = pack_context(results(["one", "two", "three", "four"], embeddings), token_budget=None)
+
+    assert packed["ids"] == [["c0", "c2"]]
+    assert packed["embeddings"] == [[[1.0, 0.0], [0.0, 1.0]]]
+    assert stats["duplicates_removed"] == 2
+
+
+def test_identical_text_is_skipped_without_embeddings():
+    packed, stats = pack_context(results(["same", "other", "same"]), token_budget=None)
+
+    assert packed["documents"] == [["same", "other"]]
+    assert stats["duplicates_removed"] == 1
+
+
+def test_kept_chunks_stay_in_rank_order_with_aligned_fields():
+    documents = ["first chunk", "x" * 400, "third chunk", "fourth chunk"]
+
+    packed, _ = pack_context(results(documents), token_budget=20)
+
+    assert packed["ids"] == [["c0", "c2", "c3"]]
+    assert packed["documents"] == [["first chunk", "third chunk", "fourth chunk"]]
+    assert packed["distances"] == [[pytest.approx(0.0), pytest.approx(0.2), pytest.approx(0.3)]]
+    assert [m["chapter_metadata"] for m in packed["metadatas"][0]] == [
+        "CHAPTER: 0 - X | pg-0", "CHAPTER: 2 - X | pg-2", "CHAPTER: 3 - X | pg-3",
+    ]
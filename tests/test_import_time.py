@@ -0,0 +1,49 @@
+"""Import-time budgets: entry points stay fast and load heavy dependencies lazily."""
+
+import os
+
+import pytest
+
+from src.benchmarks.import_time import (
+    CLI_BUDGETS_MS,
+    HEAVY_MODULES,
+    IMPORT_BUDGETS_MS,
+    measure_cli,
+    measure_import,
+    parse_importtime,
+    run_importtime,
+)
+
+# Multiplies every budget, e.g. IMPORT_BUDGET_SCALE=2 on a slow machine
+SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+
+
+@pytest.fixture(scope="module")
+def startup_modules():
+    return {name for name, _, _ in run_importtime("pass")}
+
+
+@pytest.mark.parametrize("module", IMPORT_BUDGETS_MS)
+def test_import_stays_within_budget_without_heavy_modules(module, startup_modules):
+    elapsed_ms, heavy = measure_import(module, startup_modules, runs=3)
+
+    assert heavy == [], f"{module} imports {', '.join(heavy)} eagerly"
+    assert elapsed_ms <= IMPORT_BUDGETS_MS[module] * SCALE
+
+
+@pytest.mark.parametrize("script", CLI_BUDGETS_MS)
+def test_cli_help_stays_within_budget(script):
+    assert measure_cli(script, runs=3) <= CLI_BUDGETS_MS[script] * SCALE
+
+
+def test_heavy_module_imports_are_detected():
+    entries = run_importtime("import json")
+    assert "json" in {name for name, _, _ in entries}
+    assert "google.genai" in HEAVY_MODULES
+
+    parsed = parse_importtime(
+        "import time:       120 |        120 |   chromadb.api\n"
+        "import time:       300 |        420 | chromadb\n"
+        "not an import line\n"
+    )
+    assert parsed == [("chromadb.api", 120, 1), ("chromadb", 420, 0)]
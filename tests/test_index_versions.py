@@ -0,0 +1,161 @@
+"""Versioned indexes: publish, prune, swaps, and unloading agents of replaced versions."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import chromadb
+import pytest
+
+from app.backend.services.index_swap import IndexHotSwap
+from src.embeddings.versions import (
+    current_version,
+    is_current_version,
+    list_versions,
+    new_version_dir,
+    prune_versions,
+    publish_version,
+    resolve_db_path,
+)
+from src.retrieval.daemon import QueryDaemon
+
+
+def build_version(index_root):
+    version_dir = new_version_dir(index_root)
+    chromadb.PersistentClient(path=str(version_dir)).get_or_create_collection("world_history")
+    return version_dir
+
+
+def test_unversioned_root_resolves_to_itself(tmp_path):
+    assert current_version(tmp_path) is None
+    assert resolve_db_path(tmp_path) == tmp_path
+    assert is_current_version(tmp_path)
+
+
+def test_publish_moves_current(tmp_path):
+    first = new_version_dir(tmp_path)
+    second = new_version_dir(tmp_path)
+
+    publish_version(tmp_path, first)
+    assert resolve_db_path(tmp_path) == first
+    assert is_current_version(first) and not is_current_version(second)
+
+    publish_version(tmp_path, second)
+    assert current_version(tmp_path) == second.name
+    assert not is_current_version(first)
+    # The root itself is no longer served once it is versioned
+    assert not is_current_version(tmp_path)
+
+
+def test_publish_rejects_foreign_directory(tmp_path):
+    other = tmp_path / "elsewhere"
+    other.mkdir()
+    with pytest.raises(FileNotFoundError):
+        publish_version(tmp_path / "index", other)
+
+
+def test_prune_keeps_newest_and_current(tmp_path):
+    versions = [new_version_dir(tmp_path) for _ in range(5)]
+    # CURRENT points at an old version (e.g. a rollback)
+    publish_version(tmp_path, versions[0])
+
+    pruned = prune_versions(tmp_path, keep=2)
+
+    assert pruned == [v.name for v in versions[1:3]]
+    assert list_versions(tmp_path) == [versions[0].name] + [v.name for v in versions[3:]]
+
+
+def test_daemon_unloads_agents_of_replaced_versions(tmp_path):
+    daemon = QueryDaemon(socket_path=str(tmp_path / "daemon.sock"), backend="stub")
+    publish_version(tmp_path, build_version(tmp_path))
+
+    with daemon.agent_lease(str(tmp_path), "world_history") as old_agent:
+        publish_version(tmp_path, build_version(tmp_path))
+
+        with daemon.agent_lease(str(tmp_path), "world_history") as new_agent:
+            assert new_agent is not old_agent
+            assert len(daemon._agents) == 1
+            # Still in use by the outer request
+            assert old_agent.collection is not None
+
+    # Closed once its last request finished
+    assert old_agent.collection is None
+    assert new_agent.collection is not None
+    new_agent.close()
+
+
+def test_daemon_reuses_agent_for_current_version(tmp_path):
+    daemon = QueryDaemon(socket_path=str(tmp_path / "daemon.sock"), backend="stub")
+    publish_version(tmp_path, build_version(tmp_path))
+
+    with daemon.agent_lease(str(tmp_path), "world_history") as first:
+        pass
+    with daemon.agent_lease(str(tmp_path), "world_history") as second:
+        assert first is second
+    first.close()
+
+
+def test_daemon_loads_outside_its_lock(tmp_path):
+    daemon = QueryDaemon(socket_path=str(tmp_path / "daemon.sock"), backend="stub")
+    started = threading.Event()
+    release = threading.Event()
+    loads = []
+
+    def slow_load():
+        loads.append("slow")
+        started.set()
+        release.wait(5)
+        return object(), lambda: None
+
+    def lease(name, load):
+        with daemon._lease(daemon._searchers, (str(tmp_path), name), load) as resource:
+            return resource
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(lease, "slow", slow_load)
+        assert started.wait(5)
+        second = executor.submit(lease, "slow", slow_load)
+
+        # Other keys and pings are served while "slow" is loading
+        assert lease("fast", lambda: (object(), lambda: None)) is not None
+        assert daemon.handle({"op": "ping"})["ok"]
+        assert not first.done()
+
+        release.set()
+        assert first.result(5) is second.result(5)
+    assert loads == ["slow"]
+
+
+def test_daemon_load_failure_reaches_waiters_and_is_retried(tmp_path):
+    daemon = QueryDaemon(socket_path=str(tmp_path / "daemon.sock"), backend="stub")
+    key = (str(tmp_path), "broken")
+
+    def failing_load():
+        raise RuntimeError("index missing")
+
+    with pytest.raises(RuntimeError, match="index missing"):
+        with daemon._lease(daemon._searchers, key, failing_load):
+            pass
+    assert daemon._loading == {}
+
+    with daemon._lease(daemon._searchers, key, lambda: ("loaded", lambda: None)) as resource:
+        assert resource == "loaded"
+
+
+def test_failed_swap_keeps_serving_the_old_agent(tmp_path):
+    def warm_up(agent):
+        if agent.db_path.endswith(broken.name):
+            raise RuntimeError("warm-up query failed")
+
+    publish_version(tmp_path, new_version_dir(tmp_path))
+    swap = IndexHotSwap(str(tmp_path), build_agent=lambda db_path: SimpleNamespace(db_path=db_path),
+                        warm_up=warm_up, poll_interval=0)
+    old_agent = swap.get_agent()
+
+    broken = new_version_dir(tmp_path)
+    publish_version(tmp_path, broken)
+
+    assert not swap.check_for_update()
+    assert swap.get_agent() is old_agent
+    assert swap.stats()["failed_swaps"] == 1
+    assert "warm-up query failed" in swap.stats()["last_error"]
@@ -0,0 +1,109 @@
+"""Load-test harness: request files, percentiles, reports and the closed-loop driver."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.benchmarks.load_test import (
+    _run_closed_loop,
+    build_report,
+    compare_reports,
+    load_requests,
+    percentiles,
+)
+
+
+def test_load_requests_infers_endpoints(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    path.write_text(
+        '{"query": "Who was Hammurabi?"}\n'
+        "\n"
+        '{"message": "Tell me about Rome"}\n'
+        '{"endpoint": "chat", "query": "What was the Silk Road?"}\n',
+        encoding="utf8"
+    )
+
+    requests = load_requests(str(path))
+
+    assert requests == [
+        {"endpoint": "chat", "body": {"query": "Who was Hammurabi?"}},
+        {"endpoint": "generate-name", "body": {"message": "Tell me about Rome"}},
+        {"endpoint": "chat", "body": {"query": "What was the Silk Road?"}},
+    ]
+
+
+def test_load_requests_rejects_unknown_endpoint(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    path.write_text('{"endpoint": "stream", "query": "q"}\n', encoding="utf8")
+
+    with pytest.raises(ValueError, match="unknown endpoint"):
+        load_requests(str(path))
+
+
+def test_percentiles():
+    stats = percentiles([float(ms) for ms in range(1, 101)])
+
+    assert stats["count"] == 100
+    assert stats["mean"] == 50.5
+    assert (stats["p50"], stats["p95"], stats["p99"], stats["max"]) == (51.0, 96.0, 100.0, 100.0)
+    assert percentiles([]) == {"count": 0}
+
+
+def test_build_report_counts_errors_and_stages():
+    results = [
+        {"endpoint": "chat", "status": 200, "error": None, "latency_ms": 100.0, "stages": {"retrieve": 10.0}},
+        {"endpoint": "chat", "status": 503, "error": None, "latency_ms": 5.0, "stages": {}},
+        {"endpoint": "generate-name", "status": None, "error": "ConnectError: refused", "latency_ms": 1.0, "stages": {}},
+    ]
+
+    report = build_report(results, wall_seconds=2.0, config={"concurrency": 2})
+
+    assert report["throughput_rps"] == 1.5
+    assert report["overall"]["errors"] == 2
+    assert report["overall"]["status_counts"] == {"200": 1, "503": 1, "exception": 1}
+    assert report["endpoints"]["chat"]["stages_ms"]["retrieve"]["p50"] == 10.0
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_compare_reports():
+    baseline = build_report(
+        [{"endpoint": "chat", "status": 200, "error": None, "latency_ms": 200.0, "stages": {}}], 1.0, {}
+    )
+    current = build_report(
+        [{"endpoint": "chat", "status": 200, "error": None, "latency_ms": 100.0, "stages": {}}] * 2, 1.0, {}
+    )
+
+    diff = compare_reports(current, baseline)
+
+    assert diff["throughput_rps"] == {"baseline": 1.0, "current": 2.0, "change_pct": 100.0}
+    assert diff["p50_ms"]["change_pct"] == -50.0
+    assert diff["error_rate"]["change_pct"] is None
+
+
+def test_closed_loop_limits_requests_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"answer": "a", "metadata": {"timings_ms": {"generate": 1.0}}})
+
+    async def run():
+        results = []
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            requests = [{"endpoint": "chat", "body": {"query": "q"}}]
+            await _run_closed_loop(client, requests, total=10, concurrency=3, results=results)
+        return results
+
+    results = asyncio.run(run())
+
+    assert len(results) == 10
+    assert peak == 3
+    assert all(r["status"] == 200 and r["stages"] == {"generate": 1.0} for r in results)
@@ -0,0 +1,111 @@
+"""Metrics: Server-Timing headers and the Prometheus exposition at /metrics."""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.backend import main
+from app.backend.core.metrics import route_label
+from app.backend.services import chat_service
+from app.backend.services.index_swap import IndexHotSwap
+from app.backend.services.singleflight import SingleFlight
+
+SERVER_TIMING = re.compile(r"^[a-z_]+;dur=\d+\.\d(, [a-z_]+;dur=\d+\.\d)*$")
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{([a-zA-Z_]+="(?:[^"\\]|\\.)*",?)*\})? (-?[0-9.e+-]+|\+Inf|NaN)$')
+
+
+class FakeChunkStore:
+    def stats(self):
+        return {"size": 1, "hits": 0, "misses": 1}
+
+
+class TimedAgent:
+    """Agent that answers instantly with fixed stage timings and token usage."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.semantic_cache = None
+        self.scheduler = None
+        self.chunk_store = FakeChunkStore()
+
+    async def aask(self, question):
+        return {
+            "answer": f"An answer to {question}",
+            "sources": [{"chunk_id": "c1", "chapter_number": "3", "chapter_name": "Ancient Egypt", "page_number": 40}],
+            "metadata": {
+                "timings_ms": {"embed": 3.25, "retrieve": 7.5, "generate": 120.0, "total": 131.0},
+                "usage": {"prompt_tokens": 900, "completion_tokens": 120},
+                "cache_type": None,
+            },
+        }
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    swap = IndexHotSwap(str(tmp_path), build_agent=TimedAgent, poll_interval=0)
+    swap.get_agent()
+    monkeypatch.setattr(chat_service, "get_index_swap", lambda: swap)
+    monkeypatch.setattr(main, "get_index_swap", lambda: swap)
+    monkeypatch.setattr(chat_service, "question_flight", SingleFlight())
+    return TestClient(main.app)
+
+
+def test_server_timing_header_lists_the_request_stages(client):
+    response = client.post("/api/v1/chat", json={"query": "Who ruled Egypt?"})
+
+    assert response.status_code == 200
+    header = response.headers["Server-Timing"]
+    assert SERVER_TIMING.match(header), header
+    stages = dict(part.split(";dur=") for part in header.split(", "))
+    assert stages["embed"] in ("3.2", "3.3")
+    assert stages["generate"] == "120.0"
+    assert {"retrieve", "serialize", "total"} <= set(stages)
+
+
+def test_metrics_are_valid_exposition_text(client):
+    client.post("/api/v1/chat", json={"query": "Who ruled Egypt?"})
+    text = client.get("/metrics").text
+
+    assert text.endswith("\n")
+    typed = {}
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            typed[name] = kind
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name = match.group(1)
+        family = name if name in typed else re.sub(r"_(bucket|sum|count)$", "", name)
+        assert family in typed, f"{line} has no # TYPE"
+
+    assert typed["http_request_duration_seconds"] == "histogram"
+    assert typed["chat_answers_total"] == "counter"
+    assert typed["singleflight_in_flight"] == "gauge"
+    assert typed["chunk_store_size"] == "gauge"
+
+    route = 'method="POST",route="/api/v1/chat",status="200"'
+    buckets = re.findall(rf'^http_request_duration_seconds_bucket\{{{route},le="([^"]+)"\}} (\d+)$', text, re.M)
+    counts = [int(count) for _, count in buckets]
+    assert buckets[-1][0] == "+Inf"
+    assert counts == sorted(counts)
+    assert re.search(rf"^http_request_duration_seconds_count\{{{route}\}} {counts[-1]}$", text, re.M)
+    assert re.search(rf"^http_request_duration_seconds_sum\{{{route}\}} \d", text, re.M)
+    assert re.search(r'^llm_tokens_per_call_bucket\{purpose="answer",kind="prompt",le="1024"\} [1-9]', text, re.M)
+    assert re.search(r'^chat_stage_duration_seconds_count\{endpoint="chat",stage="generate"\} [1-9]', text, re.M)
+
+
+def test_route_label_keeps_the_router_prefix():
+    class Route:
+        path = "/sources/{chunk_id}"
+
+    scope = {"route": Route(), "path": "/api/v1/sources/egypt-1", "path_params": {"chunk_id": "egypt-1"}}
+
+    assert route_label(scope) == "/api/v1/sources/{chunk_id}"
+    assert route_label({"path": "/nope"}) == "unmatched"
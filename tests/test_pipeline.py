@@ -0,0 +1,150 @@
+"""Ingestion DAG: cache keys, the artifact cache and incremental index builds."""
+
+import json
+
+import pytest
+
+from src.embeddings import shards
+from src.embeddings.shards import load_shard_manifest, update_shard_manifest
+from src.embeddings.versions import current_version, resolve_db_path
+from src.ingestion import pipeline
+from src.ingestion.artifacts import write_chunks
+from src.ingestion.pipeline import ArtifactCache, run_book, run_store, stage_key
+
+
+@pytest.fixture(autouse=True)
+def json_artifacts(monkeypatch):
+    monkeypatch.setenv("ARTIFACT_FORMAT", "json")
+
+
+def test_stage_key_changes_with_params_inputs_and_format(monkeypatch):
+    key = stage_key("dedup", {"threshold": 0.8}, ["abc"])
+
+    assert stage_key("dedup", {"threshold": 0.8}, ["abc"]) == key
+    assert stage_key("dedup", {"threshold": 0.9}, ["abc"]) != key
+    assert stage_key("dedup", {"threshold": 0.8}, ["abd"]) != key
+    assert stage_key("chunk", {"threshold": 0.8}, ["abc"]) != key
+    monkeypatch.setenv("ARTIFACT_FORMAT", "parquet")
+    assert stage_key("dedup", {"threshold": 0.8}, ["abc"]) != key
+
+
+def test_artifact_cache_commit_and_replace(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    assert cache.lookup("clean", "k") is None
+
+    for text in ("first", "second"):
+        tmp_dir = cache.reserve("clean", "k")
+        (tmp_dir / "out.json").write_text(text)
+        cache.commit("clean", "k", tmp_dir, {"file": "out.json", "text": text})
+
+    record = cache.lookup("clean", "k")
+    assert record["text"] == "second"
+    assert cache.artifact("clean", "k", record).read_text() == "second"
+    assert [p.name for p in (tmp_path / "clean").iterdir()] == ["k"]
+
+    # An entry whose output file is gone is a miss
+    cache.artifact("clean", "k", record).unlink()
+    assert cache.lookup("clean", "k") is None
+
+
+def test_run_book_reuses_cached_stage(tmp_path):
+    chunks = [
+        {"chunk_id": "c1", "chapter_metadata": "CHAPTER: 1 - Egypt | pg-1", "text": "The Nile flooded every year and fed the fields."},
+        {"chunk_id": "c2", "chapter_metadata": "CHAPTER: 1 - Egypt | pg-1", "text": "The Nile flooded every year and fed the fields."},
+        {"chunk_id": "c3", "chapter_metadata": "CHAPTER: 2 - Rome | pg-9", "text": "Rome was founded on seven hills."},
+    ]
+    source = write_chunks(chunks, tmp_path / "in" / "egypt_chunks.json")
+    args = ("egypt", str(source), ["dedup"], {"dedup": {"threshold": 0.8, "merge": True}},
+            str(tmp_path / "out"), str(tmp_path / "cache"))
+
+    first = run_book(*args)
+    second = run_book(*args)
+    forced = run_book(*args, force=True)
+
+    assert [r["status"] for r in first + second + forced] == ["ran", "cached", "ran"]
+    assert first[0]["items"] == second[0]["items"] == 2
+    assert first[0]["key"] == second[0]["key"]
+    written = json.loads((tmp_path / "out" / "egypt_chunks.json").read_text())
+    assert [c["chunk_id"] for c in written] == ["c1", "c3"]
+
+
+class FakeShard:
+    """What build_book_shard() returns, without embedding anything."""
+
+    def __init__(self, book):
+        self.name = f"book_{book}"
+
+    def count(self):
+        return 1
+
+    def get(self, include, limit, offset):
+        return {"embeddings": [[1.0, 0.0]]}
+
+
+@pytest.fixture
+def built_books(monkeypatch):
+    """Replace the embedding step; records which books were built and can be made to fail."""
+    built = []
+    failing = set()
+
+    def build_book_shard(db_path, chunks_path, book, source_key, **params):
+        if book in failing:
+            raise RuntimeError(f"cannot embed {book}")
+        built.append(book)
+        (db_path / f"{book}.shard").write_text(source_key)
+        shard = FakeShard(book)
+        update_shard_manifest(db_path, book, shard, source_key=source_key)
+        return shard
+
+    monkeypatch.setattr(shards, "build_book_shard", build_book_shard)
+    return built, failing
+
+
+def chunks_files(tmp_path, books, text="text"):
+    return {
+        book: write_chunks([{"chunk_id": f"{book}-1", "chapter_metadata": "", "text": f"{book} {text}"}],
+                           tmp_path / "chunks" / f"{book}_chunks.json")
+        for book in books
+    }
+
+
+def test_run_store_rebuilds_only_changed_books(tmp_path, built_books):
+    built, _ = built_books
+    db_dir = tmp_path / "vector_db"
+    params = {"model_name": "fake", "batch_size": 10}
+
+    run_store(chunks_files(tmp_path, ["egypt", "rome"]), str(db_dir), params)
+    assert built == ["egypt", "rome"]
+
+    results = run_store(chunks_files(tmp_path, ["egypt", "rome"]), str(db_dir), params)
+    assert [r["status"] for r in results] == ["cached", "cached"]
+    assert built == ["egypt", "rome"]
+
+    # Rebuilding one book (like --books rome) keeps the other one
+    first_version = current_version(db_dir)
+    run_store(chunks_files(tmp_path, ["rome"], text="revised"), str(db_dir), params)
+    assert built == ["egypt", "rome", "rome"]
+    assert current_version(db_dir) != first_version
+    current_dir = resolve_db_path(db_dir)
+    assert sorted(load_shard_manifest(current_dir)["shards"]) == ["egypt", "rome"]
+    assert (current_dir / "egypt.shard").exists()
+
+
+def test_failed_store_leaves_no_version_behind(tmp_path, built_books):
+    _, failing = built_books
+    db_dir = tmp_path / "vector_db"
+    params = {"model_name": "fake", "batch_size": 10}
+    run_store(chunks_files(tmp_path, ["egypt", "rome"]), str(db_dir), params)
+    published = current_version(db_dir)
+
+    failing.add("rome")
+    with pytest.raises(RuntimeError):
+        run_store(chunks_files(tmp_path, ["rome"], text="revised"), str(db_dir), params)
+
+    assert current_version(db_dir) == published
+    assert [p.name for p in (db_dir / "versions").iterdir()] == [published]
+
+
+def test_pipeline_rejects_reversed_stages(tmp_path):
+    with pytest.raises(ValueError):
+        pipeline.IngestionPipeline(output_dir=tmp_path).run(from_stage="store", to_stage="clean")
@@ -0,0 +1,120 @@
+"""Retrieval benchmark: labels, synthetic queries, recall@k/MRR scoring and the exact engine."""
+
+import chromadb
+import numpy as np
+
+from src.benchmarks.retrieval import (
+    ExactEngine,
+    evaluate,
+    label_example_queries,
+    run_benchmark,
+    synthetic_queries,
+)
+
+
+def make_corpus():
+    return {
+        "ids": ["egypt-1", "egypt-2", "rome-1", "china-1"],
+        "documents": [
+            "The pharaohs of Egypt ruled the Nile valley for three thousand years of history.",
+            "Pyramids were built as tombs. Short one.",
+            "Rome grew from a small city state into an empire spanning the Mediterranean sea.",
+            "The Han dynasty opened the Silk Road to trade with the lands far to the west.",
+        ],
+        "metadatas": [
+            {"chapter_metadata": "CHAPTER: 3 - Ancient Egypt | pg-40"},
+            {"chapter_metadata": "CHAPTER: 3 - Ancient Egypt | pg-41"},
+            {"chapter_metadata": "CHAPTER: 6 - Rome | pg-90"},
+            {},
+        ],
+        "embeddings": np.eye(4, dtype=np.float32),
+    }
+
+
+class FixedEngine:
+    """Returns the same ranking for every query."""
+
+    name = "fixed"
+
+    def __init__(self, ranking):
+        self.ranking = ranking
+
+    def search(self, query_embedding, k):
+        return self.ranking[:k]
+
+    def index_bytes(self):
+        return 0
+
+
+def test_label_example_queries_matches_chapter_keywords():
+    labeled = label_example_queries(make_corpus(), [
+        {"query": "Tell me about the pharaohs", "keywords": ["egypt"]},
+        {"query": "Tell me about the Aztecs", "keywords": ["aztec"]},
+    ])
+
+    assert labeled == [{"query": "Tell me about the pharaohs", "relevant": {"egypt-1", "egypt-2"}, "source": "example"}]
+
+
+def test_synthetic_queries_are_sentences_of_their_chunk():
+    corpus = make_corpus()
+    queries = synthetic_queries(corpus, n=10, min_words=8, seed=1)
+
+    assert queries == synthetic_queries(corpus, n=10, min_words=8, seed=1)
+    # "Short one." and "Pyramids were built as tombs." are too short
+    assert len(queries) == 3
+    for query in queries:
+        (chunk_id,) = query["relevant"]
+        assert query["query"] in corpus["documents"][corpus["ids"].index(chunk_id)]
+
+
+def test_evaluate_recall_and_mrr():
+    queries = [
+        {"query": "a", "relevant": {"x"}},
+        {"query": "b", "relevant": {"y", "z"}},
+        {"query": "c", "relevant": {"missing"}},
+    ]
+    engine = FixedEngine(["w", "x", "y", "z"])
+
+    metrics = evaluate(engine, queries, np.zeros((3, 2)), ks=(1, 2, 4))
+
+    assert metrics["recall@1"] == 0.0
+    # x at rank 2: 1/1; y, z at ranks 3-4: 0/2
+    assert metrics["recall@2"] == round((1 + 0 + 0) / 3, 4)
+    assert metrics["recall@4"] == round((1 + 1 + 0) / 3, 4)
+    assert metrics["mrr"] == round((1 / 2 + 1 / 3 + 0) / 3, 4)
+
+
+def test_exact_engine_ranks_by_cosine_similarity():
+    engine = ExactEngine(make_corpus())
+
+    ranked = engine.search(np.array([0.1, 0.0, 3.0, 1.0], dtype=np.float32), 3)
+
+    assert ranked == ["rome-1", "china-1", "egypt-1"]
+
+
+def test_run_benchmark_chroma_matches_exact_search(tmp_path):
+    corpus = make_corpus()
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    collection = client.create_collection("world_history", metadata={"hnsw:space": "cosine"})
+    collection.add(
+        ids=corpus["ids"],
+        documents=corpus["documents"],
+        metadatas=[m or {"chapter_metadata": ""} for m in corpus["metadatas"]],
+        embeddings=corpus["embeddings"].tolist(),
+    )
+
+    def embed(texts):
+        # A sentence embeds to the one-hot vector of the chunk it came from
+        vectors = []
+        for text in texts:
+            index = next((i for i, doc in enumerate(corpus["documents"]) if text in doc), None)
+            vectors.append(corpus["embeddings"][index] if index is not None else np.full(4, 0.5))
+        return vectors
+
+    report = run_benchmark(collection, embed, db_path=str(tmp_path), n_synthetic=10, ks=(1, 3))
+
+    assert report["chunks"] == 4
+    for engine in ("chroma", "exact"):
+        assert report["results"][engine]["synthetic"]["recall@1"] == 1.0
+        assert report["results"][engine]["synthetic"]["mrr"] == 1.0
+    client.close()
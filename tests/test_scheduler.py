@@ -0,0 +1,118 @@
+"""LLM scheduler: concurrency slots, bounded queue, deadlines and token budget corrections."""
+
+import asyncio
+
+import pytest
+
+from src.agents.backends import StubBackend
+from src.agents.context import estimate_tokens
+from src.agents.scheduler import LLMScheduler, SchedulerQueueFull, SchedulerTimeout
+
+
+def test_slots_are_granted_in_arrival_order():
+    scheduler = LLMScheduler(max_concurrent=1)
+    order = []
+
+    async def call(name):
+        async with scheduler.slot(10):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(call(name) for name in "abcd"))
+
+    asyncio.run(run())
+
+    assert order == list("abcd")
+    assert scheduler.stats()["admitted"] == 4
+    assert scheduler.stats()["active"] == 0
+
+
+def test_full_queue_rejects_immediately():
+    scheduler = LLMScheduler(max_concurrent=1, max_queue=1)
+
+    async def run():
+        await scheduler.acquire(10)
+        queued = asyncio.create_task(scheduler.acquire(10))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerQueueFull):
+            await scheduler.acquire(10)
+        scheduler.release()
+        await queued
+        scheduler.release()
+
+    asyncio.run(run())
+    assert scheduler.stats()["rejected"] == 1
+
+
+def test_deadline_expires_while_queued():
+    scheduler = LLMScheduler(max_concurrent=1)
+
+    async def run():
+        await scheduler.acquire(10)
+        with pytest.raises(SchedulerTimeout):
+            await scheduler.acquire(10, deadline=0.05)
+        scheduler.release()
+
+    asyncio.run(run())
+    stats = scheduler.stats()
+    assert stats["timed_out"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_request_budget_delays_admission():
+    # 60 requests per minute: one token per second after the first
+    scheduler = LLMScheduler(requests_per_minute=60, max_concurrent=10)
+    scheduler._requests.tokens = 1
+
+    async def run():
+        async with scheduler.slot(10):
+            pass
+        with pytest.raises(SchedulerTimeout):
+            async with scheduler.slot(10, deadline=0.1):
+                pass
+
+    asyncio.run(run())
+
+
+def test_reconcile_refunds_an_overestimate():
+    scheduler = LLMScheduler(tokens_per_minute=1000, max_concurrent=10)
+
+    async def run():
+        async with scheduler.slot(900):
+            pass
+        # The call used far fewer tokens than estimated, so the next one fits now
+        scheduler.reconcile(900, 100)
+        async with scheduler.slot(800, deadline=0.05):
+            pass
+
+    asyncio.run(run())
+    assert scheduler.stats()["tokens_corrected"] == -800
+
+
+def test_reconcile_charges_an_underestimate():
+    scheduler = LLMScheduler(tokens_per_minute=1000, max_concurrent=10)
+
+    async def run():
+        async with scheduler.slot(100):
+            pass
+        scheduler.reconcile(100, 1000)
+        with pytest.raises(SchedulerTimeout):
+            async with scheduler.slot(100, deadline=0.05):
+                pass
+
+    asyncio.run(run())
+    assert scheduler.stats()["tokens_corrected"] == 900
+
+
+def test_agent_reconciles_reported_usage(make_agent):
+    scheduler = LLMScheduler(tokens_per_minute=100_000)
+    agent = make_agent(StubBackend(latency_ms=0, latency_jitter_ms=0, tokens_per_second=0), scheduler=scheduler)
+    prompt = "Who built the pyramids of Giza and why were they built?"
+
+    response = asyncio.run(agent._agenerate_response(prompt))
+
+    estimated = estimate_tokens(prompt) + agent.completion_token_estimate
+    actual = response.prompt_tokens + response.completion_tokens
+    assert scheduler.stats()["tokens_corrected"] == actual - estimated
+    assert scheduler._tokens.tokens == pytest.approx(100_000 - actual, abs=5)
@@ -0,0 +1,49 @@
+"""Semantic answer cache: similarity threshold, top chunk match and LRU rows."""
+
+from src.agents.semantic_cache import SemanticCache
+
+EGYPT = [1.0, 0.0, 0.0]
+ROME = [0.0, 1.0, 0.0]
+GREECE = [0.0, 0.0, 1.0]
+TOP = ["c1", "c2", "c3", "c4"]
+
+
+def test_similar_question_with_same_top_chunks_hits():
+    cache = SemanticCache(threshold=0.9)
+    cache.add("Who built the pyramids?", EGYPT, TOP, "The Egyptians.")
+
+    # Cosine ~0.995, top 3 in a different order; ranks past the top 3 are ignored
+    assert cache.lookup([1.0, 0.1, 0.0], ["c3", "c1", "c2", "c9"]) == "The Egyptians."
+    assert cache.lookup([0.6, 0.8, 0.0], TOP) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_different_top_chunks_miss():
+    cache = SemanticCache(threshold=0.9)
+    cache.add("Who built the pyramids?", EGYPT, TOP, "The Egyptians.")
+
+    assert cache.lookup(EGYPT, ["c1", "c2", "c7"]) is None
+
+
+def test_least_recently_used_row_is_overwritten():
+    cache = SemanticCache(threshold=0.9, max_entries=2)
+    cache.add("Egypt?", EGYPT, ["e"], "egypt")
+    cache.add("Rome?", ROME, ["r"], "rome")
+    # Using Egypt makes Rome the least recently used entry
+    assert cache.lookup(EGYPT, ["e"]) == "egypt"
+
+    cache.add("Greece?", GREECE, ["g"], "greece")
+
+    assert cache.lookup(ROME, ["r"]) is None
+    assert cache.lookup(EGYPT, ["e"]) == "egypt"
+    assert cache.lookup(GREECE, ["g"]) == "greece"
+    assert cache.stats()["size"] == 2
+
+
+def test_disabled_cache_stores_nothing():
+    cache = SemanticCache(enabled=False)
+    cache.add("Egypt?", EGYPT, ["e"], "egypt")
+
+    assert cache.lookup(EGYPT, ["e"]) is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,155 @@
+"""Shard-per-book layout: collection names, centroids and the merging router."""
+
+import chromadb
+import pytest
+
+from src.embeddings import shards
+from src.embeddings.shards import (
+    book_collection_name,
+    build_book_shard,
+    compute_centroid,
+    drop_book_collection,
+    load_shard_manifest,
+    update_shard_manifest,
+)
+from src.retrieval.router import ShardRouter, open_index
+
+# Two books with 3-d embeddings: Egypt points along x, Rome along y
+BOOKS = {
+    "egypt": {
+        "egypt-1": [1.0, 0.0, 0.0],
+        "egypt-2": [0.9, 0.1, 0.0],
+        "egypt-3": [0.6, 0.0, 0.8],
+    },
+    "rome": {
+        "rome-1": [0.0, 1.0, 0.0],
+        "rome-2": [0.2, 0.9, 0.1],
+        "rome-3": [0.0, 0.5, 0.8],
+    },
+}
+
+
+def add_chunks(collection, chunks):
+    ids = list(chunks)
+    collection.add(
+        ids=ids,
+        embeddings=[chunks[i] for i in ids],
+        documents=[f"text of {i}" for i in ids],
+        metadatas=[{"chapter_metadata": f"CHAPTER: 1 - {i} | pg-1"} for i in ids],
+    )
+
+
+class FakeCollection:
+    name = "fake"
+
+
+@pytest.fixture
+def sharded_db(tmp_path):
+    """A database directory with one cosine collection per book and a manifest."""
+    db_path = tmp_path / "vector_db"
+    client = chromadb.PersistentClient(path=str(db_path))
+    for book, chunks in BOOKS.items():
+        collection = client.get_or_create_collection(book_collection_name(book), metadata={"hnsw:space": "cosine"})
+        add_chunks(collection, chunks)
+        update_shard_manifest(db_path, book, collection)
+    yield client, db_path
+    client.close()
+
+
+def test_book_collection_names_are_valid_chroma_names():
+    assert book_collection_name("world_history") == "book_world_history"
+    assert book_collection_name("A History: Vol. 2") == "book_A_History_Vol._2"
+    assert book_collection_name("...") == "book_book"
+    assert len(book_collection_name("x" * 100)) == 63
+
+
+def test_centroid_is_normalized_mean_of_unit_embeddings(tmp_path):
+    client = chromadb.PersistentClient(path=str(tmp_path / "db"))
+    collection = client.get_or_create_collection("book_test")
+    assert compute_centroid(collection) is None
+
+    collection.add(ids=["a", "b"], embeddings=[[2.0, 0.0], [0.0, 5.0]], documents=["a", "b"])
+    assert compute_centroid(collection, batch_size=1) == pytest.approx([2 ** -0.5, 2 ** -0.5])
+    client.close()
+
+
+def test_manifest_records_each_book(sharded_db):
+    _, db_path = sharded_db
+    manifest = load_shard_manifest(db_path)
+
+    assert sorted(manifest["shards"]) == ["egypt", "rome"]
+    assert manifest["shards"]["rome"]["collection"] == "book_rome"
+    assert manifest["shards"]["rome"]["count"] == 3
+    assert load_shard_manifest(db_path.parent) is None
+
+
+def test_router_ranking_matches_a_single_collection(sharded_db, tmp_path):
+    client, db_path = sharded_db
+    router = open_index(client, db_path)
+    assert isinstance(router, ShardRouter)
+
+    combined = client.get_or_create_collection("combined", metadata={"hnsw:space": "cosine"})
+    for chunks in BOOKS.values():
+        add_chunks(combined, chunks)
+
+    queries = [[0.8, 0.3, 0.1], [0.1, 0.2, 1.0]]
+    merged = router.query(query_embeddings=queries, n_results=4)
+    expected = combined.query(query_embeddings=queries, n_results=4)
+
+    assert merged["ids"] == expected["ids"]
+    assert merged["distances"] == [pytest.approx(row) for row in expected["distances"]]
+    assert merged["documents"] == expected["documents"]
+    assert router.count() == 6
+    assert router.get(ids=["rome-2", "egypt-1"])["ids"] == ["egypt-1", "rome-2"]
+    router.close()
+
+
+def test_pruning_searches_only_the_closest_books(sharded_db):
+    client, db_path = sharded_db
+    router = open_index(client, db_path, prune_top=1)
+
+    assert router.select_books([1.0, 0.1, 0.0]) == ["egypt"]
+    assert router.select_books([0.0, 1.0, 0.1]) == ["rome"]
+    result = router.query(query_embeddings=[[0.0, 1.0, 0.1]], n_results=5)
+    assert sorted(result["ids"][0]) == ["rome-1", "rome-2", "rome-3"]
+    router.close()
+
+
+def test_pruning_is_disabled_without_centroids(sharded_db):
+    client, _ = sharded_db
+    shards = {book: client.get_collection(book_collection_name(book)) for book in BOOKS}
+    router = ShardRouter(shards, centroids={"egypt": [1.0, 0.0, 0.0]}, prune_top=1)
+
+    assert router.prune_top is None
+    assert router.select_books([1.0, 0.0, 0.0]) == ["egypt", "rome"]
+    router.close()
+
+
+def test_single_collection_database_opens_the_collection(tmp_path):
+    db_path = tmp_path / "db"
+    client = chromadb.PersistentClient(path=str(db_path))
+    client.get_or_create_collection("world_history")
+
+    assert open_index(client, db_path).name == "world_history"
+    client.close()
+
+
+def test_dropping_a_book_leaves_the_others(sharded_db):
+    client, db_path = sharded_db
+
+    assert drop_book_collection(db_path, "rome")
+    assert not drop_book_collection(db_path, "rome")
+    assert client.get_collection(book_collection_name("egypt")).count() == 3
+
+
+def test_book_name_keeps_chunks_inside_the_name(tmp_path, monkeypatch):
+    from src.embeddings import store
+
+    built = {}
+    monkeypatch.setattr(store, "build_vector_db_from_chunks", lambda **kwargs: built.update(kwargs) or FakeCollection())
+    monkeypatch.setattr(shards, "update_shard_manifest", lambda db_path, book, collection, source_key=None: built.update(book=book))
+
+    build_book_shard(tmp_path / "db", "data/my_chunks_notes_chunks.json")
+
+    assert built["book"] == "my_chunks_notes"
+    assert built["collection_name"] == "book_my_chunks_notes"
@@ -0,0 +1,95 @@
+"""Chat sources: ID-only sources, the chunk store and source text lookups."""
+
+from fastapi.testclient import TestClient
+
+from app.backend import main
+from app.backend.api.v1.chat import transform_sources
+from app.backend.services import chat_service
+from app.backend.services.index_swap import IndexHotSwap
+from src.agents.backends import StubBackend
+from src.agents.chunk_store import ChunkStore
+
+
+class CountingCollection:
+    """Collection stand-in that records the IDs of every get() call."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = []
+
+    def get(self, ids, include):
+        self.calls.append(list(ids))
+        known = [i for i in ids if i in self.chunks]
+        return {
+            "ids": known,
+            "documents": [self.chunks[i] for i in known],
+            "metadatas": [{"chapter_metadata": f"CHAPTER: 1 - {i} | pg-1"} for i in known],
+        }
+
+
+def test_chunk_store_fetches_misses_in_one_query():
+    collection = CountingCollection({"a": "text a", "b": "text b", "c": "text c"})
+    store = ChunkStore(collection)
+    store.put_many({"a": {"text": "text a", "chapter_metadata": ""}})
+
+    found = store.get_many(["a", "b", "c", "b", "unknown"])
+
+    assert set(found) == {"a", "b", "c"}
+    assert collection.calls == [["b", "c", "unknown"]]
+    assert store.get("b")["text"] == "text b"
+    assert len(collection.calls) == 1
+    assert store.stats()["hits"] == 2
+
+
+def test_chunk_store_evicts_least_recently_used():
+    collection = CountingCollection({})
+    store = ChunkStore(collection, max_entries=2)
+    store.put_many({"a": {"text": "a"}, "b": {"text": "b"}})
+    store.get("a")
+    store.put_many({"c": {"text": "c"}})
+
+    assert store.get_many(["a", "c"]).keys() == {"a", "c"}
+    assert store.get("b") is None
+    assert store.stats()["size"] == 2
+
+
+def test_transformed_sources_carry_no_text():
+    sources = transform_sources([
+        {"chunk_id": "egypt-1", "chapter_number": "3", "chapter_name": "Ancient Egypt", "page_number": 40},
+    ])
+
+    assert sources == [{"chunk_id": "egypt-1", "chapter": "Ancient Egypt", "chapter_number": "3", "page": 40}]
+
+
+def test_source_endpoints_serve_text_by_id(make_agent, tmp_path, monkeypatch):
+    agent = make_agent(StubBackend())
+    agent.collection.add(
+        ids=["egypt-1", "rome-1"],
+        documents=["The pharaohs ruled Egypt.", "Rome became an empire."],
+        metadatas=[
+            {"chapter_metadata": "CHAPTER: 3 - Ancient Egypt | pg-40"},
+            {"chapter_metadata": "CHAPTER: 6 - Rome | pg-90"},
+        ],
+        embeddings=[[1.0, 0.0], [0.0, 1.0]],
+    )
+    swap = IndexHotSwap(str(tmp_path), build_agent=lambda db_path: agent, poll_interval=0)
+    swap.get_agent()
+    monkeypatch.setattr(chat_service, "get_index_swap", lambda: swap)
+    monkeypatch.setattr(main, "get_index_swap", lambda: swap)
+    client = TestClient(main.app)
+
+    response = client.get("/api/v1/sources/egypt-1")
+    assert response.status_code == 200
+    assert response.json() == {
+        "chunk_id": "egypt-1",
+        "text": "The pharaohs ruled Egypt.",
+        "chapter": "Ancient Egypt",
+        "chapter_number": "3",
+        "page": 40,
+    }
+
+    assert client.get("/api/v1/sources/nope").status_code == 404
+
+    response = client.post("/api/v1/sources/batch", json={"chunk_ids": ["rome-1", "nope", "egypt-1"]})
+    assert [s["chunk_id"] for s in response.json()["sources"]] == ["rome-1", "egypt-1"]
+    assert response.json()["missing"] == ["nope"]
@@ -0,0 +1,98 @@
+"""Streaming ingest: bounded hand-off between stages and streaming dedup."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.ingestion.dedup_chunks import dedup_chunks, iter_unique_chunks
+from src.ingestion.stream import bounded, store_chunk_stream
+
+
+def test_producer_never_runs_more_than_maxsize_ahead():
+    produced = []
+    lead = []
+
+    def numbers():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    consumed = 0
+    for item in bounded(numbers(), maxsize=3):
+        assert item == consumed
+        consumed += 1
+        # One item may be held by the producer while it waits for room
+        lead.append(len(produced) - consumed)
+        threading.Event().wait(0.005)
+
+    assert consumed == 20
+    assert max(lead) <= 3 + 1
+
+
+def test_producer_exception_reaches_the_consumer():
+    def failing():
+        yield 1
+        raise ValueError("bad page")
+
+    items = bounded(failing(), maxsize=2)
+    assert next(items) == 1
+    with pytest.raises(ValueError, match="bad page"):
+        next(items)
+
+
+def test_stopping_early_closes_the_producer():
+    closed = threading.Event()
+
+    def endless():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    items = bounded(endless(), maxsize=2)
+    assert [next(items) for _ in range(3)] == [0, 1, 2]
+    items.close()
+    assert closed.wait(2)
+
+
+def test_streaming_dedup_keeps_the_same_chunks():
+    texts = [
+        "The Nile flooded every year and fed the fields of Egypt along its banks.",
+        "Rome was founded on seven hills beside the river Tiber in central Italy.",
+        "The Nile flooded every year and fed the fields of Egypt along its banks!",
+        "Athens built a democracy where citizens voted in the assembly on laws.",
+        "Rome was founded on seven hills beside the river Tiber in central Italy.",
+    ]
+    chunks = [{"chunk_id": f"c{i}", "chapter_metadata": "", "text": text} for i, text in enumerate(texts)]
+
+    streamed = [chunk["chunk_id"] for chunk in iter_unique_chunks(iter(chunks))]
+    batch = [chunk["chunk_id"] for chunk in dedup_chunks(chunks, merge=False)]
+
+    assert streamed == batch == ["c0", "c1", "c3"]
+
+
+class FakeEmbedder:
+    def encode(self, texts):
+        return np.ones((len(texts), 2))
+
+
+class RecordingCollection:
+    def __init__(self):
+        self.batches = []
+
+    def add(self, ids, documents, metadatas, embeddings):
+        self.batches.append(ids)
+
+
+def test_chunks_are_stored_in_batches():
+    collection = RecordingCollection()
+    chunks = ({"chunk_id": f"c{i}", "text": "t"} for i in range(5))
+    stats = {"started": 0.0}
+
+    assert store_chunk_stream(chunks, collection, FakeEmbedder(), batch_size=2, stats=stats) == 5
+    assert collection.batches == [["c0", "c1"], ["c2", "c3"], ["c4"]]
+    assert "first_vector_s" in stats
@@ -0,0 +1,68 @@
+"""Local chat titler: key phrases, word selection and chapter context."""
+
+from src.agents.titler import LocalTitler, key_phrases
+
+
+def test_key_phrases_split_on_stopwords_and_punctuation():
+    assert key_phrases("Who was Genghis Khan, and why did the Mongols expand?") == [
+        ["Genghis", "Khan"], ["Mongols", "expand"]
+    ]
+
+
+def test_select_words_keeps_question_order():
+    titler = LocalTitler()
+
+    assert titler.select_words("How did the Neolithic Revolution change human societies?") == [
+        "Neolithic", "Revolution", "change", "human", "societies"
+    ]
+
+
+def test_select_words_prefers_proper_nouns_within_the_word_limit():
+    titler = LocalTitler(max_words=4)
+
+    # The proper-noun phrase wins over the longer common-noun phrase, which is cut short
+    words = titler.select_words("Why did grain trade routes collapse after Rome fell?")
+
+    assert words == ["grain", "trade", "Rome", "fell"]
+
+
+def test_capitalized_first_word_is_not_a_proper_noun():
+    titler = LocalTitler(max_words=2)
+
+    # "Pyramids" is only capitalized because it starts the question, so the
+    # longer "temples built" outranks it for the second word
+    assert titler.select_words("Pyramids and temples built by the Egyptians") == ["temples", "Egyptians"]
+
+
+def test_leading_verbs_are_dropped():
+    titler = LocalTitler()
+
+    assert titler.select_words("Compare Athens and Sparta") == ["Athens", "Sparta"]
+    assert titler.select_words("Summarize feudalism") == ["feudalism"]
+
+
+def test_short_questions_get_chapter_context():
+    lookups = []
+
+    def chapter_lookup(question):
+        lookups.append(question)
+        return "The Rise of the Nile Kingdoms"
+
+    titler = LocalTitler(chapter_lookup=chapter_lookup)
+
+    assert titler.title("Tell me about pyramids") == "Pyramids in Rise Nile Kingdoms"
+    assert titler.title("Why?") == "Rise Nile Kingdoms"
+    # Long enough questions never pay for the lookup
+    assert titler.title("How did the Neolithic Revolution change human societies?") == \
+        "Neolithic Revolution Change Human Societies"
+    assert lookups == ["Tell me about pyramids", "Why?"]
+
+
+def test_no_title_without_words_or_chapter():
+    assert LocalTitler().title("Why?") is None
+
+
+def test_titles_are_cut_at_a_word_boundary():
+    titler = LocalTitler(max_chars=20)
+
+    assert titler.title("Explain Constantinople Byzantine Justinian reforms") == "Constantinople"